@@ -31,6 +31,9 @@ class LearningController(Controller):
         self.agent = agent
     def team_name(self) -> str:
         return "TakeishiRL"
+    def set_rng(self, rng) -> None:
+        super().set_rng(rng)
+        self.agent.set_rng(rng)
     def update(self, info):
         return self.agent.select_action(info)
 
@@ -0,0 +1,134 @@
+"""Derived board facts the heuristic players ask for on every step."""
+
+from .config import A_coordinate, fortress_limit, n_fortress
+
+
+def _mask(fortresses):
+    mask = 0
+    for i in fortresses:
+        mask |= 1 << i
+    return mask
+
+
+def _members(mask):
+    return tuple(i for i in range(n_fortress) if mask >> i & 1)
+
+
+# Bit j of NEIGHBOR_MASK[i] is set if a road joins fortresses i and j
+NEIGHBOR_MASK = tuple(
+    _mask(j for j in range(n_fortress) if A_coordinate[i][j] != 0) for i in range(n_fortress)
+)
+
+
+class Topology:
+    """Everything about the roads that depends only on who owns which fortress.
+
+    `frontline` are my fortresses next to an enemy, `rear` the others;
+    `neutral_targets` and `enemy_targets` are the neutral and enemy
+    fortresses next to one of mine.  Each set comes as a tuple and a
+    `*_mask`; the neighbour counts have one entry per fortress.
+    """
+
+    __slots__ = (
+        "ally_neighbors",
+        "enemy_neighbors",
+        "neutral_neighbors",
+        "frontline",
+        "frontline_mask",
+        "rear",
+        "rear_mask",
+        "neutral_targets",
+        "neutral_targets_mask",
+        "enemy_targets",
+        "enemy_targets_mask",
+    )
+
+    def __init__(self, mine_mask, enemy_mask):
+        neutral_mask = ((1 << n_fortress) - 1) & ~mine_mask & ~enemy_mask
+        self.ally_neighbors = tuple((m & mine_mask).bit_count() for m in NEIGHBOR_MASK)
+        self.enemy_neighbors = tuple((m & enemy_mask).bit_count() for m in NEIGHBOR_MASK)
+        self.neutral_neighbors = tuple((m & neutral_mask).bit_count() for m in NEIGHBOR_MASK)
+        reach = 0
+        for i in _members(mine_mask):
+            reach |= NEIGHBOR_MASK[i]
+        self.frontline_mask = _mask(i for i in _members(mine_mask) if self.enemy_neighbors[i])
+        self.rear_mask = mine_mask & ~self.frontline_mask
+        self.neutral_targets_mask = reach & neutral_mask
+        self.enemy_targets_mask = reach & enemy_mask
+        self.frontline = _members(self.frontline_mask)
+        self.rear = _members(self.rear_mask)
+        self.neutral_targets = _members(self.neutral_targets_mask)
+        self.enemy_targets = _members(self.enemy_targets_mask)
+
+
+# Filled on demand: a match only visits a small share of the 3**12
+# ownership patterns, so building the whole table up front would not pay
+_topologies = {}
+
+
+def topology(mine_mask, enemy_mask):
+    """The `Topology` of an ownership pattern, from the shared table."""
+    key = mine_mask | enemy_mask << n_fortress
+    topo = _topologies.get(key)
+    if topo is None:
+        topo = _topologies[key] = Topology(mine_mask, enemy_mask)
+    return topo
+
+
+class BoardAnalysis:
+    """Ownership, fill and neighbourhood facts for one `state`, seen as team 1.
+
+    `Info.analysis` builds one per step and perspective on first use, so
+    every player reading the same info shares it; everything is a tuple so
+    no player can spoil it for the next.  `mine`, `enemy`, `neutral` and
+    `frontline` hold fortress numbers in ascending order, each `*_mask` is
+    the same set as a bitmask with bit i for fortress i, and the remaining
+    fields have one entry per fortress.  What depends on ownership alone
+    is looked up in the shared `topology` table.
+    """
+
+    __slots__ = (
+        "owner",
+        "mine",
+        "enemy",
+        "neutral",
+        "mine_mask",
+        "enemy_mask",
+        "neutral_mask",
+        "limit",
+        "fill",
+        "neighbor_mask",
+        "topology",
+        "ally_neighbors",
+        "enemy_neighbors",
+        "neutral_neighbors",
+        "frontline",
+        "frontline_mask",
+    )
+
+    def __init__(self, state):
+        rows = [list(row) for row in state]
+        self.owner = tuple(row[0] for row in rows)
+        self.mine = tuple(i for i, team in enumerate(self.owner) if team == 1)
+        self.enemy = tuple(i for i, team in enumerate(self.owner) if team == 2)
+        self.neutral = tuple(i for i, team in enumerate(self.owner) if team == 0)
+        self.mine_mask = _mask(self.mine)
+        self.enemy_mask = _mask(self.enemy)
+        self.neutral_mask = _mask(self.neutral)
+
+        self.limit = tuple(fortress_limit[row[2]] for row in rows)
+        self.fill = tuple(row[3] / max(1, limit) for row, limit in zip(rows, self.limit))
+
+        self.neighbor_mask = NEIGHBOR_MASK
+        topo = self.topology = topology(self.mine_mask, self.enemy_mask)
+        self.ally_neighbors = topo.ally_neighbors
+        self.enemy_neighbors = topo.enemy_neighbors
+        self.neutral_neighbors = topo.neutral_neighbors
+        self.frontline = topo.frontline
+        self.frontline_mask = topo.frontline_mask
+
+    @classmethod
+    def of(cls, info):
+        """`info.analysis`, or a fresh analysis for a plain 5-item info list."""
+        analysis = getattr(info, "analysis", None)
+        return analysis if analysis is not None else cls(info[1])
@@ -101,6 +101,34 @@ A_fortress_set = [
 fortress_limit = [10, 10, 20, 30, 40, 50]
 fortress_cool = [[60, 60, 54, 48, 42, 35], [90, 90, 81, 72, 63, 54]]
 
+# Pawn movement (index by kind)
+pawn_speed = [1.5, 1]
+depart_interval = [7, 10]
+arrive_radius = 45
+
+
+def _travel_steps(kind, from_, to):
+    """Steps a pawn leaving from_ needs to come within arrive_radius of to."""
+    if A_coordinate[from_][to] == 0:
+        return 0
+    dx, dy = A_coordinate[from_][to]
+    x = pos_fortress[from_][0] + dx * 42
+    y = pos_fortress[from_][1] + dy * 42
+    tx, ty = pos_fortress[to]
+    steps = 0
+    while (tx - x) ** 2 + (ty - y) ** 2 > arrive_radius**2:
+        x += dx * pawn_speed[kind]
+        y += dy * pawn_speed[kind]
+        steps += 1
+    return steps
+
+
+# Travel time in steps along each road: travel_time[kind][from_][to] (0 = no road)
+travel_time = [
+    [[_travel_steps(kind, i, j) for j in range(n_fortress)] for i in range(n_fortress)]
+    for kind in range(2)
+]
+
 # Logging verbosity
 QUIET = False
 
@@ -1,11 +1,84 @@
+import functools
+import random
+
+
 class Controller:
+    # Source of randomness for the controller.  Games hand every controller
+    # its own seeded random.Random through set_rng; until then it is the
+    # shared module-level stream.
+    rng = random
+
+    # Call update only every this many steps; the engine plays no-ops in
+    # between unless a fortress changes hands first.
+    decision_interval = 1
+
     def team_name(self) -> str:
         raise NotImplementedError
 
-    def update(self, info) -> tuple[int, int, int]:
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    # Returns one (command, subject, to) for this step, or a plan: a list of
+    # (delay, command, subject, to) entries, delay counted in steps from now.
+    # The engine plays a plan from a queue and calls update again once it
+    # drains or a fortress changes hands.
+    def update(self, info) -> tuple[int, int, int] | list[tuple[int, int, int, int]]:
         raise NotImplementedError
 
 
+# A controller that reacts to game events instead of polling every step.
+# The engine calls its update only on steps that bring new events; update
+# hands each event to the matching on_<kind> handler and then returns what
+# decide returns, which may be a single command or a plan.
+class EventController(Controller):
+    def update(self, info):
+        for event in info.events:
+            getattr(self, "on_" + event.kind)(event, info)
+        return self.decide(info)
+
+    def decide(self, info) -> tuple[int, int, int] | list[tuple[int, int, int, int]]:
+        return 0, 0, 0
+
+    def on_started(self, event, info) -> None:
+        pass
+
+    def on_captured(self, event, info) -> None:
+        pass
+
+    def on_upgrade_started(self, event, info) -> None:
+        pass
+
+    def on_upgrade_finished(self, event, info) -> None:
+        pass
+
+    def on_send_launched(self, event, info) -> None:
+        pass
+
+    def on_pawns_arrived(self, event, info) -> None:
+        pass
+
+    def on_pawn_cap(self, event, info) -> None:
+        pass
+
+
+# Decorator for the update of a controller whose answer depends only on the
+# fortresses in info.state.  While info.version stays the same it returns
+# the last answer instead of calling update again.  Not for controllers that
+# draw from self.rng, read the pawns or events, or keep state between calls.
+def memoise(update):
+    @functools.wraps(update)
+    def cached(self, info):
+        version = getattr(info, "version", None)
+        memo = getattr(self, "_memo", None)
+        if version is not None and memo is not None and memo[0] == version:
+            return memo[1]
+        decision = update(self, info)
+        self._memo = (version, decision)
+        return decision
+
+    return cached
+
+
 class Human(Controller):
     def team_name(self) -> str:
         return "Human"
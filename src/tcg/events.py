@@ -0,0 +1,44 @@
+"""Typed game events reported to controllers through `info.events`."""
+
+from typing import NamedTuple
+
+# Event kinds
+STARTED = "started"
+CAPTURED = "captured"
+UPGRADE_STARTED = "upgrade_started"
+UPGRADE_FINISHED = "upgrade_finished"
+SEND_LAUNCHED = "send_launched"
+PAWNS_ARRIVED = "pawns_arrived"
+PAWN_CAP = "pawn_cap"
+
+KINDS = (
+    STARTED,
+    CAPTURED,
+    UPGRADE_STARTED,
+    UPGRADE_FINISHED,
+    SEND_LAUNCHED,
+    PAWNS_ARRIVED,
+    PAWN_CAP,
+)
+
+
+class GameEvent(NamedTuple):
+    """Something that happened to a fortress at `step`.
+
+    `team` is the team that caused it and `value` depends on the kind:
+
+    - STARTED: the match began; `fortress` is -1.
+    - CAPTURED: `team` took `fortress` from the team in `value`.
+    - UPGRADE_STARTED: `fortress` started upgrading from level `value`.
+    - UPGRADE_FINISHED: `fortress` reached level `value`.
+    - SEND_LAUNCHED: `value` pawns set off from `fortress` towards `to`.
+    - PAWNS_ARRIVED: `value` pawns of `team` reached `fortress` this step.
+    - PAWN_CAP: regeneration filled `fortress` up to its limit `value`.
+    """
+
+    kind: str
+    step: int
+    team: int
+    fortress: int
+    value: float = 0
+    to: int = -1
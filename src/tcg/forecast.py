@@ -0,0 +1,171 @@
+"""Projected fortress owners and garrisons from the pawns already on their way."""
+
+import numpy as np
+
+from .config import depart_interval, fortress_cool, fortress_limit, n_fortress, travel_time
+from .scheduler import next_multiple
+
+_damage = (0.65, 0.95)
+
+
+class ArrivalTimeline:
+    """Pawns due at each fortress, counted by arrival step, team and kind.
+
+    Pawns still queued at a spawn point are entered at their nominal
+    arrival (next departure slot plus `travel_time`) when the send is
+    ordered, and moved to their exact step when they launch.
+    """
+
+    def __init__(self):
+        self.due = {}  # step -> {(team, kind, to): pawns}
+
+    def add(self, step, team, kind, to, n=1):
+        at = self.due.setdefault(step, {})
+        at[team, kind, to] = at.get((team, kind, to), 0) + n
+
+    def remove(self, step, team, kind, to):
+        at = self.due[step]
+        at[team, kind, to] -= 1
+        if not at[team, kind, to]:
+            del at[team, kind, to]
+            if not at:
+                del self.due[step]
+
+    def send(self, team, kind, from_, to, count, step):
+        """Enter the `count` pawns of a send ordered at `step`."""
+        interval = depart_interval[kind]
+        first = next_multiple(step, interval) + travel_time[kind][from_][to]
+        for i in range(int(count)):
+            self.add(first + i * interval, team, kind, to)
+
+    def launch(self, team, kind, from_, to, step, arrival):
+        """Move a pawn leaving at `step` from its nominal to its exact arrival."""
+        nominal = step + travel_time[kind][from_][to]
+        if arrival != nominal:
+            self.remove(nominal, team, kind, to)
+            self.add(arrival, team, kind, to)
+
+    def landed(self, step):
+        """Forget the pawns due at `step` once they have arrived."""
+        self.due.pop(step, None)
+
+    @classmethod
+    def of(cls, sim):
+        """Build the timeline from scratch out of the pawns of `sim`."""
+        timeline = cls()
+        if sim.pawn_store == "convoy":
+            for c in sim.pawns.convoys:
+                for i in range(c.arrived, c.count):
+                    timeline.add(c.departure(i) + c.travel, c.team, c.kind, c.to)
+            return timeline
+        if sim.pawn_store == "array":
+            p = sim.pawns
+            n = p.n
+            for step, team, kind, to in zip(
+                p.arrival[:n].tolist(), p.team[:n].tolist(), p.kind[:n].tolist(), p.to[:n].tolist()
+            ):
+                timeline.add(step, team, kind, to)
+        else:
+            for step, pawns in sim.arrival_schedule.items():
+                for team, kind, _, to, _ in pawns:
+                    timeline.add(step, team, kind, to)
+        for team, kind, count, from_, to, _ in sim._spawning_pawns:
+            timeline.send(team, kind, from_, to, count, sim.step)
+        return timeline
+
+
+class Forecast:
+    """Fortress owners and garrisons for `horizon` steps from `start`.
+
+    Row h of `owner` and `pawns` is the state after step `start + h`,
+    assuming neither side orders anything more.  Arrivals, regeneration,
+    the overflow decay and running upgrades are played with the engine's
+    rules; pawns of different teams landing on one fortress in the same
+    step are applied team by team.  Pawns still waiting to leave are taken
+    to need the nominal travel time, which the sideways spread they get at
+    launch can stretch by a step.
+    """
+
+    __slots__ = ("start", "initial", "owner", "pawns")
+
+    def __init__(self, start, initial, owner, pawns):
+        self.start = start
+        self.initial = initial
+        self.owner = owner
+        self.pawns = pawns
+
+    def falls_at(self, i):
+        """First step after which fortress i has changed hands, or None."""
+        changed = np.flatnonzero(self.owner[:, i] != self.initial[i])
+        return self.start + int(changed[0]) if len(changed) else None
+
+    def flipped(self, swap, teams):
+        """This forecast with fortress columns reordered by `swap` and teams mapped by `teams`."""
+        return Forecast(
+            self.start, teams[self.initial[swap]], teams[self.owner[:, swap]], self.pawns[:, swap]
+        )
+
+
+def project(state, timeline, start, horizon):
+    """`Forecast` of `state` over `horizon` steps, `start` being the next step to run."""
+    owner = np.empty((horizon, n_fortress), dtype=np.int8)
+    pawns = np.empty((horizon, n_fortress), dtype=np.float64)
+    initial = np.array([row[0] for row in state], dtype=np.int8)
+    end = start + horizon
+
+    arrivals = [{} for _ in range(n_fortress)]
+    for step, at in timeline.due.items():
+        if start <= step < end:
+            for (team, kind, to), n in at.items():
+                arrivals[to].setdefault(step, []).append((team, kind, n))
+
+    for i in range(n_fortress):
+        team, kind, level, count, timer = state[i][:5]
+        due = arrivals[i]
+        steps = sorted(due)
+        a = 0
+        s = start
+        while s < end:
+            limit = fortress_limit[level]
+            nxt = steps[a] if a < len(steps) else end
+            if count < limit:
+                nxt = min(nxt, next_multiple(s, fortress_cool[kind][level]))
+            elif count > limit:
+                nxt = min(nxt, next_multiple(s, 40))
+            if timer >= 0:
+                nxt = min(nxt, s + timer)
+            nxt = min(nxt, end)
+            # Steps s..nxt-1 only tick the upgrade timer
+            owner[s - start : nxt - start, i] = team
+            pawns[s - start : nxt - start, i] = count
+            if timer > 0:
+                timer -= nxt - s
+            if nxt == end:
+                break
+            s = nxt
+
+            # One engine step at s: arrivals, regen, overflow, upgrade
+            if a < len(steps) and steps[a] == s:
+                for t, k, n in sorted(due[s]):
+                    for _ in range(n):
+                        if t == team:
+                            count += 1
+                        else:
+                            count -= _damage[k]
+                            if count < 0:
+                                team, level, count, timer = t, 1, 0, -1
+                a += 1
+            limit = fortress_limit[level]
+            if s % fortress_cool[kind][level] == 0 and count < limit:
+                count = min(count + 1, limit)
+            if s % 40 == 0 and count > limit:
+                count -= 1
+            if timer > 0:
+                timer -= 1
+            elif timer == 0:
+                timer = -1
+                level += 1
+            owner[s - start, i] = team
+            pawns[s - start, i] = count
+            s += 1
+    return Forecast(start, initial, owner, pawns)
@@ -0,0 +1,48 @@
+"""Forward model: play scripted commands from a snapshot without controllers."""
+
+import numpy as np
+
+from .vec_game import VecGame
+
+
+class _PlannedGames(VecGame):
+    """VecGame whose commands come from per-match plans instead of controllers."""
+
+    def __init__(self, snap, plans, seed):
+        super().__init__([(None, None)] * len(plans), seed=seed)
+        self.load(snap)
+        self.plans = []
+        for plan in plans:
+            by_step = {}
+            for step, team, command, subject, to in plan:
+                by_step.setdefault(step, []).append((team, command, subject, to))
+            self.plans.append(by_step)
+
+    def decide_all(self, done):
+        for g in np.flatnonzero(self.running).tolist():
+            for team, command, subject, to in self.plans[g].get(self.step, ()):
+                self.order(g, team, command, subject, to)
+
+
+def simulate_batch(snap, plans, horizon, seed=0):
+    """Play each command plan from `snap` for `horizon` steps, all in one batch.
+
+    `snap` is a `Snapshot` from `Simulation.snapshot()` or
+    `snapshot.from_info()`.  Each plan is a list of `(step, team, command,
+    subject, to)` tuples with absolute step numbers; commands use the same
+    fortress numbers and teams as the snapshot.  Steps without a command
+    are idle for both sides.
+
+    Returns the final fortress rows as an `[len(plans), 12, 5]` array of
+    `[team, kind, level, pawn_number, upgrade_time]`.
+    """
+    games = _PlannedGames(snap, plans, seed)
+    end = snap.step + horizon
+    while games.step < end and games.advance():
+        pass
+    return games.state
+
+
+def simulate(snap, plan, horizon, seed=0):
+    """Play one command plan from `snap`; returns the final `[12, 5]` fortress rows."""
+    return simulate_batch(snap, [plan], horizon, seed)[0]
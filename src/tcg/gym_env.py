@@ -66,19 +66,11 @@ class TCGEnv(gym.Env):
             state_obs.extend([s[0], s[1], s[2], s[3], s[4]])
         
         # 2. Edge Traffic (12 * 12 * 2)
-        # Map moving pawns to edges
-        edge_traffic = np.zeros((12, 12, 2), dtype=np.float32)
-        
-        for pawn in self.game.moving_pawns:
-            # pawn: [team, kind, from_, to, pos]
-            team = pawn[0]
-            from_ = pawn[2]
-            to = pawn[3]
-            
-            # Team 1 is index 0, Team 2 is index 1
-            team_idx = 0 if team == 1 else 1
-            
-            edge_traffic[from_][to][team_idx] += 1 # Count pawns
+        # Pawns in flight per edge, counted by the engine
+        # Team 1 is index 0, Team 2 is index 1
+        moving = self.game.traffic.moving
+        edge_traffic = np.stack([moving[1].sum(axis=0), moving[2].sum(axis=0)], axis=-1)
+        edge_traffic = edge_traffic.astype(np.float32)
             
         return np.concatenate([
             np.array(state_obs, dtype=np.float32),
@@ -92,7 +84,12 @@ class TCGEnv(gym.Env):
         opponent = self.opponent_class()
         
         # Randomize sides? For now, Agent is always Player 1 (Blue/Bottom)
-        self.game = GymGame(self.gym_controller, opponent, window=(self.render_mode == "human"))
+        self.game = GymGame(
+            self.gym_controller,
+            opponent,
+            window=(self.render_mode == "human"),
+            seed=int(self.np_random.integers(2**63)),
+        )
         
         # Initial observation
         return self._get_obs(), {}
@@ -124,11 +121,13 @@ class TCGEnv(gym.Env):
         prev_state_team = [s[0] for s in self.game.state]
         prev_state_lvl = [s[2] for s in self.game.state]
         prev_invalid = self.game.invalid_delivers
+        changed = set()
         
         for _ in range(steps_to_run):
             if not self.game.process_step():
                 terminated = True
                 break
+            changed |= self.game.changed_fortresses
         
         # Calculate Reward
         # 1. Win/Loss
@@ -152,7 +151,8 @@ class TCGEnv(gym.Env):
         blue_to_neutral = 0
         blue_to_enemy = 0
         blue_upgrades = 0
-        for i in range(12):
+        # Only fortresses the engine touched this frame can have changed
+        for i in changed:
             if prev_team[i] == 0 and curr_team[i] == 1:
                 neutral_to_blue += 1
             elif prev_team[i] == 2 and curr_team[i] == 1:
@@ -164,11 +164,8 @@ class TCGEnv(gym.Env):
             if prev_team[i] == 1 and curr_team[i] == 1 and curr_lvl[i] > prev_lvl[i]:
                 blue_upgrades += 1
         
-        current_blue = 0
-        current_red = 0
-        for s in self.game.state:
-            if s[0] == 1: current_blue += 1
-            elif s[0] == 2: current_red += 1
+        current_blue = self.game.Blue_fortress
+        current_red = self.game.Red_fortress
         # Base shaping on current advantage
         reward += (current_blue - current_red) * 0.1
         # Event shaping for transitions
@@ -194,11 +191,9 @@ class TCGEnv(gym.Env):
 
     def render(self):
         if self.render_mode == "human" and self.game.window_enabled:
-            # The game draws itself in process_step if window is enabled
-            # But we need to handle the display update if we are controlling the loop
-            import pygame
-            pygame.display.update()
-            self.game.fps(30)
+            # The game draws itself in process_step if window is enabled;
+            # here we only pace the frames
+            self.game.renderer.tick(self.metadata["render_fps"])
 
     def close(self):
         if self.window is not None:
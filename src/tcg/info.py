@@ -0,0 +1,107 @@
+"""The `info` payload handed to `Controller.update`, built on demand."""
+
+from collections.abc import Sequence
+
+from .analysis import BoardAnalysis
+
+
+class LazyList(Sequence):
+    """A list that is only built, by calling `build()`, when first read."""
+
+    __slots__ = ("_build", "_items")
+
+    def __init__(self, build):
+        self._build = build
+        self._items = None
+
+    @property
+    def items(self):
+        if self._items is None:
+            self._items = self._build()
+        return self._items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, i):
+        return self.items[i]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __eq__(self, other):
+        return isinstance(other, Sequence) and list(self.items) == list(other)
+
+    def __repr__(self):
+        return repr(self.items)
+
+
+class Info(Sequence):
+    """`[team, state, moving_pawns, spawning_pawns, done]` for one step.
+
+    Unpacks and indexes like the old 5-item list and also has the fields as
+    attributes.  The pawn lists may be `LazyList`s, so a player that only
+    looks at fortresses never pays for building them.  `events` holds the
+    `GameEvent`s since the controller was last called, `traffic` the
+    engine's `Traffic` counts of pawns per road and `forecast(horizon)`
+    returns a `Forecast`; they are attributes only, so the 5-item shape is
+    unchanged.  `analysis` is the `BoardAnalysis` of `state`, built the
+    first time a player asks for it.  `version` changes whenever a
+    fortress row does, apart from the upgrade countdown ticking, so equal
+    versions mean the same fortresses; it is None when the engine does not
+    keep one.
+    """
+
+    __slots__ = (
+        "team",
+        "state",
+        "moving_pawns",
+        "spawning_pawns",
+        "done",
+        "events",
+        "traffic",
+        "forecast",
+        "version",
+        "_analysis",
+    )
+
+    def __init__(
+        self,
+        team,
+        state,
+        moving_pawns,
+        spawning_pawns,
+        done,
+        events=(),
+        traffic=None,
+        forecast=None,
+        version=None,
+    ):
+        self.team = team
+        self.state = state
+        self.moving_pawns = moving_pawns
+        self.spawning_pawns = spawning_pawns
+        self.done = done
+        self.events = events
+        self.traffic = traffic
+        self.forecast = forecast
+        self.version = version
+        self._analysis = None
+
+    @property
+    def analysis(self):
+        if self._analysis is None:
+            self._analysis = BoardAnalysis(self.state)
+        return self._analysis
+
+    def __len__(self):
+        return 5
+
+    def __getitem__(self, i):
+        return (self.team, self.state, self.moving_pawns, self.spawning_pawns, self.done)[i]
+
+    def __iter__(self):
+        return iter((self.team, self.state, self.moving_pawns, self.spawning_pawns, self.done))
+
+    def __repr__(self):
+        return f"Info{tuple(self)!r}"
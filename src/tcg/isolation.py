@@ -0,0 +1,314 @@
+"""Controllers hosted in worker processes, fed through shared memory."""
+
+import multiprocessing
+import random
+import time
+import traceback
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .config import n_fortress
+from .controller import Controller
+from .info import Info
+from .pawns import Traffic
+
+
+def _layout(capacity):
+    return (
+        ("header", (4,)),  # team, done, moving pawns, spawning pawns
+        ("state", (n_fortress, 5)),
+        ("moving", (capacity, 6)),  # team, kind, from_, to, x, y
+        ("spawning", (capacity, 7)),  # team, kind, count, from_, to, x, y
+        ("traffic_moving", (3, 2, n_fortress, n_fortress)),
+        ("traffic_queued", (3, 2, n_fortress, n_fortress)),
+        ("traffic_incoming", (3, 2, n_fortress)),
+    )
+
+
+def _number(value):
+    return int(value) if value.is_integer() else value
+
+
+class SharedBoard:
+    """One step's `Info` laid out in a shared-memory buffer.
+
+    The parent `publish`es into it and the worker `read`s an `Info` back,
+    so fortresses, pawns and traffic counts cross the process boundary
+    without being pickled.  Up to `capacity` moving and spawning pawns fit
+    in the buffer; more than that are handed back by `publish` to be sent
+    along with the request instead.
+    """
+
+    def __init__(self, capacity, name=None):
+        layout = _layout(capacity)
+        size = sum(8 * int(np.prod(shape)) for _, shape in layout)
+        self.shm = SharedMemory(name=name, create=name is None, size=size)
+        self.name = self.shm.name
+        self.capacity = capacity
+        self.arrays = {}
+        offset = 0
+        for field, shape in layout:
+            array = np.ndarray(shape, dtype=np.float64, buffer=self.shm.buf, offset=offset)
+            self.arrays[field] = array
+            offset += array.nbytes
+
+    def publish(self, info):
+        """Write `info` into the buffer; returns the pawn lists if they do not fit."""
+        a = self.arrays
+        moving, spawning = info.moving_pawns, info.spawning_pawns
+        a["header"][:] = (info.team, info.done, len(moving), len(spawning))
+        a["state"][:] = [row[:5] for row in info.state]
+        extra = None
+        if len(moving) > self.capacity or len(spawning) > self.capacity:
+            extra = ([list(p[:4]) + [list(p[4])] for p in moving], [list(p) for p in spawning])
+        else:
+            if len(moving):
+                a["moving"][: len(moving)] = [(*p[:4], *p[4]) for p in moving]
+            if len(spawning):
+                a["spawning"][: len(spawning)] = [(*p[:5], *p[5]) for p in spawning]
+        traffic = getattr(info, "traffic", None)
+        if traffic is not None:
+            a["traffic_moving"][:] = traffic.moving
+            a["traffic_queued"][:] = traffic.queued
+            a["traffic_incoming"][:] = traffic.incoming
+        return extra
+
+    def read(self, roads, events, version, extra):
+        """The `Info` last published, with the `to_set` lists taken from `roads`."""
+        a = self.arrays
+        team, done, n_moving, n_spawning = a["header"].tolist()
+        state = [
+            [int(t), int(k), int(lv), _number(c), int(u), list(to_set)]
+            for (t, k, lv, c, u), to_set in zip(a["state"].tolist(), roads)
+        ]
+        if extra is not None:
+            moving, spawning = extra
+        else:
+            moving = [
+                [int(t), int(k), int(f), int(d), [x, y]]
+                for t, k, f, d, x, y in a["moving"][: int(n_moving)].tolist()
+            ]
+            spawning = [
+                [int(t), int(k), _number(c), int(f), int(d), [x, y]]
+                for t, k, c, f, d, x, y in a["spawning"][: int(n_spawning)].tolist()
+            ]
+        traffic = Traffic()
+        traffic.moving[:] = a["traffic_moving"]
+        traffic.queued[:] = a["traffic_queued"]
+        traffic.incoming[:] = a["traffic_incoming"]
+        return Info(int(team), state, moving, spawning, bool(done), events, traffic, None, version)
+
+    def close(self):
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self):
+        self.close()
+        self.shm.unlink()
+
+
+def _serve(conn, factory, args, kwargs, name, capacity):
+    """Worker process main loop: answer update requests until told to stop."""
+    board = SharedBoard(capacity, name)
+    try:
+        controller = factory(*args, **kwargs)
+        conn.send(("ready", controller.team_name(), getattr(controller, "decision_interval", 1)))
+    except Exception:
+        conn.send(("error", 0, traceback.format_exc()))
+        board.close()
+        return
+    roads = None
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message[0] == "close":
+            break
+        if message[0] == "rng":
+            rng = random.Random()
+            rng.setstate(message[1])
+            controller.set_rng(rng)
+            continue
+        _, seq, events, version, extra, new_roads = message
+        if new_roads is not None:
+            roads = new_roads
+        info = board.read(roads, events, version, extra)
+        try:
+            reply = ("result", seq, controller.update(info))
+        except Exception:
+            reply = ("error", seq, traceback.format_exc())
+        conn.send(reply)
+    board.close()
+
+
+def _shutdown(process, conn, board):
+    try:
+        conn.send(("close",))
+    except (OSError, ValueError):
+        pass
+    process.join(1)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    conn.close()
+    board.unlink()
+
+
+class IsolatedController(Controller):
+    """Runs `factory(*args, **kwargs)` in a worker process and relays to it.
+
+    Each step's `Info` is published through a `SharedBoard` and only the
+    events, version and a sequence number go through the pipe.  With a
+    `budget` in seconds a decision that takes longer is played as a no-op;
+    the late answer is thrown away and the worker is not asked again until
+    it has given it.  If update raises, its traceback is kept in `error`
+    and the step is a no-op; if the worker dies the controller plays no-ops
+    for the rest of the game.  `timeouts` and `errors` count both cases.
+    A worker whose factory has not returned within `startup` seconds is
+    killed and treated as dead from the start.
+
+    The engine calls `submit` for every controller that has one before
+    calling any update, so two isolated controllers compute at the same
+    time.  The worker sees no `forecast`, and an `EventController` inside
+    it is called every step.  `factory` must be picklable, as a class
+    importable by name is.  Call `close` when done with it.
+    """
+
+    def __init__(self, factory, *args, budget=None, capacity=4096, startup=60.0, **kwargs):
+        if budget is not None and budget <= 0:
+            raise ValueError(f"budget must be positive: {budget!r}")
+        if startup <= 0:
+            raise ValueError(f"startup must be positive: {startup!r}")
+        self.factory = factory
+        self.budget = budget
+        self.timeouts = 0
+        self.errors = 0
+        self.error = None
+        self.alive = True
+        self._name = getattr(factory, "__name__", repr(factory))
+        self._seq = 0
+        self._pending = None  # sequence number of the answer still owed
+        self._asked = False  # whether this step's info was sent
+        self._submitted = None
+        self._sent_at = 0.0
+        self._roads_sent = False
+
+        context = multiprocessing.get_context("spawn")
+        self._board = SharedBoard(capacity)
+        self._conn, child = context.Pipe()
+        self._process = context.Process(
+            target=_serve,
+            args=(child, factory, args, kwargs, self._board.name, capacity),
+            daemon=True,
+        )
+        self._process.start()
+        child.close()
+        self._finalizer = weakref.finalize(self, _shutdown, self._process, self._conn, self._board)
+
+        reply = self._receive(startup)
+        if reply is None and self.alive:
+            self._process.terminate()
+            self._die(f"worker did not start within {startup}s")
+        elif reply is not None and reply[0] == "ready":
+            self._name, self.decision_interval = reply[1], reply[2]
+        elif reply is not None:
+            self._fail(reply[2])
+            self.alive = False
+
+    def team_name(self) -> str:
+        return self._name
+
+    def set_rng(self, rng: random.Random) -> None:
+        if self.alive:
+            self._send(("rng", rng.getstate()))
+
+    def submit(self, info) -> None:
+        """Send this step's `info` to the worker without waiting for the answer."""
+        self._submitted = info
+        self._asked = False
+        if not self.alive:
+            return
+        if self._pending is not None:
+            # A late answer is still owed; skip this step unless it has come
+            reply = self._receive(0)
+            if reply is None:
+                return
+            if reply[0] == "error":
+                self._fail(reply[2])
+        extra = self._board.publish(info)
+        roads = None
+        if not self._roads_sent:
+            roads = [list(row[5]) for row in info.state]
+            self._roads_sent = True
+        self._seq += 1
+        message = (
+            "update",
+            self._seq,
+            list(getattr(info, "events", ())),
+            getattr(info, "version", None),
+            extra,
+            roads,
+        )
+        if self._send(message):
+            self._pending = self._seq
+            self._asked = True
+            self._sent_at = time.monotonic()
+
+    def update(self, info):
+        if self._submitted is not info:
+            self.submit(info)
+        self._submitted = None
+        if not self._asked:
+            return 0, 0, 0
+        self._asked = False
+        timeout = None
+        if self.budget is not None:
+            timeout = max(0.0, self._sent_at + self.budget - time.monotonic())
+        reply = self._receive(timeout)
+        if reply is None:
+            if self.alive:
+                self.timeouts += 1
+            return 0, 0, 0
+        if reply[0] == "error":
+            self._fail(reply[2])
+            return 0, 0, 0
+        return reply[2]
+
+    def close(self) -> None:
+        """Stop the worker and free the shared memory."""
+        self.alive = False
+        self._finalizer()
+
+    def _fail(self, error):
+        self.errors += 1
+        self.error = error
+
+    def _send(self, message):
+        try:
+            self._conn.send(message)
+            return True
+        except (OSError, ValueError):
+            self._die()
+            return False
+
+    def _receive(self, timeout):
+        """The next reply, or None if none came within `timeout` seconds."""
+        try:
+            if not self._conn.poll(timeout):
+                return None
+            reply = self._conn.recv()
+        except (EOFError, OSError):
+            self._die()
+            return None
+        self._pending = None
+        return reply
+
+    def _die(self, reason=None):
+        if self.alive:
+            self.alive = False
+            self._pending = None
+            self._process.join(1)
+            self._fail(reason or f"worker exited with code {self._process.exitcode}")
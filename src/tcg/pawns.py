@@ -0,0 +1,349 @@
+"""Alternative storage for moving pawns: NumPy arrays and convoy records."""
+
+import numpy as np
+
+from .config import (
+    A_coordinate,
+    depart_interval,
+    n_fortress,
+    pawn_speed,
+    pos_fortress,
+    travel_time,
+)
+from .scheduler import next_multiple
+
+_damage = np.array([0.65, 0.95], dtype=np.float64)
+
+# Golden ratio step used to spread convoy pawns across the road
+_SPREAD = 0.6180339887498949
+
+
+class PawnArrays:
+    """Moving pawns kept as parallel NumPy arrays.
+
+    Holds the same data as the `[team, kind, from_, to, [x, y]]` lists in
+    `Game.moving_pawns`, in the same order, plus the step each pawn arrives
+    at, so movement and arrivals are one vectorized update over every pawn
+    in flight.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.n = 0
+        self.team = np.zeros(capacity, dtype=np.int8)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.from_ = np.zeros(capacity, dtype=np.int8)
+        self.to = np.zeros(capacity, dtype=np.int8)
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.arrival = np.zeros(capacity, dtype=np.int64)
+        self._list = None
+
+    def __len__(self):
+        return self.n
+
+    def _columns(self):
+        return ("team", "kind", "from_", "to", "x", "y", "vx", "vy", "arrival")
+
+    def _grow(self):
+        for name in self._columns():
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, dtype=old.dtype)
+            new[: self.n] = old[: self.n]
+            setattr(self, name, new)
+
+    def append(self, team, kind, from_, to, pos, arrival):
+        if self.n == len(self.team):
+            self._grow()
+        i = self.n
+        self.team[i] = team
+        self.kind[i] = kind
+        self.from_[i] = from_
+        self.to[i] = to
+        self.x[i] = pos[0]
+        self.y[i] = pos[1]
+        self.vx[i] = A_coordinate[from_][to][0] * pawn_speed[kind]
+        self.vy[i] = A_coordinate[from_][to][1] * pawn_speed[kind]
+        self.arrival[i] = arrival
+        self.n += 1
+        self._list = None
+
+    def advance(self, k: int = 1):
+        """Move every pawn `k` steps along its road."""
+        n = self.n
+        if k == 1:
+            self.x[:n] += self.vx[:n]
+            self.y[:n] += self.vy[:n]
+        else:
+            self.x[:n] += self.vx[:n] * k
+            self.y[:n] += self.vy[:n] * k
+        self._list = None
+
+    def move(self, step):
+        """Advance one step and pop the pawns arriving at `step`.
+
+        Returns (team, kind, from_, to) arrays of the arrived pawns in list order.
+        """
+        self.advance()
+        return self.remove(self.arrival[: self.n] == step)
+
+    def remove(self, mask):
+        """Drop the pawns selected by `mask`, keeping the others in order."""
+        n = self.n
+        removed = (
+            self.team[:n][mask],
+            self.kind[:n][mask],
+            self.from_[:n][mask],
+            self.to[:n][mask],
+        )
+        if len(removed[0]) == 0:
+            return removed
+        keep = ~mask
+        m = int(keep.sum())
+        for name in self._columns():
+            arr = getattr(self, name)
+            arr[:m] = arr[:n][keep]
+        self.n = m
+        self._list = None
+        return removed
+
+    def to_list(self):
+        """Materialise the `[team, kind, from_, to, [x, y]]` list view."""
+        if self._list is None:
+            n = self.n
+            self._list = [
+                [t, k, f, to, [x, y]]
+                for t, k, f, to, x, y in zip(
+                    self.team[:n].tolist(),
+                    self.kind[:n].tolist(),
+                    self.from_[:n].tolist(),
+                    self.to[:n].tolist(),
+                    self.x[:n].tolist(),
+                    self.y[:n].tolist(),
+                )
+            ]
+        return self._list
+
+
+class Convoy:
+    """One deliver() stream: `count` pawns leaving `from_` for `to`.
+
+    Pawn i departs at `start + i * interval` and arrives `travel` steps
+    later, so the record replaces the spawning entry and every moving pawn
+    it would have produced.
+    """
+
+    __slots__ = (
+        "team",
+        "kind",
+        "from_",
+        "to",
+        "count",
+        "start",
+        "interval",
+        "travel",
+        "seed",
+        "seq",
+        "launched",
+        "arrived",
+    )
+
+    def __init__(self, team, kind, from_, to, count, step, seed, seq):
+        self.team = team
+        self.kind = kind
+        self.from_ = from_
+        self.to = to
+        self.count = count
+        self.interval = depart_interval[kind]
+        self.start = next_multiple(step, self.interval)
+        self.travel = travel_time[kind][from_][to]
+        self.seed = seed
+        self.seq = seq
+        self.launched = 0
+        self.arrived = 0
+
+    def departure(self, i):
+        return self.start + i * self.interval
+
+    def position(self, i, clock):
+        """Position of pawn i after the pawn_move of step `clock`."""
+        x, y = spawn_position(self.from_, self.to)
+        dx, dy = A_coordinate[self.from_][self.to]
+        r = (self.seed + i * _SPREAD) % 1.0 - 0.5
+        moves = clock - self.departure(i)
+        speed = pawn_speed[self.kind]
+        return [
+            x + dy * r * 10 + dx * speed * moves,
+            y - dx * r * 10 + dy * speed * moves,
+        ]
+
+
+def spawn_position(from_, to):
+    """Where pawns sent from `from_` to `to` leave the fortress."""
+    return [
+        pos_fortress[from_][0] + A_coordinate[from_][to][0] * 42,
+        pos_fortress[from_][1] + A_coordinate[from_][to][1] * 42,
+    ]
+
+
+class ConvoyStore:
+    """Spawning and moving pawns kept as one `Convoy` per send.
+
+    Memory and per-step work scale with the number of active sends rather
+    than the number of pawns.  Arrivals use the nominal travel time of the
+    road, and the sideways spread of each pawn is only used for drawing.
+    """
+
+    def __init__(self):
+        self.convoys = []
+        self.clock = 0
+        self._seq = 0
+
+    def __len__(self):
+        return sum(c.launched - c.arrived for c in self.convoys)
+
+    def add(self, team, kind, from_, to, count, step, seed):
+        self.convoys.append(Convoy(team, kind, from_, to, count, step, seed, self._seq))
+        self._seq += 1
+
+    def depart(self, step):
+        """Launch the pawns due at `step` as (arrival, team, kind, from_, to)."""
+        arrivals = []
+        for c in self.convoys:
+            while c.launched < c.count and c.departure(c.launched) <= step:
+                arrivals.append((c.departure(c.launched) + c.travel, c.team, c.kind, c.from_, c.to))
+                c.launched += 1
+        return arrivals
+
+    def next_departure(self):
+        """Step of the next pawn to leave a spawn point, or None."""
+        steps = [c.departure(c.launched) for c in self.convoys if c.launched < c.count]
+        return min(steps, default=None)
+
+    def move(self, step):
+        """Pop the pawns arriving at `step` as (team, kind, from_, to) in list order."""
+        self.clock = step
+        due = []
+        for c in self.convoys:
+            while c.arrived < c.launched and c.departure(c.arrived) + c.travel <= step:
+                due.append((c.departure(c.arrived), c.seq, c.team, c.kind, c.from_, c.to))
+                c.arrived += 1
+        if due:
+            self.convoys = [c for c in self.convoys if c.arrived < c.count]
+            due.sort()
+        return [pawn[2:] for pawn in due]
+
+    def moving_list(self):
+        """Expand in-flight pawns into `[team, kind, from_, to, [x, y]]` lists."""
+        pawns = []
+        for c in self.convoys:
+            for i in range(c.arrived, c.launched):
+                pawns.append((c.departure(i), c.seq, c, i))
+        pawns.sort(key=lambda p: p[:2])
+        return [[c.team, c.kind, c.from_, c.to, c.position(i, self.clock)] for _, _, c, i in pawns]
+
+    def spawning_list(self):
+        """Expand pending departures into `[team, kind, n, from_, to, pos]` lists."""
+        return [
+            [c.team, c.kind, c.count - c.launched, c.from_, c.to, spawn_position(c.from_, c.to)]
+            for c in self.convoys
+            if c.launched < c.count
+        ]
+
+
+class Traffic:
+    """Pawns on every road, counted by team and kind.
+
+    `moving[team, kind, from_, to]` counts pawns in flight and `queued` the
+    ones still waiting at the spawn point; `incoming[team, kind, to]` is
+    `moving` summed over the roads into `to`.  The engine updates the counts
+    as pawns are sent, launched and arrive, so reading them never walks the
+    pawn lists.
+    """
+
+    __slots__ = ("moving", "queued", "incoming")
+
+    def __init__(self):
+        self.moving = np.zeros((3, 2, n_fortress, n_fortress), dtype=np.int64)
+        self.queued = np.zeros((3, 2, n_fortress, n_fortress), dtype=np.int64)
+        self.incoming = np.zeros((3, 2, n_fortress), dtype=np.int64)
+
+    @classmethod
+    def count(cls, moving_pawns, spawning_pawns):
+        """Build the counts from scratch out of pawn and spawn lists."""
+        traffic = cls()
+        for team, kind, from_, to, _ in moving_pawns:
+            traffic.moving[team, kind, from_, to] += 1
+            traffic.incoming[team, kind, to] += 1
+        for team, kind, count, from_, to, _ in spawning_pawns:
+            traffic.queued[team, kind, from_, to] += int(count)
+        return traffic
+
+    @classmethod
+    def of(cls, info):
+        """`info.traffic`, or counts built from its pawn lists when it has none."""
+        traffic = getattr(info, "traffic", None)
+        return traffic if traffic is not None else cls.count(info[2], info[3])
+
+    def send(self, team, kind, from_, to, count):
+        self.queued[team, kind, from_, to] += int(count)
+
+    def launch(self, team, kind, from_, to):
+        self.queued[team, kind, from_, to] -= 1
+        self.moving[team, kind, from_, to] += 1
+        self.incoming[team, kind, to] += 1
+
+    def land(self, team, kind, from_, to):
+        self.moving[team, kind, from_, to] -= 1
+        self.incoming[team, kind, to] -= 1
+
+    def land_batch(self, team, kind, from_, to):
+        """`land` for the arrays returned by `PawnArrays.move`."""
+        np.subtract.at(self.moving, (team, kind, from_, to), 1)
+        np.subtract.at(self.incoming, (team, kind, to), 1)
+
+
+def arrive(state, team, kind, to):
+    """Apply one arriving pawn to `state` (same rules as `Game.pawn_arrive`)."""
+    if team == state[to][0]:
+        state[to][3] += 1
+    else:
+        if kind == 0:
+            state[to][3] -= 0.65
+        elif kind == 1:
+            state[to][3] -= 0.95
+
+        if state[to][3] < 0:
+            state[to] = [team, state[to][1], 1, 0, -1, state[to][5]]
+
+
+def apply_arrivals(state, team, kind, to):
+    """Apply a batch of arrivals from `PawnArrays.move` to `state`.
+
+    Fortresses that cannot change hands take the whole batch through one
+    `np.add.at`, which adds in pawn order just like the scalar path.  Where
+    the damage alone could drop the count below zero, ownership may flip
+    mid-batch, so those pawns are replayed one by one.
+    """
+    if len(team) == 0:
+        return
+    owner = np.array([s[0] for s in state], dtype=np.int8)
+    count = np.array([s[3] for s in state], dtype=np.float64)
+    delta = np.where(team == owner[to], 1.0, -_damage[kind])
+
+    worst = count.copy()
+    np.add.at(worst, to, np.minimum(delta, 0.0))
+    risky = worst < 1e-9
+    safe = ~risky[to]
+
+    np.add.at(count, to[safe], delta[safe])
+    for i in np.unique(to[safe]).tolist():
+        value = count[i].item()
+        # Friendly-only arrivals keep integer counts integral, as `+= 1` does
+        if isinstance(state[i][3], int) and value.is_integer():
+            value = int(value)
+        state[i][3] = value
+
+    for t, k, i in zip(team[~safe].tolist(), kind[~safe].tolist(), to[~safe].tolist()):
+        arrive(state, t, k, i)
@@ -5,7 +5,9 @@ AI Player
 Claudeが作りました
 """
 
-from tcg.config import fortress_cool, fortress_limit
+from tcg.config import fortress_cool, fortress_limit, travel_time
+from tcg.analysis import BoardAnalysis
+from tcg.pawns import Traffic
 from tcg.controller import Controller
 
 
@@ -45,7 +47,7 @@ class ClaudePlayer(Controller):
             defender_troops: 防御側の部隊数
             defender_level: 防御側のレベル
             defender_kind: 防御側の種類
-            travel_time: 到着までの推定時間（ステップ数）
+            travel_time: 到着までの時間（ステップ数、config.travel_time を参照）
 
         Returns:
             攻撃が成功しそうならTrue
@@ -93,9 +95,10 @@ class ClaudePlayer(Controller):
         actions = []
 
         # 自分の要塞と敵の要塞を分類
-        my_fortresses = [i for i in range(12) if state[i][0] == 1]
-        enemy_fortresses = [i for i in range(12) if state[i][0] == 2]
-        neutral_fortresses = [i for i in range(12) if state[i][0] == 0]
+        analysis = BoardAnalysis.of(info)
+        my_fortresses = analysis.mine
+        enemy_fortresses = analysis.enemy
+        neutral_fortresses = analysis.neutral
 
         # === 序盤戦略: 中立要塞の制圧を最優先 ===
         if phase == "early":
@@ -124,7 +127,7 @@ class ClaudePlayer(Controller):
                             state[neighbor][3],
                             state[neighbor][2],
                             state[neighbor][1],
-                            100  # 推定到着時間
+                            travel_time[state[my_fort][1]][my_fort][neighbor]
                         ):
                             importance = self.FORTRESS_IMPORTANCE[neighbor]
                             priority = 120 + importance * 3
@@ -142,7 +145,7 @@ class ClaudePlayer(Controller):
                             state[neighbor][3],
                             state[neighbor][2],
                             state[neighbor][1],
-                            150
+                            travel_time[state[my_fort][1]][my_fort][neighbor]
                         ):
                             # 敵の重要拠点を優先
                             importance = self.FORTRESS_IMPORTANCE[neighbor]
@@ -174,7 +177,7 @@ class ClaudePlayer(Controller):
                 level = state[my_fort][2]
                 importance = self.FORTRESS_IMPORTANCE[my_fort]
                 # 敵に隣接している要塞は優先的にアップグレード
-                enemy_neighbors = self.count_enemy_neighbors(my_fort, state)
+                enemy_neighbors = analysis.enemy_neighbors[my_fort]
 
                 if (state[my_fort][4] == -1 and
                     level <= 4 and
@@ -184,13 +187,11 @@ class ClaudePlayer(Controller):
 
         # === 防御支援 ===
         # 攻撃されている要塞を検出
-        under_attack = {}
-        for pawn in moving_pawns:
-            pawn_team, kind, from_, to, pos = pawn
-            if pawn_team == 2 and state[to][0] == 1:
-                if to not in under_attack:
-                    under_attack[to] = 0
-                under_attack[to] += 1
+        # 敵部隊の到着予定数はエンジンの集計 (info.traffic) から引く
+        incoming = Traffic.of(info).incoming[2].sum(axis=0).tolist()
+        under_attack = {
+            to: incoming[to] for to in range(12) if incoming[to] > 0 and state[to][0] == 1
+        }
 
         for target_fort, threat_level in under_attack.items():
             # 脅威が大きい場合は優先度を上げる
@@ -204,7 +205,7 @@ class ClaudePlayer(Controller):
         # 後方の安全な要塞から前線へ部隊を送る
         for my_fort in my_fortresses:
             level = state[my_fort][2]
-            enemy_neighbors = self.count_enemy_neighbors(my_fort, state)
+            enemy_neighbors = analysis.enemy_neighbors[my_fort]
 
             # 敵に隣接していない要塞で部隊が溜まっている場合
             if enemy_neighbors == 0 and state[my_fort][3] >= fortress_limit[level] * 0.7:
@@ -212,7 +213,7 @@ class ClaudePlayer(Controller):
                 # 前線の味方要塞を探す
                 for neighbor in neighbors:
                     if state[neighbor][0] == 1:
-                        neighbor_enemy_count = self.count_enemy_neighbors(neighbor, state)
+                        neighbor_enemy_count = analysis.enemy_neighbors[neighbor]
                         if neighbor_enemy_count > 0:
                             priority = 50 + neighbor_enemy_count * 5
                             actions.append((priority, 1, my_fort, neighbor))
@@ -1,5 +1,6 @@
 
 from stable_baselines3 import PPO
+from tcg.pawns import Traffic
 from tcg.controller import Controller
 from tcg.gym_env import TCGEnv, GymController
 import numpy as np
@@ -29,23 +30,11 @@ class MLPlayer(Controller):
             state_obs.extend([s[0], s[1], s[2], s[3], s[4]])
             
         # 2. Edge Traffic
-        edge_traffic = np.zeros((12, 12, 2), dtype=np.float32)
-        for pawn in moving_pawns:
-            # pawn: [team, kind, from_, to, pos]
-            p_team = pawn[0]
-            from_ = pawn[2]
-            to = pawn[3]
-            
-            # Map team ID to 0/1 index relative to US
-            # If we are team 1, team 1 is 0, team 2 is 1.
-            # If we are team 2, the game flips the view so we see ourselves as team 1.
-            # So 'team' in info is always relative?
-            # Wait, flip_board_view swaps team IDs.
-            # So if we are team 2, flip_board_view converts our ID to 1.
-            # So 'p_team' 1 is always US, 2 is always ENEMY in 'info'.
-            
-            team_idx = 0 if p_team == 1 else 1
-            edge_traffic[from_][to][team_idx] += 1
+        # Pawns in flight per road, [from_, to, team] with US (team 1) at index 0.
+        # flip_board_view already swapped ids, so team 1 is always US here.
+        moving = Traffic.of(info).moving
+        edge_traffic = np.stack([moving[1].sum(axis=0), moving[2].sum(axis=0)], axis=-1)
+        edge_traffic = edge_traffic.astype(np.float32)
             
         obs = np.concatenate([
             np.array(state_obs, dtype=np.float32),
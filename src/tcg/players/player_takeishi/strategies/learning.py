@@ -251,6 +251,8 @@ class LearningAgent:
         self.target_net = None
         self.replay = ReplayBuffer()
         self.epsilon = 0.2
+        # exploration draws; replaced by a seeded stream via set_rng
+        self.rng = random
         self._train_steps = 0
         self.target_tau = 0.01  # soft update rate
         if torch is not None:
@@ -269,6 +271,9 @@ class LearningAgent:
         # debug counter
         self._debug_prints = 0
 
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+
     def select_action(self, info) -> Tuple[int,int,int]:
         team, state, moving_pawns, spawning_pawns, done = info
         candidates = generate_action_candidates(state)
@@ -276,8 +281,8 @@ class LearningAgent:
             return heuristic_fallback(state)
         state_vec = featurize_state(state)
         # if no model or explore, pick random
-        if self.net is None or (torch is not None and random.random() < self.epsilon):
-            cmd,s,t = random.choice(candidates)
+        if self.net is None or (torch is not None and self.rng.random() < self.epsilon):
+            cmd,s,t = self.rng.choice(candidates)
             if not cfg.QUIET and self._debug_prints < 10:
                 print(f"[RL] random action: {(cmd,s,t)} from {len(candidates)} candidates")
                 self._debug_prints += 1
@@ -303,7 +308,7 @@ class LearningAgent:
                     print(f"[RL] heuristic fallback: {fall} (spread={0.0 if not vals else max(vals)-min(vals):.2e})")
                     self._debug_prints += 1
                 return fall
-            cmd,s,t = random.choice(candidates)
+            cmd,s,t = self.rng.choice(candidates)
             if not cfg.QUIET and self._debug_prints < 10:
                 print(f"[RL] random tie-break: {(cmd,s,t)}")
                 self._debug_prints += 1
@@ -1,6 +1,7 @@
 from pathlib import Path
 from sb3_contrib import MaskablePPO
 from sb3_contrib.common.maskable.policies import MaskableActorCriticPolicy
+from tcg.pawns import Traffic
 from tcg.controller import Controller
 from tcg.config import fortress_limit, A_coordinate, swap_number_l
 from tcg.utils import flip_board_view
@@ -90,7 +91,7 @@ class MLPlayer(Controller):
         
         # Flip view so we are always Team 1
         flipped_info = flip_board_view(info)
-        _, state, moving_pawns, _, _ = flipped_info
+        _, state, _, _, _ = flipped_info
         
         # Construct Observation
         state_obs = []
@@ -109,17 +110,10 @@ class MLPlayer(Controller):
             
             state_obs.extend([team_val, kind, level, pawns, upgrade])
             
-        edge_traffic = np.zeros((12, 12, 2), dtype=np.float32)
-        for pawn in moving_pawns:
-            # pawn: [team, kind, from_, to, pos]
-            team = pawn[0]
-            from_ = pawn[2]
-            to = pawn[3]
-            
-            # Team 1 is index 0, Team 2 is index 1
-            team_idx = 0 if team == 1 else 1
-            
-            edge_traffic[from_][to][team_idx] += 0.01 # Scale by 0.01
+        # Pawns in flight per road from the engine's counts, Team 1 at index 0
+        moving = Traffic.of(flipped_info).moving
+        edge_traffic = np.stack([moving[1].sum(axis=0), moving[2].sum(axis=0)], axis=-1)
+        edge_traffic = edge_traffic.astype(np.float32) * np.float32(0.01) # Scale by 0.01
             
         obs = np.concatenate([
             np.array(state_obs, dtype=np.float32),
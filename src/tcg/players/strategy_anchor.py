@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class Anchor(Controller):
@@ -12,9 +13,11 @@ class Anchor(Controller):
 
     HUBS = [4, 7]
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
@@ -37,7 +40,7 @@ class Anchor(Controller):
                         return 2, hub, 0
 
         # 2) 充足度の高い要塞から近接制圧（十分な兵力でのみ）
-        start_candidates = sorted(my_forts, key=lambda i: state[i][3] / max(1, fortress_limit[state[i][2]]), reverse=True)
+        start_candidates = sorted(my_forts, key=lambda i: analysis.fill[i], reverse=True)
         for start in start_candidates:
             limit = fortress_limit[state[start][2]]
             neighbors = state[start][5]
@@ -57,7 +60,7 @@ class Anchor(Controller):
                 target = min(viable_enemies, key=lambda n: state[n][3])
             elif allies and state[start][3] >= int(limit * 0.9):
                 # 満杯近くのみ前線強化（ちまちま送らない）
-                target = min(allies, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                target = min(allies, key=lambda a: analysis.fill[a])
             if target is not None:
                 return 1, start, target
 
@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class Bulwark(Controller):
@@ -10,9 +11,11 @@ class Bulwark(Controller):
     def team_name(self) -> str:
         return "Bulwark"
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
@@ -29,14 +32,14 @@ class Bulwark(Controller):
         for i in my_forts:
             lvl = state[i][2]
             limit = fortress_limit[lvl]
-            enemy_adj = any(state[n][0] == 2 for n in state[i][5])
+            enemy_adj = analysis.enemy_neighbors[i] > 0
             if not enemy_adj and state[i][3] >= int(limit * 0.7):
                 allies = [n for n in state[i][5] if state[n][0] == 1]
                 if allies:
                     # 敵隣接の味方を優先、次に兵力比が低い味方
-                    front = [a for a in allies if any(state[m][0] == 2 for m in state[a][5])]
+                    front = [a for a in allies if analysis.frontline_mask >> a & 1]
                     target_pool = front if front else allies
-                    target = min(target_pool, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                    target = min(target_pool, key=lambda a: analysis.fill[a])
                     return 1, i, target
 
         # 3) 満杯近くで攻撃（敵→中立→味方の順）
@@ -55,7 +58,7 @@ class Bulwark(Controller):
                     target = min(neutrals, key=lambda n: state[n][3])
                 elif allies:
                     # 兵力比が低い味方へ
-                    target = min(allies, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                    target = min(allies, key=lambda a: analysis.fill[a])
                 if target is not None:
                     return 1, i, target
 
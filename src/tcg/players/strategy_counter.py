@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class Counter(Controller):
@@ -10,9 +11,11 @@ class Counter(Controller):
     def team_name(self) -> str:
         return "Counter"
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
@@ -43,7 +46,7 @@ class Counter(Controller):
         for i in my_forts:
             lvl = state[i][2]
             limit = fortress_limit[lvl]
-            enemy_adj = any(state[n][0] == 2 for n in state[i][5])
+            enemy_adj = analysis.enemy_neighbors[i] > 0
             if enemy_adj and lvl < 5 and state[i][4] == -1 and state[i][3] >= int(limit * 0.6):
                 return 2, i, 0
 
@@ -59,7 +62,7 @@ class Counter(Controller):
                 enemy_score[e] += 2
 
         # 4) 攻撃実行: 充足度が高い自要塞から優先敵へ
-        for i in sorted(my_forts, key=lambda k: state[k][3] / max(1, fortress_limit[state[k][2]]), reverse=True):
+        for i in sorted(my_forts, key=lambda k: analysis.fill[k], reverse=True):
             limit = fortress_limit[state[i][2]]
             half_send = state[i][3] // 2
             dmg = 0.95 if state[i][1] == 1 else 0.65
@@ -77,13 +80,13 @@ class Counter(Controller):
         # 5) 前線強化: 安全後方から前線へ再配置（トリクル防止のため高充足時のみ）
         for i in my_forts:
             limit = fortress_limit[state[i][2]]
-            enemy_adj = any(state[n][0] == 2 for n in state[i][5])
+            enemy_adj = analysis.enemy_neighbors[i] > 0
             if not enemy_adj and state[i][3] >= int(limit * 0.9):
                 allies = [n for n in state[i][5] if state[n][0] == 1]
                 if allies:
-                    front = [a for a in allies if any(state[m][0] == 2 for m in state[a][5])]
+                    front = [a for a in allies if analysis.frontline_mask >> a & 1]
                     target_pool = front if front else allies
-                    target = min(target_pool, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                    target = min(target_pool, key=lambda a: analysis.fill[a])
                     return 1, i, target
 
         return 0, 0, 0
\ No newline at end of file
@@ -1,5 +1,5 @@
 
-import random
+from tcg.analysis import BoardAnalysis
 from tcg.controller import Controller
 from tcg.config import fortress_limit
 
@@ -16,8 +16,8 @@ class DefensiveEconomist(Controller):
     def update(self, info):
         team_id, state, moving_pawns, spawning_pawns, done = info
         
-        my_fortresses = [i for i, s in enumerate(state) if s[0] == 1]
-        random.shuffle(my_fortresses)
+        my_fortresses = list(BoardAnalysis.of(info).mine)
+        self.rng.shuffle(my_fortresses)
         
         for i in my_fortresses:
             level = state[i][2]
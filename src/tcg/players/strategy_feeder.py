@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class Feeder(Controller):
@@ -10,9 +11,11 @@ class Feeder(Controller):
     def team_name(self) -> str:
         return "Feeder"
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
@@ -20,7 +23,7 @@ class Feeder(Controller):
         for i in my_forts:
             lvl = state[i][2]
             limit = fortress_limit[lvl]
-            enemy_adj = any(state[n][0] == 2 for n in state[i][5])
+            enemy_adj = analysis.enemy_neighbors[i] > 0
             if not enemy_adj and lvl < 5 and state[i][4] == -1 and state[i][3] >= int(limit * 0.6):
                 return 2, i, 0
 
@@ -28,14 +31,14 @@ class Feeder(Controller):
         for i in my_forts:
             lvl = state[i][2]
             limit = fortress_limit[lvl]
-            enemy_adj = any(state[n][0] == 2 for n in state[i][5])
+            enemy_adj = analysis.enemy_neighbors[i] > 0
             if not enemy_adj and state[i][3] >= int(limit * 0.7):
                 allies = [n for n in state[i][5] if state[n][0] == 1]
                 if allies:
                     # 前線（敵隣接）を優先し、兵力比の低い味方へ供給
-                    front_allies = [a for a in allies if any(state[m][0] == 2 for m in state[a][5])]
+                    front_allies = [a for a in allies if analysis.frontline_mask >> a & 1]
                     target_pool = front_allies if front_allies else allies
-                    target = min(target_pool, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                    target = min(target_pool, key=lambda a: analysis.fill[a])
                     return 1, i, target
 
         # 3) 余力攻撃（90%以上）: 敵→中立の順
@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class Flow(Controller):
@@ -10,20 +11,22 @@ class Flow(Controller):
     def team_name(self) -> str:
         return "Flow"
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
         # 1) フロー再配置: 高充足→低充足の味方へ
-        for i in sorted(my_forts, key=lambda k: state[k][3] / max(1, fortress_limit[state[k][2]]), reverse=True):
+        for i in sorted(my_forts, key=lambda k: analysis.fill[k], reverse=True):
             limit_i = fortress_limit[state[i][2]]
             fill_i = state[i][3] / max(1, limit_i)
             if fill_i >= 0.7:
                 allies = [n for n in state[i][5] if state[n][0] == 1]
                 if allies:
-                    target = min(allies, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                    target = min(allies, key=lambda a: analysis.fill[a])
                     return 1, i, target
 
         # 2) 圧力攻撃（90%以上）
@@ -46,7 +49,7 @@ class Flow(Controller):
         for i in my_forts:
             lvl = state[i][2]
             limit = fortress_limit[lvl]
-            enemy_adj = any(state[n][0] == 2 for n in state[i][5])
+            enemy_adj = analysis.enemy_neighbors[i] > 0
             if not enemy_adj and lvl < 5 and state[i][4] == -1 and state[i][3] >= int(limit * 0.6):
                 return 2, i, 0
 
@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class Harasser(Controller):
@@ -11,9 +12,11 @@ class Harasser(Controller):
     def team_name(self) -> str:
         return "Harasser"
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
@@ -48,7 +51,7 @@ class Harasser(Controller):
                 limit = fortress_limit[lvl]
                 # 60%超ならアップグレード着手
                 if state[i][3] >= int(limit * 0.6):
-                    enemy_neighbors = any(state[n][0] == 2 for n in state[i][5])
+                    enemy_neighbors = analysis.enemy_neighbors[i] > 0
                     if enemy_neighbors:
                         return 2, i, 0
 
@@ -81,7 +84,7 @@ class Harasser(Controller):
 
         # 3) 後方からの前線強化
         for i in my_forts:
-            enemy_adj = any(state[n][0] == 2 for n in state[i][5])
+            enemy_adj = analysis.enemy_neighbors[i] > 0
             lvl = state[i][2]
             limit = fortress_limit[lvl]
             # 敵がいない安全後方で85%以上なら、前線味方へ再配置（ちまちま送らない）
@@ -89,12 +92,12 @@ class Harasser(Controller):
                 allies = [n for n in state[i][5] if state[n][0] == 1]
                 if allies:
                     # 前線（敵隣接）を優先
-                    front_allies = [a for a in allies if any(state[m][0] == 2 for m in state[a][5])]
+                    front_allies = [a for a in allies if analysis.frontline_mask >> a & 1]
                     target = None
                     if front_allies:
-                        target = min(front_allies, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                        target = min(front_allies, key=lambda a: analysis.fill[a])
                     else:
-                        target = min(allies, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                        target = min(allies, key=lambda a: analysis.fill[a])
                     if target is not None:
                         return 1, i, target
 
@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class Opportunist(Controller):
@@ -10,9 +11,11 @@ class Opportunist(Controller):
     def team_name(self) -> str:
         return "Opportunist"
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
@@ -51,9 +54,9 @@ class Opportunist(Controller):
             if state[i][3] >= int(limit * 0.75):
                 allies = [n for n in state[i][5] if state[n][0] == 1]
                 if allies:
-                    front = [a for a in allies if any(state[m][0] == 2 for m in state[a][5])]
+                    front = [a for a in allies if analysis.frontline_mask >> a & 1]
                     target_pool = front if front else allies
-                    target = min(target_pool, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                    target = min(target_pool, key=lambda a: analysis.fill[a])
                     return 1, i, target
 
         return 0, 0, 0
\ No newline at end of file
@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class Rusher(Controller):
@@ -10,9 +11,11 @@ class Rusher(Controller):
     def team_name(self) -> str:
         return "Rusher"
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
@@ -38,7 +41,7 @@ class Rusher(Controller):
                 elif enemies:
                     target = min(enemies, key=lambda n: state[n][3])
                 elif allies:
-                    target = min(allies, key=lambda a: state[a][3] / max(1, fortress_limit[state[a][2]]))
+                    target = min(allies, key=lambda a: analysis.fill[a])
                 if target is not None:
                     return 1, i, target
 
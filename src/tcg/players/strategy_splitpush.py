@@ -1,4 +1,5 @@
-from tcg.controller import Controller
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller, memoise
 from tcg.config import fortress_limit
 
 class SplitPusher(Controller):
@@ -18,9 +19,11 @@ class SplitPusher(Controller):
         [9, 10, 11],
     ]
 
+    @memoise
     def update(self, info):
         team, state, moving_pawns, spawning_pawns, done = info
-        my_forts = [i for i in range(12) if state[i][0] == 1]
+        analysis = BoardAnalysis.of(info)
+        my_forts = analysis.mine
         if not my_forts:
             return 0, 0, 0
 
@@ -73,7 +76,7 @@ class SplitPusher(Controller):
                 target = min(viable_enemies, key=lambda n: state[n][3])
             elif ally_targets and state[start][3] >= int(start_limit * 0.9):
                 # 前線強化は満杯近くのみ（ちまちま送らない）
-                target = min(ally_targets, key=lambda n: state[n][3] / max(1, fortress_limit[state[n][2]]))
+                target = min(ally_targets, key=lambda n: analysis.fill[n])
             if target is not None:
                 return 1, start, target
 
@@ -0,0 +1,71 @@
+"""Low-overhead latency counters for controller decisions."""
+
+# Durations are binned by their top three bits: 8 bins of 1 ns, then four
+# bins per power of two, so a quantile is known to within a quarter octave
+_BUCKETS = 8 + 4 * 60
+
+
+def _bucket(ns):
+    if ns < 8:
+        return max(ns, 0)
+    bits = ns.bit_length()
+    return min(8 + 4 * (bits - 4) + (ns >> (bits - 3)) - 4, _BUCKETS - 1)
+
+
+def _upper(bucket):
+    if bucket < 8:
+        return bucket
+    bits, top = divmod(bucket - 8, 4)
+    return ((top + 5) << (bits + 1)) - 1
+
+
+class LatencyStats:
+    """Call count, total, maximum and a histogram of durations in nanoseconds.
+
+    `record` is cheap enough to run on every update call, and stats from
+    several games `merge` without keeping the individual samples.  Times
+    are read back in seconds.
+    """
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * _BUCKETS
+
+    def record(self, ns):
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        self.buckets[_bucket(ns)] += 1
+
+    def merge(self, other):
+        """Add the calls counted in `other` to these."""
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+
+    @property
+    def mean(self):
+        return self.total / self.count / 1e9 if self.count else 0.0
+
+    @property
+    def longest(self):
+        return self.max / 1e9
+
+    def quantile(self, q):
+        """Upper bound of the `q` quantile, e.g. 0.99 for p99."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(_upper(i), self.max) / 1e9
+        return self.longest
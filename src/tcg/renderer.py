@@ -0,0 +1,263 @@
+"""Pygame drawing for Fortress Conquest, kept out of the simulation core."""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from .config import (
+    FPS,
+    HEIGHT,
+    SPEEDRATE,
+    WIDTH,
+    A_fortress_set,
+    color_fortress,
+    color_pawn,
+    n_fortress,
+    pos_fortress,
+)
+
+# Colour key of the cached layers; no road or fortress is drawn in it
+_CLEAR = (255, 0, 255)
+
+# Rendered text surfaces kept by `PygameRenderer.text`; a frame shows about
+# fifty strings, most of them the same as in the frame before
+TEXT_CACHE_SIZE = 512
+
+
+class PygameRenderer:
+    """Draws a `Simulation` into a pygame window.
+
+    Attach it with `sim.attach(renderer)`; it redraws every `speedrate`
+    steps and, if `fps` is set, paces the loop to that frame rate.
+    """
+
+    def __init__(self, team1: str, team2: str, speedrate: int = SPEEDRATE, fps: int | None = FPS):
+        # Suppress ALSA errors in environments without audio
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.init()
+        self.font = pygame.font.Font(None, 16)
+        self.font_number = pygame.font.Font(None, 36)
+
+        self.back_color = [150, 255, 150]
+
+        self.window = pygame.display.set_mode((WIDTH, HEIGHT))
+        # The roads never change and the fortresses only change colour, so
+        # both are drawn onto a cached board layer that is redrawn only when
+        # an owner changes; the layer is colour-keyed to let the fading
+        # background show through
+        self._roads = self._layer()
+        self.draw_road(self._roads)
+        self._board = self._layer()
+        self._owners = None
+        self._texts = OrderedDict()  # (font, text, colour) -> Surface
+        # Pawns are blitted from one pre-drawn sprite per team and kind,
+        # indexed by team * 2 + kind, each drawn at the pawn position less
+        # its offset
+        sprites = [self._pawn_sprite(team, kind) for team in (0, 1, 2) for kind in (0, 1)]
+        self._pawn_sprites = [sprite for sprite, _ in sprites]
+        self._pawn_offsets = tuple(offset for _, offset in sprites)
+        self.clock = pygame.time.Clock()
+        self.team1 = team1
+        self.team2 = team2
+        self.speedrate = int(speedrate)
+        self.fps = fps
+        self.seconds = 0
+        self._frame = 0
+
+    def on_step(self, sim):
+        """Handle window events and draw a frame every `speedrate` steps."""
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                exit(0)
+
+        self._frame += 1
+        if self._frame < self.speedrate:
+            return
+        self._frame = 0
+        self.draw(sim)
+        pygame.display.update()
+        if self.fps:
+            self.clock.tick(int(self.fps))
+
+    def tick(self, fps):
+        """Wait so that frames are shown at most `fps` times per second."""
+        self.clock.tick(int(fps))
+
+    def draw(self, sim):
+        """Draw the whole board for the current state of `sim`."""
+        self.seconds = pygame.time.get_ticks() // 1000
+        self.fade_background(sim)
+        self.window.fill(self.back_color)
+
+        self.draw_board(sim)
+        self.draw_pawn(sim)
+        self.draw_number(sim)
+        self.draw_team_name()
+
+    def fade_background(self, sim):
+        """Move the background colour one notch towards the leading team."""
+        back_color = [150, 150, 150]
+        if sim.Red_fortress == sim.Blue_fortress:
+            back_color[1] += 105
+        elif sim.Red_fortress > sim.Blue_fortress:
+            per = 2 * sim.Red_fortress / (sim.Red_fortress + sim.Blue_fortress) - 1
+            back_color[0] += int(105 * per)
+            back_color[1] += int(105 * (1 - per))
+        elif sim.Red_fortress < sim.Blue_fortress:
+            per = 2 * sim.Blue_fortress / (sim.Red_fortress + sim.Blue_fortress) - 1
+            back_color[2] += int(105 * per)
+            back_color[1] += int(105 * (1 - per))
+
+        for c in range(3):
+            if self.back_color[c] < back_color[c]:
+                self.back_color[c] += 1
+            elif self.back_color[c] > back_color[c]:
+                self.back_color[c] -= 1
+
+    def text(self, font, text, color):
+        """`font.render(text, True, color)`, from a cache of recent renders."""
+        key = (font, text, color)
+        surface = self._texts.get(key)
+        if surface is None:
+            surface = self._texts[key] = font.render(text, True, color)
+            if len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(key)
+        return surface
+
+    def _pawn_sprite(self, team, kind):
+        """The shape `draw_pawn` used to draw for a pawn, and where it starts."""
+        if kind == 0:
+            sprite = pygame.Surface((10, 10)).convert()
+            sprite.fill(_CLEAR)
+            sprite.set_colorkey(_CLEAR, pygame.RLEACCEL)
+            pygame.draw.circle(sprite, color_pawn[team], (5, 5), 5)
+            return sprite, 5
+        sprite = pygame.Surface((8, 8)).convert()
+        sprite.fill(color_pawn[team])
+        return sprite, 2
+
+    def _layer(self):
+        """A blank window-sized surface whose `_CLEAR` pixels are not blitted."""
+        layer = pygame.Surface((WIDTH, HEIGHT)).convert()
+        layer.fill(_CLEAR)
+        layer.set_colorkey(_CLEAR, pygame.RLEACCEL)
+        return layer
+
+    def draw_board(self, sim):
+        """Blit the roads and fortresses, redrawing the layer if an owner changed."""
+        owners = tuple(row[0] for row in sim.state)
+        if owners != self._owners:
+            self._board.blit(self._roads, (0, 0))
+            self.draw_fortress(sim, self._board)
+            self._owners = owners
+        self.window.blit(self._board, (0, 0))
+
+    def draw_fortress(self, sim, surface=None):
+        """Draw fortresses onto `surface`, the window by default."""
+        surface = self.window if surface is None else surface
+        r = 0
+        for x, y in pos_fortress:
+            if r == 4 or r == 7:  # Draw square fortresses
+                pygame.draw.rect(
+                    surface,
+                    color_fortress[sim.state[r][0]],
+                    pygame.Rect(x - 40, y - 40, 80, 80),
+                    width=0,
+                )
+            else:
+                pygame.draw.circle(surface, color_fortress[sim.state[r][0]], (x, y), 45)
+            r += 1
+
+    def draw_road(self, surface=None):
+        """Draw roads between fortresses onto `surface`, the window by default."""
+        surface = self.window if surface is None else surface
+        for i in range(n_fortress):
+            for j in range(n_fortress):
+                if A_fortress_set[i][j] == 1:
+                    pygame.draw.line(surface, [200, 150, 50], pos_fortress[i], pos_fortress[j], 25)
+
+    def draw_number(self, sim):
+        """Draw numbers on fortresses."""
+        for i in range(12):
+            text = self.text(self.font, f"Lv {sim.state[i][2]}", (0, 0, 0))
+            position = (pos_fortress[i][0] - 20, pos_fortress[i][1] - 35)
+            self.window.blit(text, position)
+
+            if sim.state[i][3] >= 10:
+                text = self.text(self.font_number, f"{int(sim.state[i][3])}", (0, 0, 0))
+                position = (pos_fortress[i][0] - 20, pos_fortress[i][1] - 5)
+                self.window.blit(text, position)
+            else:
+                text = self.text(self.font_number, f"{int(sim.state[i][3])}", (0, 0, 0))
+                position = (pos_fortress[i][0] - 10, pos_fortress[i][1] - 5)
+                self.window.blit(text, position)
+
+            if sim.state[i][4] != -1:
+                text = self.text(self.font, f"{int(sim.state[i][4] // 2)}", (0, 0, 0))
+                position = (pos_fortress[i][0] + 25, pos_fortress[i][1] - 5)
+                self.window.blit(text, position)
+
+        score_text = self.text(self.font, f"step: {sim.step}", (255, 255, 255))
+        score_position = (900, 10)
+        self.window.blit(score_text, score_position)
+
+        text = self.text(self.font, f"時間: {self.seconds}", (255, 255, 255))
+        position = (900, 30)
+        self.window.blit(text, position)
+
+        len_text = self.text(self.font, f"pawn: {len(sim.moving_pawns)}", (255, 255, 255))
+        position = (900, 50)
+        self.window.blit(len_text, position)
+
+        len_text = self.text(self.font, f"spawn: {len(sim.spawning_pawns)}", (255, 255, 255))
+        position = (900, 70)
+        self.window.blit(len_text, position)
+
+        len_text = self.text(self.font, f"Rate: {SPEEDRATE}", (255, 255, 255))
+        position = (900, 110)
+        self.window.blit(len_text, position)
+
+        len_text = self.text(self.font, f"fps: {FPS}", (255, 255, 255))
+        position = (900, 130)
+        self.window.blit(len_text, position)
+
+    def draw_team_name(self):
+        """Draw team names."""
+        len_text = self.text(self.font_number, f"Red : {self.team2}", (200, 25, 25))
+        position = (10, 10)
+        self.window.blit(len_text, position)
+        len_text = self.text(self.font_number, f"Blue: {self.team1}", (25, 25, 200))
+        position = (10, HEIGHT - 50)
+        self.window.blit(len_text, position)
+
+    def draw_pawn(self, sim):
+        """Draw pawns on screen in a single `blits` call.
+
+        pygame.draw truncates a float position to whole pixels, so each
+        sprite goes to the truncated position less its offset.  With
+        `pawn_store="array"` the positions are read straight from the
+        position arrays.
+        """
+        sprites, offsets = self._pawn_sprites, self._pawn_offsets
+        if sim.pawn_store == "array":
+            p = sim.pawns
+            n = p.n
+            index = p.team[:n].astype(np.int64) * 2 + p.kind[:n]
+            offset = np.array(offsets)[index]
+            blits = zip(
+                map(sprites.__getitem__, index.tolist()),
+                zip(
+                    (p.x[:n].astype(np.int64) - offset).tolist(),
+                    (p.y[:n].astype(np.int64) - offset).tolist(),
+                ),
+            )
+        else:
+            blits = []
+            for team, kind, _, _, (x, y) in sim.moving_pawns:
+                i = team * 2 + kind
+                blits.append((sprites[i], (int(x) - offsets[i], int(y) - offsets[i])))
+        self.window.blits(blits, doreturn=False)
@@ -0,0 +1,184 @@
+"""Event queue used to skip idle simulation steps."""
+
+import heapq
+import math
+
+import numpy as np
+
+from .config import (
+    A_coordinate,
+    arrive_radius,
+    depart_interval,
+    fortress_cool,
+    fortress_limit,
+    pawn_speed,
+    pos_fortress,
+)
+
+# Event kinds
+REGEN = "regen"
+OVERFLOW = "overflow"
+UPGRADE = "upgrade"
+ARRIVAL = "arrival"
+DECISION = "decision"
+END = "end"
+
+
+def next_multiple(step, period):
+    """Smallest step >= `step` that is a multiple of `period`."""
+    return -(-step // period) * period
+
+
+def steps_to_arrive(pos, kind, from_, to):
+    """Number of pawn_move calls until a pawn at `pos` reaches fortress `to`.
+
+    Pawns move in a straight line, so the arrival test in `pawn_move` is a
+    quadratic in the number of steps.  Returns None if the pawn never gets
+    within `arrive_radius` of the target.
+    """
+    speed = pawn_speed[kind]
+    vx = A_coordinate[from_][to][0] * speed
+    vy = A_coordinate[from_][to][1] * speed
+    dx = pos[0] - pos_fortress[to][0]
+    dy = pos[1] - pos_fortress[to][1]
+
+    a = vx * vx + vy * vy
+    b = 2 * (dx * vx + dy * vy)
+    c = dx * dx + dy * dy - arrive_radius**2
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return None
+
+    def inside(k):
+        return (dx + vx * k) ** 2 + (dy + vy * k) ** 2 <= arrive_radius**2
+
+    k = max(1, math.ceil((-b - math.sqrt(disc)) / (2 * a)))
+    # The root is exact up to rounding; settle the boundary with the real test.
+    while k > 1 and inside(k - 1):
+        k -= 1
+    while not inside(k):
+        k += 1
+    return k
+
+
+# Per-road unit direction as an array; zero where there is no road
+road_direction = np.array(
+    [
+        [A_coordinate[i][j] or (0.0, 0.0) for j in range(len(A_coordinate))]
+        for i in range(len(A_coordinate))
+    ],
+    dtype=np.float64,
+)
+
+
+def steps_to_arrive_batch(x, y, kind, from_, to):
+    """Vectorized `steps_to_arrive` for arrays of pawns (all on real roads)."""
+    speed = np.asarray(pawn_speed)[kind]
+    vx = road_direction[from_, to, 0] * speed
+    vy = road_direction[from_, to, 1] * speed
+    target = np.asarray(pos_fortress, dtype=np.float64)[to]
+    dx = x - target[:, 0]
+    dy = y - target[:, 1]
+
+    a = vx * vx + vy * vy
+    b = 2 * (dx * vx + dy * vy)
+    c = dx * dx + dy * dy - arrive_radius**2
+    disc = np.maximum(b * b - 4 * a * c, 0.0)
+    k = np.maximum(1, np.ceil((-b - np.sqrt(disc)) / (2 * a))).astype(np.int64)
+
+    def inside(k):
+        return (dx + vx * k) ** 2 + (dy + vy * k) ** 2 <= arrive_radius**2
+
+    while True:
+        m = (k > 1) & inside(k - 1)
+        if not m.any():
+            break
+        k[m] -= 1
+    while True:
+        m = ~inside(k)
+        if not m.any():
+            break
+        k[m] += 1
+    return k
+
+
+class EventQueue:
+    """Priority queue of future steps at which something can happen.
+
+    Entries are (step, kind) pairs and are deduplicated, so callers can push
+    the same upcoming event every step without growing the heap.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._pending = set()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, step, kind):
+        key = (step, kind)
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        heapq.heappush(self._heap, key)
+
+    def copy(self):
+        queue = EventQueue()
+        queue._heap = list(self._heap)
+        queue._pending = set(self._pending)
+        return queue
+
+    def next_step(self, now):
+        """Drop events before `now` and return the earliest remaining step."""
+        while self._heap and self._heap[0][0] < now:
+            self._pending.discard(heapq.heappop(self._heap))
+        if not self._heap:
+            return None
+        return self._heap[0][0]
+
+
+def next_departure(spawning_pawns, now):
+    """Earliest step from `now` at which a pawn leaves a spawn point, or None."""
+    kinds = {entry[1] for entry in spawning_pawns if entry[2] > 0}
+    return min((next_multiple(now, depart_interval[kind]) for kind in kinds), default=None)
+
+
+def next_fortress_event(row, now):
+    """Earliest regen, overflow or upgrade event of one fortress row, or None."""
+    team, kind, level, pawn_number, upgrade_time, _ = row
+    event = None
+    if pawn_number < fortress_limit[level]:
+        event = (next_multiple(now, fortress_cool[kind][level]), REGEN)
+    elif pawn_number > fortress_limit[level]:
+        event = (next_multiple(now, 40), OVERFLOW)
+    if upgrade_time >= 0 and (event is None or now + upgrade_time < event[0]):
+        event = (now + upgrade_time, UPGRADE)
+    return event
+
+
+def schedule_fortress_events(queue, state, now, pending, changed):
+    """Push the next regen, overflow and upgrade events.
+
+    `pending[i]` is the step of the event queued for fortress i, or None
+    when it has none.  Each fortress keeps only its earliest event, since
+    whatever happens then touches it, and only the fortresses in `changed`
+    or whose step is before `now` are looked at again; a step of -1 thus
+    has a fortress rescheduled on the next call.
+
+    These run after the controllers within a step, so the step right after
+    each one is queued as a decision point as well.
+    """
+    events = set()
+    for i, row in enumerate(state):
+        if i in changed or (pending[i] is not None and pending[i] < now):
+            event = next_fortress_event(row, now)
+            step = event and event[0]
+            if step != pending[i]:
+                pending[i] = step
+                if event is not None:
+                    events.add(event)
+
+    for step, kind in events:
+        queue.push(step, kind)
+        queue.push(step + 1, DECISION)
@@ -0,0 +1,761 @@
+"""Headless simulation core for Fortress Conquest."""
+
+import copy
+import itertools
+import random
+import time
+from collections import deque
+
+from .config import (
+    STEPLIMIT,
+    A_coordinate,
+    fortress_cool,
+    fortress_limit,
+    n_fortress,
+    pawn_speed,
+    pos_fortress,
+    swap_number_l,
+)
+from .controller import Controller, EventController
+from .events import (
+    CAPTURED,
+    PAWN_CAP,
+    PAWNS_ARRIVED,
+    SEND_LAUNCHED,
+    STARTED,
+    UPGRADE_FINISHED,
+    UPGRADE_STARTED,
+    GameEvent,
+)
+from .forecast import ArrivalTimeline, project
+from .info import Info, LazyList
+from .pawns import ConvoyStore, PawnArrays, Traffic, apply_arrivals, arrive
+from .profiling import LatencyStats
+from .scheduler import (
+    ARRIVAL,
+    DECISION,
+    END,
+    EventQueue,
+    next_departure,
+    schedule_fortress_events,
+    steps_to_arrive,
+)
+from .snapshot import pack, unpack
+from .utils import flip_board_view
+
+# State versions are drawn from one process-wide counter, so two games (or a
+# game and its clone) never hand out the same version for different states
+_versions = itertools.count(1)
+
+
+def initial_state():
+    """Fortress rows at the start of a match.
+
+    Each row is `[team, kind, level, pawn_number, upgrade_time, to_set]`.
+    """
+    return [
+        [0, 0, 1, 10, -1, [1, 3, 4]],
+        [2, 0, 2, 20, -1, [0, 2, 4]],
+        [0, 0, 1, 10, -1, [1, 4, 5]],
+        [0, 0, 2, 20, -1, [0, 4, 6, 7]],
+        [0, 1, 3, 30, -1, [0, 1, 2, 3, 5, 6, 7, 8]],
+        [0, 0, 2, 20, -1, [2, 4, 7, 8]],
+        [0, 0, 2, 20, -1, [3, 4, 7, 9]],
+        [0, 1, 3, 30, -1, [3, 4, 5, 6, 8, 9, 10, 11]],
+        [0, 0, 2, 20, -1, [4, 5, 7, 11]],
+        [0, 0, 1, 10, -1, [6, 7, 10]],
+        [1, 0, 2, 20, -1, [7, 9, 11]],
+        [0, 0, 1, 10, -1, [7, 8, 10]],
+    ]
+
+
+def is_plan(decision):
+    """Whether an update result is a plan rather than one `(command, subject, to)`."""
+    return isinstance(decision, list) and (not decision or isinstance(decision[0], (tuple, list)))
+
+
+def plan_entries(plan, step):
+    """Check a plan and return its entries as `(due_step, command, subject, to)`.
+
+    Entries are sorted by delay, keeping the given order for equal delays.
+    Raises ValueError for a malformed entry before anything is queued.
+    """
+    for entry in plan:
+        if not isinstance(entry, (tuple, list)) or len(entry) != 4:
+            raise ValueError(f"plan entry must be (delay, command, subject, to): {entry!r}")
+        delay = entry[0]
+        if not isinstance(delay, int) or isinstance(delay, bool) or delay < 0:
+            raise ValueError(f"plan delay must be a non-negative int: {delay!r}")
+    ordered = sorted(plan, key=lambda entry: entry[0])
+    return [(step + delay, command, subject, to) for delay, command, subject, to in ordered]
+
+
+def pop_planned(plan, step):
+    """Pop the command of `plan` due by `step`, or return a no-op."""
+    if plan and plan[0][0] <= step:
+        return plan.popleft()[1:]
+    return 0, 0, 0
+
+
+class Simulation:
+    """Game rules and state without any drawing.
+
+    `Game` and `GymGame` are thin wrappers around this class.  Observers
+    (such as `PygameRenderer`) are attached with `attach` and get
+    `on_step(sim)` after every simulated step.
+    """
+
+    def __init__(
+        self,
+        controller1: Controller,
+        controller2: Controller,
+        event_driven: bool = False,
+        pawn_store: str = "list",
+        seed: int | None = None,
+        decision_interval: int | tuple[int, int] | None = None,
+        profile: bool = False,
+    ):
+        self.controller1 = controller1  # bottom
+        self.controller2 = controller2  # up
+        # Steps between update calls per controller; None uses what each
+        # controller declares in its decision_interval attribute
+        if decision_interval is None:
+            decision_interval = tuple(
+                getattr(c, "decision_interval", 1) for c in (controller1, controller2)
+            )
+        elif isinstance(decision_interval, int):
+            decision_interval = (decision_interval, decision_interval)
+        if any(k < 1 for k in decision_interval):
+            raise ValueError(f"decision_interval must be >= 1: {decision_interval!r}")
+        self.decision_interval = tuple(decision_interval)
+        self._next_decision = [0, 0]
+        self._flips_seen = [0, 0]
+        self._plans = [deque(), deque()]
+        self.flips = 0
+        # With profile set, every update call is timed into latency[i]
+        self.latency = (LatencyStats(), LatencyStats()) if profile else None
+        # GameEvents each controller has not seen yet, and which controllers
+        # only want to be called when there are some
+        self._inbox = [[], []]
+        self._reactive = [isinstance(c, EventController) for c in (controller1, controller2)]
+        # A game is a pure function of its controllers and this seed.  The
+        # engine and each controller get their own stream derived from it;
+        # without a seed one is drawn from the global random module.
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        streams = random.Random(seed)
+        self.rng = random.Random(streams.getrandbits(64))
+        for controller in (controller1, controller2):
+            set_rng = getattr(controller, "set_rng", None)
+            if set_rng is not None:
+                set_rng(random.Random(streams.getrandbits(64)))
+        # Jump over steps where no fortress changes; controllers are only
+        # called at event steps and on the step after a successful command.
+        self.event_driven = event_driven
+        # "list" keeps pawns as Python lists, "array" moves them as PawnArrays
+        # and "convoy" collapses each send into one Convoy record
+        if pawn_store not in ("list", "array", "convoy"):
+            raise ValueError(f"unknown pawn_store: {pawn_store!r}")
+        self.pawn_store = pawn_store
+
+        self.team1 = self.controller1.team_name()
+        self.team2 = self.controller2.team_name()
+
+        self.state = initial_state()
+
+        self.step = 0
+
+        self._spawning_pawns = []  # team, kind, pawn_number, from_, to, [pos]
+        self._moving_pawns = []  # team, kind, from_, to, pos
+        self.arrival_schedule = {}  # step -> moving pawns arriving at that step
+        self.pawns = None
+        if pawn_store == "array":
+            self.pawns = PawnArrays()
+        elif pawn_store == "convoy":
+            self.pawns = ConvoyStore()
+
+        self.score = 0
+
+        # Aggregates kept up to date by touch() instead of rescanning state
+        self.recount()
+
+        self.isGameOver = False
+        self.isGameOver_loop = False
+        self.Overed = False
+        self.done = False
+        # Count invalid deliver attempts to penalize in RL env
+        self.invalid_delivers = 0
+
+        self.emit(STARTED, 0, -1)
+
+        self.events = EventQueue()
+        self.events.push(0, DECISION)
+        self.events.push(STEPLIMIT - 1, END)
+        self.schedule_events()
+
+        self.observers = []
+
+    @property
+    def moving_pawns(self):
+        """Moving pawns as `[team, kind, from_, to, pos]` lists."""
+        if self.pawn_store == "array":
+            return self.pawns.to_list()
+        if self.pawn_store == "convoy":
+            return self.pawns.moving_list()
+        return self._moving_pawns
+
+    @property
+    def spawning_pawns(self):
+        """Pending sends as `[team, kind, pawn_number, from_, to, pos]` lists."""
+        if self.pawn_store == "convoy":
+            return self.pawns.spawning_list()
+        return self._spawning_pawns
+
+    def pawn_views(self):
+        """Moving and spawning pawns for this step's info, built only when read."""
+        if self.pawn_store == "list":
+            return self._moving_pawns, self._spawning_pawns
+        return LazyList(lambda: self.moving_pawns), LazyList(lambda: self.spawning_pawns)
+
+    @property
+    def fortress_count(self):
+        """Number of fortresses held by each team, indexed by team (0 = neutral)."""
+        return tuple(self._fortress_count)
+
+    @property
+    def pawn_total(self):
+        """Pawns garrisoned in each team's fortresses, indexed by team."""
+        return tuple(self._pawn_total)
+
+    @property
+    def changed_fortresses(self):
+        """Fortresses whose owner, level or pawn count changed in the last step.
+
+        Upgrade timers counting down do not count as a change.
+        """
+        return frozenset(self._changed_last)
+
+    @property
+    def Blue_fortress(self):
+        return self._fortress_count[1]
+
+    @property
+    def Red_fortress(self):
+        return self._fortress_count[2]
+
+    @property
+    def win_team(self):
+        if self.Red_fortress == self.Blue_fortress:
+            return "Both"
+        elif self.Red_fortress > self.Blue_fortress:
+            return "Red"
+        return "Blue"
+
+    def recount(self):
+        """Rebuild the ownership counters and traffic index after replacing the state."""
+        self._owner = [s[0] for s in self.state]
+        self._garrison = [s[3] for s in self.state]
+        self._fortress_count = [0, 0, 0]
+        self._pawn_total = [0, 0, 0]
+        for team, pawns in zip(self._owner, self._garrison):
+            self._fortress_count[team] += 1
+            self._pawn_total[team] += pawns
+        self._changed = set()
+        self._changed_last = set()
+        # Step of the event queued for each fortress, None if it has none;
+        # -1 is in the past, so every fortress is rescheduled on the next call
+        self._fortress_events = [-1] * n_fortress
+        self.traffic = Traffic.count(*self.pawn_views())
+        self.timeline = ArrivalTimeline.of(self)
+        self._forecast = None
+        self.version = next(_versions)
+
+    def touch(self, i):
+        """Record that fortress i changed and bring the counters up to date.
+
+        Every change also moves `version` on; only the upgrade countdown
+        ticks without a touch.
+        """
+        self._changed.add(i)
+        self.version = next(_versions)
+        team, pawns = self.state[i][0], self.state[i][3]
+        # Births, sends, arrivals, losses and captures all end in a touch
+        self._pawn_total[self._owner[i]] -= self._garrison[i]
+        self._pawn_total[team] += pawns
+        self._garrison[i] = pawns
+        if team != self._owner[i]:
+            self.emit(CAPTURED, team, i, self._owner[i])
+            self._fortress_count[self._owner[i]] -= 1
+            self._fortress_count[team] += 1
+            self._owner[i] = team
+            self.flips += 1
+
+    def pawn_born(self):
+        """Pawns regenerate over time."""
+        for i in range(12):
+            team, kind, level, pawn_number, _, to_set = self.state[i]
+            if self.step % fortress_cool[kind][level] == 0:
+                if pawn_number < fortress_limit[level]:
+                    self.state[i][3] += 1
+                    if self.state[i][3] >= fortress_limit[level]:
+                        self.state[i][3] = fortress_limit[level]
+                        self.emit(PAWN_CAP, team, i, fortress_limit[level])
+                    self.touch(i)
+
+    def pawn_over(self):
+        """Remove pawns exceeding fortress limit."""
+        for i in range(12):
+            team, kind, level, pawn_number, _, to_set = self.state[i]
+            if self.step % 40 == 0:
+                if pawn_number > fortress_limit[level]:
+                    self.state[i][3] -= 1
+                    self.touch(i)
+
+    def deliver(self, team, from_, to):
+        """Create spawn point for pawns."""
+        if team == self.state[from_][0] and self.state[from_][3] >= 2:
+            if A_coordinate[from_][to] == 0:
+                # invalid edge; count and exit
+                self.invalid_delivers += 1
+                return 0
+            if self.pawn_store == "convoy":
+                self.pawns.add(
+                    team,
+                    self.state[from_][1],
+                    from_,
+                    to,
+                    self.state[from_][3] // 2,
+                    self.step,
+                    self.rng.random(),
+                )
+            else:
+                pos = [
+                    pos_fortress[from_][0] + A_coordinate[from_][to][0] * 42,
+                    pos_fortress[from_][1] + A_coordinate[from_][to][1] * 42,
+                ]
+                self._spawning_pawns.append(
+                    [team, self.state[from_][1], self.state[from_][3] // 2, from_, to, pos]
+                )
+            self.traffic.send(team, self.state[from_][1], from_, to, self.state[from_][3] // 2)
+            self.timeline.send(
+                team, self.state[from_][1], from_, to, self.state[from_][3] // 2, self.step
+            )
+            self.emit(SEND_LAUNCHED, team, from_, self.state[from_][3] // 2, to)
+            self.state[from_][3] -= self.state[from_][3] // 2
+            self.touch(from_)
+            if self.event_driven:
+                self.events.push(self.step + 1, DECISION)
+
+    def upgrade(self, team, subject):
+        """Start fortress upgrade."""
+        if (
+            team == self.state[subject][0]
+            and self.state[subject][3] >= fortress_limit[self.state[subject][2]] // 2
+            and self.state[subject][4] == -1
+            and 1 <= self.state[subject][2] <= 4
+        ):
+            self.state[subject][4] = 200
+            self.state[subject][3] -= fortress_limit[self.state[subject][2]] // 2
+            self.emit(UPGRADE_STARTED, team, subject, self.state[subject][2])
+            self.touch(subject)
+            if self.event_driven:
+                self.events.push(self.step + 1, DECISION)
+
+    def check_upgrade(self):
+        """Check if fortress upgrade is complete."""
+        for i in range(n_fortress):
+            if self.state[i][4] > 0:
+                self.state[i][4] -= 1
+            elif self.state[i][4] == 0:
+                self.state[i][4] = -1
+                self.state[i][2] += 1
+                self.emit(UPGRADE_FINISHED, self.state[i][0], i, self.state[i][2])
+                self.touch(i)
+
+    def pawn_departure(self):
+        """Pawns depart from spawn points."""
+        if self.pawn_store == "convoy":
+            for arrival_step, team, kind, from_, to in self.pawns.depart(self.step):
+                self.traffic.launch(team, kind, from_, to)
+                if self.event_driven:
+                    self.events.push(arrival_step, ARRIVAL)
+            return
+
+        for i in range(len(self._spawning_pawns)):
+            team, kind, pawn_number, from_, to, pos = self._spawning_pawns[i]
+            if self.step % 7 == 0 and kind == 0 and pawn_number > 0:
+                # Drawn per launch, so skipped idle steps do not shift the stream
+                r = self.rng.random() - 0.5
+                pos = [
+                    pos[0] + A_coordinate[from_][to][1] * r * 10,
+                    pos[1] + A_coordinate[from_][to][0] * -1 * r * 10,
+                ]
+                self.launch_pawn(team, kind, from_, to, pos)
+                self._spawning_pawns[i][2] -= 1
+
+            elif self.step % 10 == 0 and kind == 1 and pawn_number > 0:
+                r = self.rng.random() - 0.5
+                pos = [
+                    pos[0] + A_coordinate[from_][to][1] * r * 10,
+                    pos[1] + A_coordinate[from_][to][0] * -1 * r * 10,
+                ]
+                self.launch_pawn(team, kind, from_, to, pos)
+                self._spawning_pawns[i][2] -= 1
+
+        for i in range(len(self._spawning_pawns)):
+            if self._spawning_pawns[i][2] <= 0:
+                self._spawning_pawns.remove(self._spawning_pawns[i])
+                break
+
+    def launch_pawn(self, team, kind, from_, to, pos):
+        """Put a departing pawn on the road and schedule its arrival."""
+        arrival = self.step + steps_to_arrive(pos, kind, from_, to)
+        self.traffic.launch(team, kind, from_, to)
+        self.timeline.launch(team, kind, from_, to, self.step, arrival)
+        if self.pawn_store == "array":
+            self.pawns.append(team, kind, from_, to, pos, arrival)
+        else:
+            pawn = [team, kind, from_, to, pos]
+            self._moving_pawns.append(pawn)
+            self.arrival_schedule.setdefault(arrival, []).append(pawn)
+        if self.event_driven:
+            self.events.push(arrival, ARRIVAL)
+
+    def pawn_move(self):
+        """Move pawns towards target fortress."""
+        if self.pawn_store == "array":
+            team, kind, from_, to = self.pawns.move(self.step)
+            self.traffic.land_batch(team, kind, from_, to)
+            apply_arrivals(self.state, team, kind, to)
+            for i in set(to.tolist()):
+                self.touch(i)
+            self.emit_arrivals(zip(team.tolist(), to.tolist()))
+            return
+        if self.pawn_store == "convoy":
+            arrived = self.pawns.move(self.step)
+            for team, kind, from_, to in arrived:
+                self.traffic.land(team, kind, from_, to)
+                arrive(self.state, team, kind, to)
+                self.touch(to)
+            self.emit_arrivals((team, to) for team, _, _, to in arrived)
+            return
+
+        for i in range(len(self._moving_pawns)):
+            team, kind, from_, to, pos = self._moving_pawns[i]
+            if kind == 0:
+                self._moving_pawns[i][4] = [
+                    pos[0] + A_coordinate[from_][to][0] * 1.5,
+                    pos[1] + A_coordinate[from_][to][1] * 1.5,
+                ]
+            elif kind == 1:
+                self._moving_pawns[i][4] = [
+                    pos[0] + A_coordinate[from_][to][0] * 1,
+                    pos[1] + A_coordinate[from_][to][1] * 1,
+                ]
+
+        arrived = self.arrival_schedule.pop(self.step, [])
+        for pawn in arrived:
+            self.pawn_arrive(pawn)
+        self.emit_arrivals((pawn[0], pawn[3]) for pawn in arrived)
+
+    def pawn_arrive(self, pawn):
+        """Handle pawn arrival at fortress."""
+        team, kind, from_, to, pos = pawn
+        self.traffic.land(team, kind, from_, to)
+        if team == self.state[to][0]:
+            self.state[to][3] += 1
+        elif team != self.state[to][0]:
+            if kind == 0:
+                self.state[to][3] -= 0.65
+            elif kind == 1:
+                self.state[to][3] -= 0.95
+
+            if self.state[to][3] < 0:
+                self.state[to] = [team, self.state[to][1], 1, 0, -1, self.state[to][5]]
+        self.touch(to)
+
+        self._moving_pawns.remove(pawn)
+
+    def forecast(self, horizon):
+        """Projected owners and garrisons for the next `horizon` steps.
+
+        See `tcg.forecast.Forecast`.  The projection is kept until the state
+        moves on, so both controllers share one per step.
+        """
+        if self._forecast is None or self._forecast[0] != (self.step, horizon):
+            self._forecast = (
+                (self.step, horizon),
+                project(self.state, self.timeline, self.step, horizon),
+            )
+        return self._forecast[1]
+
+    def emit(self, kind, team, fortress, value=0, to=-1):
+        """Report a `GameEvent` to both controllers."""
+        event = GameEvent(kind, self.step, team, fortress, value, to)
+        self._inbox[0].append(event)
+        self._inbox[1].append(event)
+
+    def emit_arrivals(self, arrivals):
+        """Emit one PAWNS_ARRIVED per team and fortress from `(team, to)` pairs."""
+        counts = {}
+        for key in arrivals:
+            counts[key] = counts.get(key, 0) + 1
+        for (team, to), n in counts.items():
+            self.emit(PAWNS_ARRIVED, team, to, n)
+
+    def schedule_events(self):
+        """Queue the upcoming fortress events from the current step.
+
+        Only fortresses touched this step, or whose queued event has
+        passed, are rescheduled.
+        """
+        if not self.event_driven:
+            return
+        schedule_fortress_events(
+            self.events, self.state, self.step, self._fortress_events, self._changed
+        )
+
+    def skip_idle_steps(self):
+        """Fast-forward to the next queued event.
+
+        Skipped steps only move pawns, tick upgrade timers and launch pawns
+        from spawn points, none of which changes a fortress, so no
+        controller is called for them.  Movement and timers are advanced in
+        one go between launches; each step with a launch has its departures
+        played on their own, as they queue the arrivals of the new pawns.
+        """
+        while True:
+            target = self.events.next_step(self.step)
+            if target is None or target > STEPLIMIT - 1:
+                target = STEPLIMIT - 1
+            if self.pawn_store == "convoy":
+                launch = self.pawns.next_departure()
+            else:
+                launch = next_departure(self._spawning_pawns, self.step)
+            if launch is None or launch >= target:
+                break
+            # Step `launch` up to its departures, then the departures
+            self.drop_drained(launch - self.step)
+            self.coast(launch + 1 - self.step)
+            self.step = launch
+            self.pawn_departure()
+            self.step += 1
+        self.drop_drained(target - self.step)
+        self.coast(target - self.step)
+        self.step = target
+
+    def drop_drained(self, k):
+        """Remove the spawn entries `k` steps without departures would clean up.
+
+        `pawn_departure` drops the first drained entry on every step.
+        """
+        if k <= 0:
+            return
+        drained = [entry for entry in self._spawning_pawns if entry[2] <= 0][:k]
+        for entry in drained:
+            self._spawning_pawns.remove(entry)
+
+    def coast(self, k):
+        """Move the pawns and tick the upgrade timers of the next `k` steps."""
+        if k <= 0:
+            return
+        if self.pawn_store == "array":
+            self.pawns.advance(k)
+        elif self.pawn_store == "list":
+            for pawn in self._moving_pawns:
+                team, kind, from_, to, pos = pawn
+                pawn[4] = [
+                    pos[0] + A_coordinate[from_][to][0] * pawn_speed[kind] * k,
+                    pos[1] + A_coordinate[from_][to][1] * pawn_speed[kind] * k,
+                ]
+        for i in range(n_fortress):
+            if self.state[i][4] > 0:
+                self.state[i][4] -= k
+
+    def decide(self, i, controller, info):
+        """Get controller i's command for this step.
+
+        The controller is called when its decision interval is up or a
+        fortress flipped; between calls its last decision stands and nothing
+        new is ordered.  If it returns a plan, the plan's commands are played
+        from a queue without calling it again until the plan drains or a
+        fortress changes hands, which drops what is left of it; an empty
+        plan orders nothing.  An
+        `EventController` is only called when it has events it has not seen.
+        """
+        plan = self._plans[i]
+        if self.flips != self._flips_seen[i]:
+            plan.clear()
+        if plan:
+            return self.next_planned(i)
+        if not self.due(i):
+            return 0, 0, 0
+        self._next_decision[i] = self.step + self.decision_interval[i]
+        self._flips_seen[i] = self.flips
+        self._inbox[i] = []
+        if self.latency is None:
+            decision = controller.update(info)
+        else:
+            start = time.perf_counter_ns()
+            decision = controller.update(info)
+            self.latency[i].record(time.perf_counter_ns() - start)
+        if is_plan(decision):
+            return self.queue_plan(i, decision)
+        return decision
+
+    def due(self, i):
+        """Whether `decide` calls controller i's update this step."""
+        flipped = self.flips != self._flips_seen[i]
+        if self._plans[i] and not flipped:
+            return False
+        if self.step < self._next_decision[i] and not flipped:
+            return False
+        return not (self._reactive[i] and not self._inbox[i])
+
+    def queue_plan(self, i, plan):
+        """Queue a plan of `(delay, command, subject, to)` entries for controller i.
+
+        `delay` counts steps from now, 0 being this step.  Only one command
+        per side is ordered each step, so entries due at the same step are
+        played on consecutive steps in the order given.  A malformed entry
+        raises ValueError and nothing of the plan is queued.
+        """
+        self._plans[i].extend(plan_entries(plan, self.step))
+        return self.next_planned(i)
+
+    def next_planned(self, i):
+        """Pop controller i's planned command if one is due, else a no-op."""
+        plan = self._plans[i]
+        command = pop_planned(plan, self.step)
+        if self.event_driven:
+            # Wake up for the next entry, or to call the controller once drained
+            self.events.push(max(plan[0][0], self.step + 1) if plan else self.step + 1, DECISION)
+        return command
+
+    def order(self, team, command, subject, to):
+        """Process player command."""
+        if command == 0:
+            return 0
+        elif command == 1:
+            self.deliver(team, subject, to)
+        elif command == 2:
+            self.upgrade(team, subject)
+
+    def CheckGameOver(self):
+        """Check if game is over."""
+        if self.Red_fortress == 0:
+            return True
+        if self.Blue_fortress == 0:
+            return True
+
+        return False
+
+    def snapshot(self):
+        """Packed copy of the game state, including the engine's random state."""
+        return pack(self)
+
+    def restore(self, snap):
+        """Go back to the state recorded by `snapshot()`."""
+        unpack(self, snap)
+
+    def clone(self):
+        """Independent copy of this game; only the controllers are shared.
+
+        The copy has no observers, is not profiled and has its own random
+        stream in the same state.
+        """
+        twin = copy.copy(self)
+        twin.observers = []
+        twin.latency = None
+        unpack(twin, pack(self))
+        return twin
+
+    def attach(self, observer):
+        """Register an observer whose `on_step(sim)` runs after every step."""
+        self.observers.append(observer)
+
+    def advance(self):
+        """Execute one simulation step; returns False once the game is over."""
+        if self.isGameOver or self.step >= STEPLIMIT or self.isGameOver_loop or self.done:
+            self.Overed = True
+            self.isGameOver = True
+            return False
+
+        if self.event_driven:
+            self.skip_idle_steps()
+
+        self._changed = set()
+        self.pawn_move()
+        self.timeline.landed(self.step)
+        self._forecast = None
+        self.done = self.CheckGameOver() or self.step == STEPLIMIT - 1
+
+        moving_pawns, spawning_pawns = self.pawn_views()
+        # Controller1 gets team 1 perspective (bottom player)
+        info_1 = Info(
+            1,
+            self.state,
+            moving_pawns,
+            spawning_pawns,
+            self.done,
+            self._inbox[0],
+            self.traffic,
+            self.forecast,
+            self.version,
+        )
+        # Controller2 gets flipped perspective (always sees themselves as team 1)
+        info_2 = flip_board_view(
+            Info(
+                2,
+                self.state,
+                moving_pawns,
+                spawning_pawns,
+                self.done,
+                self._inbox[1],
+                self.traffic,
+                self.forecast,
+                self.version,
+            )
+        )
+
+        # Controllers that compute elsewhere get both infos before either
+        # update is awaited
+        for i, (controller, info) in enumerate(
+            ((self.controller1, info_1), (self.controller2, info_2))
+        ):
+            submit = getattr(controller, "submit", None)
+            if submit is not None and self.due(i):
+                submit(info)
+
+        command_1, subject_1, to_1 = self.decide(0, self.controller1, info_1)
+        command_2, subject_2, to_2 = self.decide(1, self.controller2, info_2)
+
+        # Convert controller2's commands back to original perspective
+        subject_2 = swap_number_l[subject_2]
+        to_2 = swap_number_l[to_2]
+
+        self.order(1, command_1, subject_1, to_1)
+        self.order(2, command_2, subject_2, to_2)
+
+        self.pawn_departure()
+        self.pawn_born()
+        if self.step % 40 == 0:
+            self.pawn_over()
+
+        self.check_upgrade()
+
+        self.step += 1
+        self.schedule_events()
+        if self.event_driven and any(r and box for r, box in zip(self._reactive, self._inbox)):
+            # Events raised after the controllers ran wake them next step
+            self.events.push(self.step, DECISION)
+
+        if self.CheckGameOver():
+            self.isGameOver_loop = True
+        self._changed_last = self._changed
+
+        for observer in self.observers:
+            observer.on_step(self)
+
+        return True
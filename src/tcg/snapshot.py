@@ -0,0 +1,247 @@
+"""Packed copies of a `Simulation` for lookahead and resets."""
+
+import random
+from collections import deque
+
+import numpy as np
+
+from .config import HEIGHT, WIDTH, pawn_speed
+from .pawns import Convoy, ConvoyStore, PawnArrays, spawn_position
+from .scheduler import EventQueue, road_direction, steps_to_arrive
+
+_CONVOY_FIELDS = Convoy.__slots__
+
+
+def _number(value):
+    return int(value) if value.is_integer() else value
+
+
+class Snapshot:
+    """Everything needed to put a `Simulation` back into an earlier state.
+
+    Fortresses, pawns and spawn points are packed into small NumPy arrays,
+    so a snapshot holds no references into the live game.  Controllers and
+    observers are not part of it.
+    """
+
+    __slots__ = (
+        "pawn_store",
+        "step",
+        "flags",
+        "invalid_delivers",
+        "state",
+        "pawn_ints",
+        "pawn_pos",
+        "spawn_ints",
+        "spawn_pos",
+        "convoys",
+        "convoy_seq",
+        "convoy_clock",
+        "events",
+        "rng_state",
+        "decisions",
+    )
+
+
+def pack(sim):
+    """Take a `Snapshot` of `sim`."""
+    snap = Snapshot()
+    snap.pawn_store = sim.pawn_store
+    snap.step = sim.step
+    snap.flags = (sim.isGameOver, sim.isGameOver_loop, sim.Overed, sim.done)
+    snap.invalid_delivers = sim.invalid_delivers
+    snap.state = np.array([row[:5] for row in sim.state], dtype=np.float64)
+    snap.events = sim.events.copy()
+    snap.rng_state = sim.rng.getstate()
+    snap.decisions = (
+        tuple(sim._next_decision),
+        tuple(sim._flips_seen),
+        sim.flips,
+        tuple(tuple(plan) for plan in sim._plans),
+        tuple(tuple(inbox) for inbox in sim._inbox),
+    )
+
+    snap.pawn_ints = snap.pawn_pos = snap.spawn_ints = snap.spawn_pos = None
+    snap.convoys = snap.convoy_seq = snap.convoy_clock = None
+    if sim.pawn_store == "convoy":
+        store = sim.pawns
+        snap.convoys = np.array(
+            [[getattr(c, f) for f in _CONVOY_FIELDS] for c in store.convoys], dtype=np.float64
+        ).reshape(-1, len(_CONVOY_FIELDS))
+        snap.convoy_seq = store._seq
+        snap.convoy_clock = store.clock
+        return snap
+
+    if sim.pawn_store == "array":
+        p = sim.pawns
+        n = p.n
+        snap.pawn_ints = np.stack([p.team[:n], p.kind[:n], p.from_[:n], p.to[:n], p.arrival[:n]], 1)
+        snap.pawn_pos = np.stack([p.x[:n], p.y[:n]], 1)
+    else:
+        arrival = {id(pawn): step for step, pawns in sim.arrival_schedule.items() for pawn in pawns}
+        pawns = sim._moving_pawns
+        snap.pawn_ints = np.array(
+            [pawn[:4] + [arrival[id(pawn)]] for pawn in pawns], dtype=np.int64
+        ).reshape(-1, 5)
+        snap.pawn_pos = np.array([pawn[4] for pawn in pawns], dtype=np.float64).reshape(-1, 2)
+
+    spawns = sim._spawning_pawns
+    snap.spawn_ints = np.array([s[:5] for s in spawns], dtype=np.float64).reshape(-1, 5)
+    snap.spawn_pos = np.array([s[5] for s in spawns], dtype=np.float64).reshape(-1, 2)
+    return snap
+
+
+def unpack(sim, snap):
+    """Put `sim` into the state recorded in `snap`.
+
+    All containers are rebuilt, so `sim` shares nothing with the game the
+    snapshot came from.
+    """
+    if snap.pawn_store != sim.pawn_store:
+        raise ValueError(
+            f"snapshot uses pawn_store={snap.pawn_store!r}, game uses {sim.pawn_store!r}"
+        )
+    sim.step = snap.step
+    sim.isGameOver, sim.isGameOver_loop, sim.Overed, sim.done = snap.flags
+    sim.invalid_delivers = snap.invalid_delivers
+    # Roads never change, so the to_set lists are taken from the live rows
+    sim.state = [
+        [int(t), int(k), int(lv), _number(c), int(u), row[5]]
+        for (t, k, lv, c, u), row in zip(snap.state.tolist(), sim.state)
+    ]
+
+    sim.events = snap.events.copy()
+    if snap.rng_state is not None:
+        sim.rng = random.Random()
+        sim.rng.setstate(snap.rng_state)
+    if snap.decisions is not None:
+        next_decision, flips_seen, sim.flips, plans, inbox = snap.decisions
+        sim._next_decision = list(next_decision)
+        sim._flips_seen = list(flips_seen)
+        sim._plans = [deque(plan) for plan in plans]
+        sim._inbox = [list(events) for events in inbox]
+
+    sim._moving_pawns = []
+    sim._spawning_pawns = []
+    sim.arrival_schedule = {}
+    if sim.pawn_store == "convoy":
+        store = ConvoyStore()
+        for row in snap.convoys.tolist():
+            c = Convoy.__new__(Convoy)
+            for f, value in zip(_CONVOY_FIELDS, row):
+                setattr(c, f, value if f == "seed" else int(value))
+            store.convoys.append(c)
+        store._seq = snap.convoy_seq
+        store.clock = snap.convoy_clock
+        sim.pawns = store
+    elif sim.pawn_store == "array":
+        n = len(snap.pawn_ints)
+        p = PawnArrays(max(256, n))
+        team, kind, from_, to, arrival = snap.pawn_ints.T
+        speed = np.asarray(pawn_speed)[kind]
+        p.team[:n] = team
+        p.kind[:n] = kind
+        p.from_[:n] = from_
+        p.to[:n] = to
+        p.arrival[:n] = arrival
+        p.x[:n] = snap.pawn_pos[:, 0]
+        p.y[:n] = snap.pawn_pos[:, 1]
+        p.vx[:n] = road_direction[from_, to, 0] * speed
+        p.vy[:n] = road_direction[from_, to, 1] * speed
+        p.n = n
+        sim.pawns = p
+    else:
+        for (team, kind, from_, to, arrival), pos in zip(
+            snap.pawn_ints.tolist(), snap.pawn_pos.tolist()
+        ):
+            pawn = [team, kind, from_, to, pos]
+            sim._moving_pawns.append(pawn)
+            sim.arrival_schedule.setdefault(arrival, []).append(pawn)
+
+    if sim.pawn_store != "convoy":
+        sim._spawning_pawns = [
+            [int(t), int(k), _number(c), int(f), int(to), pos]
+            for (t, k, c, f, to), pos in zip(snap.spawn_ints.tolist(), snap.spawn_pos.tolist())
+        ]
+
+    sim.recount()
+
+
+def pawn_tables(snap):
+    """Moving pawns and spawn points of `snap` as arrays, whatever the pawn store.
+
+    Returns `(pawn_ints, pawn_pos, spawn_ints, spawn_pos)` with rows
+    `[team, kind, from_, to, arrival]`, `[x, y]`, `[team, kind, count,
+    from_, to]` and `[x, y]`.  Convoys are expanded pawn by pawn.
+    """
+    if snap.pawn_store != "convoy":
+        return snap.pawn_ints, snap.pawn_pos, snap.spawn_ints, snap.spawn_pos
+
+    pawns, pos, spawns, spawn_pos = [], [], [], []
+    for row in snap.convoys.tolist():
+        c = Convoy.__new__(Convoy)
+        for f, value in zip(_CONVOY_FIELDS, row):
+            setattr(c, f, value if f == "seed" else int(value))
+        for i in range(c.arrived, c.launched):
+            pawns.append((c.departure(i), c.seq, c.team, c.kind, c.from_, c.to, c.travel))
+            pos.append(c.position(i, snap.convoy_clock))
+        if c.launched < c.count:
+            spawns.append([c.team, c.kind, c.count - c.launched, c.from_, c.to])
+            spawn_pos.append(spawn_position(c.from_, c.to))
+    order = sorted(range(len(pawns)), key=lambda i: pawns[i][:2])
+    return (
+        np.array(
+            [[t, k, f, to, d + travel] for d, _, t, k, f, to, travel in (pawns[i] for i in order)],
+            dtype=np.int64,
+        ).reshape(-1, 5),
+        np.array([pos[i] for i in order], dtype=np.float64).reshape(-1, 2),
+        np.array(spawns, dtype=np.float64).reshape(-1, 5),
+        np.array(spawn_pos, dtype=np.float64).reshape(-1, 2),
+    )
+
+
+def _on_road(pos, from_, to):
+    """Squared distance from `pos` to the straight road between two fortresses."""
+    x, y = spawn_position(from_, to)
+    dx, dy = road_direction[from_, to]
+    along = (pos[0] - x) * dx + (pos[1] - y) * dy
+    return (pos[0] - x - along * dx) ** 2 + (pos[1] - y - along * dy) ** 2
+
+
+def from_info(info, step=0):
+    """Build a `Snapshot` from a controller's `info` list.
+
+    The snapshot is in the controller's own perspective (it is team 1),
+    so commands for it use the fortress numbers the controller sees.  The
+    flipped view handed to the second player keeps pawn positions in board
+    coordinates; such positions are mirrored back onto the player's roads.
+    Arrival steps are recomputed from the positions, counted from `step`.
+    """
+    _, state, moving_pawns, spawning_pawns, done = info
+    snap = Snapshot()
+    snap.pawn_store = "list"
+    snap.step = step
+    snap.flags = (False, False, False, bool(done))
+    snap.invalid_delivers = 0
+    snap.state = np.array([row[:5] for row in state], dtype=np.float64)
+    snap.events = EventQueue()
+    snap.rng_state = None
+    snap.decisions = None
+    snap.convoys = snap.convoy_seq = snap.convoy_clock = None
+
+    pawns, pos = [], []
+    for team, kind, from_, to, (x, y) in moving_pawns:
+        mirrored = (WIDTH - x, HEIGHT - y)
+        if _on_road(mirrored, from_, to) < _on_road((x, y), from_, to):
+            x, y = mirrored
+        k = steps_to_arrive((x, y), kind, from_, to)
+        if k is not None:
+            pawns.append([team, kind, from_, to, step + k])
+            pos.append([x, y])
+    snap.pawn_ints = np.array(pawns, dtype=np.int64).reshape(-1, 5)
+    snap.pawn_pos = np.array(pos, dtype=np.float64).reshape(-1, 2)
+    snap.spawn_ints = np.array([s[:5] for s in spawning_pawns], dtype=np.float64).reshape(-1, 5)
+    snap.spawn_pos = np.array(
+        [spawn_position(s[3], s[4]) for s in spawning_pawns], dtype=np.float64
+    ).reshape(-1, 2)
+    return snap
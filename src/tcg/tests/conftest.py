@@ -0,0 +1,13 @@
+import pytest
+
+
+def board_of(sim):
+    """Everything two equivalent games must agree on, with positions rounded."""
+    moving = [list(p[:4]) + [round(p[4][0], 6), round(p[4][1], 6)] for p in sim.moving_pawns]
+    spawning = [list(p[:5]) for p in sim.spawning_pawns]
+    return sim.step, [row[:5] for row in sim.state], moving, spawning, sim.win_team
+
+
+@pytest.fixture
+def board():
+    return board_of
@@ -0,0 +1,69 @@
+import random
+
+from tcg.analysis import BoardAnalysis, topology
+from tcg.config import A_coordinate, fortress_limit, n_fortress
+from tcg.info import Info
+from tcg.simulation import initial_state
+
+
+def neighbors(i):
+    return [j for j in range(n_fortress) if A_coordinate[i][j] != 0]
+
+
+def random_state(rng):
+    state = initial_state()
+    for row in state:
+        row[0] = rng.randrange(3)
+        row[2] = rng.randint(1, 5)
+        row[3] = rng.randint(0, fortress_limit[row[2]])
+    return state
+
+
+def test_analysis_matches_a_rescan():
+    rng = random.Random(0)
+    for _ in range(200):
+        state = random_state(rng)
+        analysis = BoardAnalysis(state)
+        owner = [row[0] for row in state]
+        assert analysis.mine == tuple(i for i in range(n_fortress) if owner[i] == 1)
+        assert analysis.enemy == tuple(i for i in range(n_fortress) if owner[i] == 2)
+        assert analysis.neutral == tuple(i for i in range(n_fortress) if owner[i] == 0)
+        assert analysis.fill == tuple(row[3] / fortress_limit[row[2]] for row in state)
+        for i in range(n_fortress):
+            near = [owner[j] for j in neighbors(i)]
+            assert analysis.ally_neighbors[i] == near.count(1)
+            assert analysis.enemy_neighbors[i] == near.count(2)
+            assert analysis.neutral_neighbors[i] == near.count(0)
+        assert analysis.frontline == tuple(
+            i for i in analysis.mine if any(owner[j] == 2 for j in neighbors(i))
+        )
+
+
+def test_one_analysis_per_info():
+    info = Info(1, initial_state(), [], [], False)
+    assert info.analysis is info.analysis
+    assert info.analysis.mine == (10,)
+
+
+def test_topology_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(300):
+        owner = [rng.randrange(3) for _ in range(n_fortress)]
+        mine = sum(1 << i for i in range(n_fortress) if owner[i] == 1)
+        enemy = sum(1 << i for i in range(n_fortress) if owner[i] == 2)
+        topo = topology(mine, enemy)
+        assert topo is topology(mine, enemy)
+
+        reach = {j for i in range(n_fortress) if owner[i] == 1 for j in neighbors(i)}
+        frontline = tuple(
+            i
+            for i in range(n_fortress)
+            if owner[i] == 1 and any(owner[j] == 2 for j in neighbors(i))
+        )
+        rear = tuple(i for i in range(n_fortress) if owner[i] == 1 and i not in frontline)
+        assert topo.frontline == frontline
+        assert topo.rear == rear
+        assert topo.neutral_targets == tuple(sorted(j for j in reach if owner[j] == 0))
+        assert topo.enemy_targets == tuple(sorted(j for j in reach if owner[j] == 2))
+        for name in ("frontline", "rear", "neutral_targets", "enemy_targets"):
+            assert getattr(topo, name + "_mask") == sum(1 << i for i in getattr(topo, name))
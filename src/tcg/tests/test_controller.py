@@ -0,0 +1,80 @@
+import pytest
+
+from tcg.controller import Controller, memoise
+from tcg.info import Info
+from tcg.players.strategy_bulwark import Bulwark
+from tcg.players.strategy_counter import Counter
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+
+
+class Versions(Controller):
+    """Plays `player`, logging the version and fortress rows of each info."""
+
+    def __init__(self, player):
+        self.player = player
+        self.seen = []
+
+    def team_name(self) -> str:
+        return "Versions"
+
+    def update(self, info):
+        rows = tuple(tuple(row[:4]) for row in info.state)
+        self.seen.append((info.version, rows))
+        return self.player.update(info)
+
+
+def plain(cls):
+    """`cls` with the memo taken off its update."""
+    return type("Plain" + cls.__name__, (cls,), {"update": cls.update.__wrapped__})
+
+
+def test_versions_follow_the_fortresses():
+    blue = Versions(SplitPusher())
+    sim = Simulation(blue, Rusher(), seed=3)
+    for _ in range(2500):
+        sim.advance()
+    rows_of = {}
+    for version, rows in blue.seen:
+        assert rows_of.setdefault(version, rows) == rows
+    for (v1, rows1), (v2, rows2) in zip(blue.seen, blue.seen[1:]):
+        if rows1 != rows2:
+            assert v1 != v2
+    assert len(rows_of) < len(blue.seen)
+
+
+def test_clones_never_share_versions():
+    sim = Simulation(Rusher(), Rusher(), seed=3)
+    twin = sim.clone()
+    sim.advance()
+    twin.advance()
+    assert sim.version != twin.version
+
+
+@pytest.mark.parametrize("pair", [(SplitPusher, Rusher), (Bulwark, Counter)])
+def test_memoised_players_play_the_same(pair):
+    a, b = pair
+    memoised = Simulation(a(), b(), seed=3)
+    unmemoised = Simulation(plain(a)(), plain(b)(), seed=3)
+    for _ in range(2500):
+        memoised.advance()
+        unmemoised.advance()
+    assert memoised.state == unmemoised.state
+
+
+def test_memoise_calls_once_per_version():
+    class Once(Controller):
+        calls = 0
+
+        @memoise
+        def update(self, info):
+            self.calls += 1
+            return self.calls, 0, 0
+
+    player = Once()
+    first = Info(1, [], [], [], False, version=7)
+    assert player.update(first) == player.update(Info(1, [], [], [], False, version=7))
+    assert player.update(Info(1, [], [], [], False, version=8)) == (2, 0, 0)
+    assert player.update(Info(1, [], [], [], False)) == (3, 0, 0)
+    assert player.update(Info(1, [], [], [], False)) == (4, 0, 0)
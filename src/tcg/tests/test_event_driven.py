@@ -0,0 +1,62 @@
+import pytest
+
+from tcg.players.strategy_anchor import Anchor
+from tcg.players.strategy_bulwark import Bulwark
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.scheduler import EventQueue
+from tcg.simulation import Simulation
+
+# Controllers that do not draw random numbers, so skipping the steps where
+# nothing happens cannot change what they do
+PAIRS = [(Bulwark, Bulwark), (Rusher, Anchor), (SplitPusher, Rusher)]
+STEPS = 6000
+
+
+@pytest.mark.parametrize("store", ["list", "array", "convoy"])
+@pytest.mark.parametrize("pair", PAIRS, ids=lambda pair: "-".join(c.__name__ for c in pair))
+def test_event_driven_matches_dense(pair, store, board):
+    a, b = pair
+    sparse = Simulation(a(), b(), event_driven=True, pawn_store=store, seed=1)
+    executed = []
+    while sparse.step < STEPS and sparse.advance():
+        executed.append(sparse.step - 1)
+    dense = Simulation(a(), b(), pawn_store=store, seed=1)
+    changed = set()
+    while dense.step < sparse.step:
+        version = dense.version
+        if not dense.advance():
+            break
+        if dense.version != version:
+            changed.add(dense.step - 1)
+    assert board(sparse) == board(dense)
+    # Only steps where a fortress changes, or the step after one, are played;
+    # launches and pawns on the road do not wake the controllers
+    assert all(step in changed or step - 1 in changed for step in executed)
+    assert len(executed) < sparse.step / 4
+
+
+def test_fortress_events_are_not_pushed_every_step(monkeypatch):
+    pushes = []
+    push = EventQueue.push
+    monkeypatch.setattr(
+        EventQueue, "push", lambda queue, step, kind: pushes.append(kind) or push(queue, step, kind)
+    )
+    sim = Simulation(Bulwark(), Bulwark(), event_driven=True, seed=1)
+    executed = 0
+    while sim.step < STEPS and sim.advance():
+        executed += 1
+    # One event per fortress that changed, not two pushes per fortress and
+    # spawn entry on every executed step
+    assert len(pushes) < 3 * executed
+    assert len(sim.events) < 50
+
+
+def test_recount_reschedules_every_fortress():
+    sim = Simulation(Bulwark(), Bulwark(), event_driven=True, seed=1)
+    assert -1 not in sim._fortress_events
+    assert all(step is None or step >= sim.step for step in sim._fortress_events)
+    sim.recount()
+    assert set(sim._fortress_events) == {-1}
+    sim.schedule_events()
+    assert -1 not in sim._fortress_events
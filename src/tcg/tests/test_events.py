@@ -0,0 +1,64 @@
+from tcg.config import swap_number_l
+from tcg.controller import EventController
+from tcg.events import CAPTURED, KINDS, SEND_LAUNCHED, STARTED, GameEvent
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+from tcg.utils import flip_event
+
+
+class Listener(EventController):
+    """Plays `player` on every step it is called, logging the events."""
+
+    def __init__(self, player):
+        self.player = player
+        self.events = []
+        self.batches = []
+        self.calls = 0
+
+    def team_name(self) -> str:
+        return "Listener"
+
+    def update(self, info):
+        self.events.extend(info.events)
+        self.batches.append(len(info.events))
+        return super().update(info)
+
+    def decide(self, info):
+        self.calls += 1
+        return self.player.update(info)
+
+
+def test_events_reach_both_sides():
+    blue, red = Listener(SplitPusher()), Listener(Rusher())
+    sim = Simulation(blue, red, seed=3)
+    for _ in range(2500):
+        sim.advance()
+    assert blue.events[0] == GameEvent(STARTED, 0, 0, -1)
+    assert {event.kind for event in blue.events} <= set(KINDS)
+    assert sum(event.kind == CAPTURED for event in blue.events) == sim.flips > 0
+    assert any(event.kind == SEND_LAUNCHED for event in red.events)
+    # Team 2 sees every event turned around; only the last steps may be unread
+    flipped = [flip_event(event) for event in red.events]
+    assert flipped == blue.events[: len(flipped)]
+
+
+def test_event_controller_is_called_only_with_news():
+    blue, red = Listener(SplitPusher()), Listener(Rusher())
+    sim = Simulation(blue, red, seed=3)
+    for _ in range(1000):
+        sim.advance()
+    assert 0 < blue.calls < 1000
+    assert all(blue.batches) and len(blue.batches) == blue.calls
+
+
+def test_flip_event_round_trip():
+    events = [
+        GameEvent(CAPTURED, 5, 2, 3, 1),
+        GameEvent(SEND_LAUNCHED, 9, 1, 4, 10, 7),
+        GameEvent(STARTED, 0, 0, -1),
+    ]
+    for event in events:
+        assert flip_event(flip_event(event)) == event
+    captured = flip_event(events[0])
+    assert (captured.team, captured.fortress, captured.value) == (1, swap_number_l[3], 2)
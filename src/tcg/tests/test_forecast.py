@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from tcg.config import swap_number_l
+from tcg.controller import Controller
+from tcg.forecast import ArrivalTimeline
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+
+HORIZON = 400
+# A step with pawns on their way and a capture coming
+FREEZE = 2048
+
+
+class Freeze(Controller):
+    """Plays `player` for `until` steps, keeping the forecast it sees then, and idles after."""
+
+    def __init__(self, player, until):
+        self.player = player
+        self.until = until
+        self.calls = 0
+        self.forecast = None
+
+    def team_name(self) -> str:
+        return "Freeze"
+
+    def update(self, info):
+        self.calls += 1
+        if self.calls <= self.until:
+            return self.player.update(info)
+        if self.forecast is None:
+            self.forecast = info.forecast(HORIZON)
+        return 0, 0, 0
+
+
+@pytest.mark.parametrize("store", ["list", "array", "convoy"])
+def test_forecast_matches_the_engine(store):
+    blue, red = Freeze(SplitPusher(), FREEZE), Freeze(Rusher(), FREEZE)
+    sim = Simulation(blue, red, pawn_store=store, seed=3)
+    # Without the sideways spread every pawn takes the nominal travel time
+    sim.rng.random = lambda: 0.5
+    timeline_checks = 0
+    while sim.step < FREEZE:
+        sim.advance()
+        if sim.step % 97 == 0:
+            assert sim.timeline.due == ArrivalTimeline.of(sim).due
+            timeline_checks += 1
+
+    forecast = sim.forecast(HORIZON)
+    assert any(forecast.falls_at(i) is not None for i in range(12))
+    owner, pawns = [], []
+    for _ in range(HORIZON):
+        sim.advance()
+        owner.append([row[0] for row in sim.state])
+        pawns.append([row[3] for row in sim.state])
+    owner, pawns = np.array(owner), np.array(pawns)
+
+    assert (forecast.owner == owner).all()
+    assert np.allclose(forecast.pawns, pawns)
+    assert (blue.forecast.owner == owner).all()
+    # Team 2 sees the same forecast turned around
+    assert (np.array([0, 2, 1])[red.forecast.owner][:, swap_number_l] == owner).all()
+    assert timeline_checks > 0
+
+
+def test_falls_at():
+    sim = Simulation(SplitPusher(), Rusher(), seed=3)
+    for _ in range(FREEZE):
+        sim.advance()
+    forecast = sim.forecast(HORIZON)
+    for i in range(12):
+        falls = forecast.falls_at(i)
+        column = forecast.owner[:, i]
+        if falls is None:
+            assert (column == forecast.initial[i]).all()
+        else:
+            h = falls - forecast.start
+            assert column[h] != forecast.initial[i]
+            assert (column[:h] == forecast.initial[i]).all()
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from tcg.controller import Controller
+from tcg.forward import _PlannedGames, simulate, simulate_batch
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+from tcg.snapshot import from_info
+
+
+class Script(Controller):
+    """Plays `plan[k]` on its k-th call and idles otherwise."""
+
+    def __init__(self, plan=()):
+        self.plan = dict(plan)
+        self.calls = 0
+
+    def team_name(self) -> str:
+        return "Script"
+
+    def update(self, info):
+        command = self.plan.get(self.calls, (0, 0, 0))
+        self.calls += 1
+        return command
+
+
+class Middle:
+    """Departure jitter of zero, for the engine and for the batch alike."""
+
+    def random(self, n=None):
+        return 0.5 if n is None else np.full(n, 0.5)
+
+
+def midgame(store="list"):
+    sim = Simulation(SplitPusher(), Rusher(), pawn_store=store, seed=3)
+    for _ in range(2300):
+        sim.advance()
+    return sim
+
+
+def own_road(sim):
+    """A road out of a fortress team 1 holds."""
+    for i, row in enumerate(sim.state):
+        if row[0] == 1 and row[3] >= 2:
+            return i, row[5][0]
+    raise AssertionError("team 1 holds nothing")
+
+
+@pytest.mark.parametrize("store", ["list", "array"])
+def test_forward_model_matches_the_engine(store):
+    sim = midgame(store)
+    snap = sim.snapshot()
+    from_, to = own_road(sim)
+    start = snap.step
+
+    sim.controller1, sim.controller2 = Script({5: (1, from_, to)}), Script()
+    sim.rng = Middle()
+    games = _PlannedGames(snap, [[(start + 5, 1, 1, from_, to)]], seed=0)
+    games.rng = Middle()
+    while sim.step < start + 300:
+        sim.advance()
+        games.advance()
+        assert games.state[0].tolist() == [row[:5] for row in sim.state]
+    assert sim.invalid_delivers == 0
+
+
+def test_simulate_batch_is_simulate_per_plan():
+    sim = midgame()
+    snap = sim.snapshot()
+    from_, to = own_road(sim)
+    plans = [[], [(snap.step + 1, 1, 1, from_, to)], [(snap.step + 1, 1, 2, from_, 0)]]
+    batch = simulate_batch(snap, plans, 200, seed=7)
+    for plan, final in zip(plans, batch):
+        assert simulate(snap, plan, 200, seed=7).tolist() == final.tolist()
+    assert batch[0].tolist() != batch[1].tolist()
+
+
+def test_snapshot_from_info():
+    sim = midgame()
+    info = [1, sim.state, sim.moving_pawns, sim.spawning_pawns, False]
+    snap = from_info(info, sim.step)
+    assert snap.state.tolist() == [row[:5] for row in sim.state]
+    assert len(snap.pawn_ints) == len(sim.moving_pawns)
+    final = simulate(snap, [], 100)
+    assert final.shape == (12, 5)
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from tcg import config as cfg
+from tcg.game import Game
+from tcg.gym_game import GymGame
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+
+
+def test_game_runs_the_simulation(monkeypatch):
+    monkeypatch.setattr(cfg, "QUIET", True)
+    sim = Simulation(SplitPusher(), Rusher(), seed=3)
+    while sim.advance():
+        pass
+    game = Game(SplitPusher(), Rusher(), window=False, seed=3)
+    game.run()
+    assert game.renderer is None
+    assert (game.step, game.win_team) == (sim.step, sim.win_team)
+    assert game.state == sim.state
+
+
+def test_gym_game_steps_the_simulation():
+    sim = Simulation(SplitPusher(), Rusher(), seed=3)
+    game = GymGame(SplitPusher(), Rusher(), window=False, seed=3)
+    for _ in range(2500):
+        assert game.process_step() == sim.advance()
+        assert game.state == sim.state
+        assert game.moving_pawns == sim.moving_pawns
+
+
+@pytest.mark.parametrize("cls", [Game, GymGame])
+def test_window_attaches_a_renderer(monkeypatch, cls):
+    pytest.importorskip("pygame")
+    monkeypatch.setitem(os.environ, "SDL_VIDEODRIVER", "dummy")
+    game = cls(SplitPusher(), Rusher(), seed=3)
+    frames = []
+    game.renderer.on_step = lambda sim: frames.append(sim.step)
+    for _ in range(5):
+        game.advance()
+    assert frames == [1, 2, 3, 4, 5]
@@ -0,0 +1,59 @@
+import pytest
+
+from tcg.controller import Controller
+from tcg.info import Info, LazyList
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+
+
+class Keeper(Controller):
+    """Plays Rusher and keeps the last info it was handed."""
+
+    def __init__(self):
+        self.player = Rusher()
+        self.info = None
+
+    def team_name(self) -> str:
+        return "Keeper"
+
+    def update(self, info):
+        self.info = info
+        return self.player.update(info)
+
+
+def test_lazy_list_builds_once():
+    calls = []
+    lazy = LazyList(lambda: calls.append(1) or [1, 2, 3])
+    assert not calls
+    assert len(lazy) == 3 and lazy[1] == 2 and list(lazy) == [1, 2, 3]
+    assert lazy == [1, 2, 3]
+    assert calls == [1]
+
+
+def test_info_unpacks_like_a_list():
+    info = Info(1, [[0] * 6], [], [], False)
+    team, state, moving, spawning, done = info
+    assert (team, state, moving, spawning, done) == (1, [[0] * 6], [], [], False)
+    assert info[1] is state and len(info) == 5
+    assert list(info.events) == [] and info.version is None
+
+
+@pytest.mark.parametrize("store", ["array", "convoy"])
+def test_pawn_lists_are_built_only_when_read(store):
+    keeper = Keeper()
+    sim = Simulation(keeper, SplitPusher(), pawn_store=store, seed=3)
+    compared = 0
+    for step in range(2500):
+        sim.advance()
+        info = keeper.info
+        if step % 100:
+            # Rusher only reads the fortresses
+            assert info.moving_pawns._items is None
+            assert info.spawning_pawns._items is None
+        else:
+            moving, spawning = sim.pawn_views()
+            assert info.moving_pawns == moving
+            assert info.spawning_pawns == spawning
+            compared += len(moving)
+    assert compared > 0
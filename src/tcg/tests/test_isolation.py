@@ -0,0 +1,131 @@
+import time
+
+import pytest
+
+from tcg.controller import Controller
+from tcg.info import Info
+from tcg.isolation import IsolatedController, SharedBoard
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+
+
+class Crashy(Controller):
+    calls = 0
+
+    def team_name(self) -> str:
+        return "Crashy"
+
+    def update(self, info):
+        self.calls += 1
+        if self.calls % 10 == 0:
+            raise RuntimeError("boom")
+        return 0, 0, 0
+
+
+class Broken(Controller):
+    def __init__(self):
+        raise RuntimeError("no model")
+
+
+def hang():
+    time.sleep(60)
+
+
+class Sleepy(Controller):
+    calls = 0
+
+    def team_name(self) -> str:
+        return "Sleepy"
+
+    def update(self, info):
+        self.calls += 1
+        if self.calls == 5:
+            time.sleep(0.5)
+        return 0, 0, 0
+
+
+def play(controller1, controller2, steps=300):
+    sim = Simulation(controller1, controller2, seed=5)
+    for _ in range(steps):
+        sim.advance()
+    return [row[:5] for row in sim.state]
+
+
+def test_isolated_matches_in_process():
+    isolated = IsolatedController(Rusher)
+    try:
+        assert isolated.team_name() == Rusher().team_name()
+        assert play(isolated, Rusher()) == play(Rusher(), Rusher())
+        assert isolated.alive and isolated.errors == 0
+    finally:
+        isolated.close()
+
+
+def test_update_error_is_a_no_op():
+    isolated = IsolatedController(Crashy)
+    try:
+        play(isolated, Rusher(), 100)
+        assert isolated.alive
+        assert isolated.errors == 10
+        assert "boom" in isolated.error
+    finally:
+        isolated.close()
+
+
+def test_broken_factory():
+    isolated = IsolatedController(Broken)
+    try:
+        assert not isolated.alive
+        assert "no model" in isolated.error
+        play(isolated, Rusher(), 10)
+    finally:
+        isolated.close()
+
+
+def test_startup_timeout():
+    start = time.monotonic()
+    isolated = IsolatedController(hang, startup=0.5)
+    try:
+        assert time.monotonic() - start < 10
+        assert not isolated.alive
+        assert isolated.errors == 1
+        assert "did not start" in isolated.error
+        assert not isolated._process.is_alive()
+        assert isolated.update(None) == (0, 0, 0)
+    finally:
+        isolated.close()
+
+
+def test_budget_overrun_is_a_no_op():
+    isolated = IsolatedController(Sleepy, budget=0.1)
+    try:
+        play(isolated, Rusher(), 20)
+        assert isolated.timeouts >= 1
+        assert isolated.alive and isolated.errors == 0
+    finally:
+        isolated.close()
+
+
+@pytest.mark.parametrize("capacity", [1, 4096])
+def test_shared_board_round_trip(capacity):
+    sim = Simulation(SplitPusher(), Rusher(), seed=3)
+    for _ in range(2100):
+        sim.advance()
+    info = Info(1, sim.state, sim.moving_pawns, sim.spawning_pawns, False, [], sim.traffic)
+    assert len(info.moving_pawns) > 1
+
+    board = SharedBoard(capacity)
+    try:
+        extra = board.publish(info)
+        assert (extra is None) == (capacity > 1)
+        copy = SharedBoard(capacity, board.name)
+        got = copy.read([row[5] for row in sim.state], ["event"], 9, extra)
+        copy.close()
+    finally:
+        board.unlink()
+    assert got.state == sim.state
+    assert got.moving_pawns == sim.moving_pawns
+    assert got.spawning_pawns == sim.spawning_pawns
+    assert (got.traffic.moving == sim.traffic.moving).all()
+    assert (got.events, got.version) == (["event"], 9)
@@ -0,0 +1,63 @@
+import pytest
+
+from tcg.config import depart_interval, travel_time
+from tcg.pawns import ConvoyStore
+from tcg.players.strategy_anchor import Anchor
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+
+PAIRS = [(Rusher, Anchor), (SplitPusher, Rusher)]
+
+
+@pytest.mark.parametrize("pair", PAIRS, ids=lambda pair: "-".join(c.__name__ for c in pair))
+def test_array_store_matches_list(pair):
+    a, b = pair
+    games = [Simulation(a(), b(), pawn_store=store, seed=4) for store in ("list", "array")]
+    in_flight = 0
+    for _ in range(1500):
+        for sim in games:
+            sim.advance()
+        listed, arrays = games
+        assert arrays.state == listed.state
+        assert arrays.moving_pawns == listed.moving_pawns
+        assert arrays.spawning_pawns == listed.spawning_pawns
+        in_flight = max(in_flight, len(listed.moving_pawns))
+    assert in_flight > 0
+
+
+def test_convoy_departures_and_arrivals():
+    store = ConvoyStore()
+    store.add(1, 0, 10, 7, 5, 3, 0.3)
+    store.add(2, 1, 1, 4, 3, 3, 0.7)
+    assert [entry[:5] for entry in store.spawning_list()] == [[1, 0, 5, 10, 7], [2, 1, 3, 1, 4]]
+
+    departed, arrived = [], []
+    for step in range(3, 200):
+        arrived += [(step, *pawn) for pawn in store.move(step)]
+        due = store.next_departure()
+        launched = store.depart(step)
+        departed += [(step, *pawn) for pawn in launched]
+        assert bool(launched) == (due == step)
+        assert len(store) == len(store.moving_list())
+
+    # Pawns leave on multiples of the departure interval of their kind and
+    # arrive the road's travel time later
+    assert [p[0] for p in departed if p[3] == 0] == [7, 14, 21, 28, 35]
+    assert [p[0] for p in departed if p[3] == 1] == [10, 20, 30]
+    for step, due, team, kind, from_, to in departed:
+        assert step % depart_interval[kind] == 0
+        assert due == step + travel_time[kind][from_][to]
+    assert sorted(p[0] for p in arrived) == sorted(p[1] for p in departed)
+    assert not store.convoys and not store.spawning_list()
+    assert store.next_departure() is None
+
+
+def test_convoy_game_conserves_pawns():
+    sim = Simulation(Rusher(), Anchor(), pawn_store="convoy", seed=4)
+    for _ in range(1500):
+        sim.advance()
+        in_flight = sum(c.launched - c.arrived for c in sim.pawns.convoys)
+        waiting = sum(c.count - c.launched for c in sim.pawns.convoys)
+        assert len(sim.moving_pawns) == in_flight
+        assert sum(entry[2] for entry in sim.spawning_pawns) == waiting
@@ -0,0 +1,114 @@
+import pytest
+
+from tcg.controller import Controller
+from tcg.simulation import Simulation
+
+
+class Idle(Controller):
+    def team_name(self) -> str:
+        return "Idle"
+
+    def update(self, info):
+        return 0, 0, 0
+
+
+class Planner(Controller):
+    """Returns the plans it is given one per call, then plays no-ops."""
+
+    def __init__(self, *plans):
+        self.plans = list(plans)
+        self.calls = []
+
+    def team_name(self) -> str:
+        return "Planner"
+
+    def update(self, info):
+        self.calls.append(info.version)
+        return self.plans.pop(0) if self.plans else (0, 0, 0)
+
+
+def test_empty_plan_orders_nothing():
+    planner = Planner([], [])
+    sim = Simulation(planner, Idle(), seed=1)
+    for _ in range(3):
+        assert sim.advance()
+    assert len(planner.calls) == 3
+    assert not sim._plans[0]
+
+
+def test_empty_plan_event_driven():
+    planner = Planner([])
+    sim = Simulation(planner, Idle(), event_driven=True, seed=1)
+    assert sim.advance()
+    assert sim.advance()
+    assert sim.step == 2
+    assert len(planner.calls) == 2
+
+
+@pytest.mark.parametrize(
+    "plan",
+    [
+        [(0, 1, 1, 0), (-1, 0, 0, 0)],
+        [(0, 1, 1, 0), (1.5, 0, 0, 0)],
+        [(0, 1, 1, 0), ("1", 0, 0, 0)],
+        [(0, 1, 1, 0), (True, 0, 0, 0)],
+        [(0, 1, 1, 0), (1, 0, 0)],
+        [(0, 1, 1, 0), 3],
+    ],
+)
+def test_invalid_plan_queues_nothing(plan):
+    sim = Simulation(Idle(), Idle(), seed=1)
+    with pytest.raises(ValueError):
+        sim.queue_plan(0, plan)
+    assert not sim._plans[0]
+
+
+def test_plan_is_played_in_order():
+    sim = Simulation(Idle(), Idle(), seed=1)
+    plan = [(2, 2, 1, 0), (0, 1, 1, 0), (0, 1, 1, 4)]
+    played = [sim.queue_plan(0, plan)]
+    for _ in range(3):
+        sim.step += 1
+        played.append(sim.next_planned(0))
+    assert played == [(1, 1, 0), (1, 1, 4), (2, 1, 0), (0, 0, 0)]
+
+
+def test_plan_dropped_when_a_fortress_flips():
+    planner = Planner([(50, 1, 1, 0), (60, 1, 1, 4)], [(40, 2, 1, 0)])
+    sim = Simulation(planner, Idle(), seed=1)
+    assert sim.advance()
+    assert len(sim._plans[0]) == 2
+    assert sim.advance()
+    assert len(planner.calls) == 1
+
+    sim.state[0][0] = 1
+    sim.touch(0)
+    assert sim.advance()
+    assert len(planner.calls) == 2
+    assert [entry[1:] for entry in sim._plans[0]] == [(2, 1, 0)]
+
+
+def test_plan_event_driven_matches_dense():
+    plan = [(3, 1, 10, 7), (40, 1, 10, 9), (41, 2, 10, 0)]
+    sparse = Simulation(Planner(plan), Idle(), event_driven=True, seed=1)
+    while sparse.step < 300 and sparse.advance():
+        pass
+    dense = Simulation(Planner(plan), Idle(), seed=1)
+    while dense.step < sparse.step and dense.advance():
+        pass
+    assert sparse.state == dense.state
+    assert sparse.moving_pawns == dense.moving_pawns
+
+
+def test_snapshot_keeps_the_plan():
+    sim = Simulation(Planner([(5, 1, 10, 7), (20, 1, 10, 9)]), Idle(), seed=1)
+    sim.advance()
+    snap = sim.snapshot()
+    for _ in range(50):
+        sim.advance()
+    first = [row[:5] for row in sim.state]
+    sim.restore(snap)
+    assert len(sim._plans[0]) == 2
+    for _ in range(50):
+        sim.advance()
+    assert [row[:5] for row in sim.state] == first
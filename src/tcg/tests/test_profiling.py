@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from tcg.controller import Controller
+from tcg.players.strategy_rusher import Rusher
+from tcg.profiling import LatencyStats
+from tcg.simulation import Simulation
+
+
+class Counting(Controller):
+    def __init__(self):
+        self.calls = 0
+
+    def team_name(self) -> str:
+        return "Counting"
+
+    def update(self, info):
+        self.calls += 1
+        return 0, 0, 0
+
+
+def test_stats():
+    stats = LatencyStats()
+    assert (stats.mean, stats.longest, stats.quantile(0.5)) == (0.0, 0.0, 0.0)
+    samples = [0, 3, 7, 8, 100, 1_000, 12_345, 10**6, 10**9, 2**61]
+    for ns in samples:
+        stats.record(ns)
+    assert stats.count == len(samples)
+    assert stats.mean == pytest.approx(sum(samples) / len(samples) / 1e9)
+    assert stats.longest == max(samples) / 1e9
+    assert stats.quantile(1.0) == stats.longest
+
+
+@pytest.mark.parametrize("q", [0.1, 0.25, 0.5, 0.9, 0.99, 1.0])
+def test_quantile_bounds(q):
+    samples = sorted((k * 7919) % 10**7 for k in range(1, 2000))
+    stats = LatencyStats()
+    for ns in samples:
+        stats.record(ns)
+    exact = samples[math.ceil(q * len(samples)) - 1]
+    bound = stats.quantile(q) * 1e9
+    # An upper bound, no more than a quarter octave above the true value
+    assert exact <= round(bound) <= max(exact * 1.25, exact + 1)
+
+
+def test_merge():
+    a, b, both = LatencyStats(), LatencyStats(), LatencyStats()
+    for ns in range(0, 10**6, 997):
+        (a if ns % 2 else b).record(ns)
+        both.record(ns)
+    a.merge(b)
+    assert (a.count, a.total, a.max, a.buckets) == (both.count, both.total, both.max, both.buckets)
+
+
+def test_simulation_counts_update_calls():
+    blue, red = Counting(), Rusher()
+    sim = Simulation(blue, red, seed=1, profile=True)
+    for _ in range(500):
+        sim.advance()
+    assert sim.latency[0].count == blue.calls > 0
+    assert sim.latency[1].count > 0
+    assert Simulation(Counting(), Rusher(), seed=1).latency is None
+    assert sim.clone().latency is None
@@ -0,0 +1,138 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from tcg.config import color_pawn  # noqa: E402
+from tcg.controller import Controller  # noqa: E402
+from tcg.players.strategy_rusher import Rusher  # noqa: E402
+from tcg.players.strategy_splitpush import SplitPusher  # noqa: E402
+from tcg.renderer import TEXT_CACHE_SIZE, PygameRenderer  # noqa: E402
+from tcg.simulation import Simulation  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def renderer():
+    renderer = PygameRenderer("blue", "red", fps=None)
+    yield renderer
+    pygame.quit()
+
+
+def pixels(surface):
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def frames(pawn_store="list", steps=3000, every=50):
+    """A seeded match with captures, yielded every `every` steps."""
+    sim = Simulation(SplitPusher(), Rusher(), seed=3, pawn_store=pawn_store)
+    for step in range(steps):
+        sim.advance()
+        if step % every == 0:
+            yield sim
+
+
+def test_board_layer_matches_direct_drawing(renderer):
+    owners = set()
+    for sim in frames():
+        renderer.window.fill((150, 200, 150))
+        renderer.draw_road()
+        renderer.draw_fortress(sim)
+        expected = pixels(renderer.window)
+
+        renderer.window.fill((150, 200, 150))
+        renderer.draw_board(sim)
+        assert pixels(renderer.window) == expected
+        owners.add(tuple(row[0] for row in sim.state))
+    assert len(owners) > 1
+
+
+def test_text_is_cached(renderer):
+    first = renderer.text(renderer.font, "Lv 3", (0, 0, 0))
+    assert renderer.text(renderer.font, "Lv 3", (0, 0, 0)) is first
+    assert renderer.text(renderer.font, "Lv 3", (1, 0, 0)) is not first
+    fresh = renderer.font.render("Lv 3", True, (0, 0, 0))
+    assert first.get_size() == fresh.get_size()
+    assert pixels(first) == pixels(fresh)
+
+
+def test_text_cache_is_bounded(renderer):
+    renderer._texts.clear()
+    kept = renderer.text(renderer.font, "kept", (0, 0, 0))
+    dropped = renderer.text(renderer.font, "dropped", (0, 0, 0))
+    for k in range(TEXT_CACHE_SIZE - 1):
+        renderer.text(renderer.font, str(k), (0, 0, 0))
+        # Keep reading one entry so that it stays the most recently used
+        assert renderer.text(renderer.font, "kept", (0, 0, 0)) is kept
+    assert len(renderer._texts) == TEXT_CACHE_SIZE
+    assert renderer.text(renderer.font, "dropped", (0, 0, 0)) is not dropped
+
+
+def test_numbers_match_uncached_text(renderer):
+    def draw_number(sim):
+        renderer.window.fill((150, 200, 150))
+        renderer.draw_number(sim)
+        renderer.draw_team_name()
+        return pixels(renderer.window)
+
+    for sim in frames(steps=1500, every=100):
+        cached = draw_number(sim)
+        renderer.text = lambda font, text, color: font.render(text, True, color)
+        try:
+            expected = draw_number(sim)
+        finally:
+            del renderer.text
+        assert cached == expected
+
+
+def draw_pawns_one_by_one(window, sim):
+    """The pawns as `draw_pawn` drew them before sprites."""
+    for team, kind, _, _, pos in sim.moving_pawns:
+        if kind == 0:
+            pygame.draw.circle(window, color_pawn[team], pos, 5)
+        else:
+            x, y = pos
+            pygame.draw.rect(window, color_pawn[team], pygame.Rect(x - 2, y - 2, 8, 8), width=0)
+
+
+class Sender(Controller):
+    """Sends from each of its fortresses in turn, to each neighbour in turn."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def team_name(self) -> str:
+        return "Sender"
+
+    def update(self, info):
+        self.calls += 1
+        owned = [i for i, row in enumerate(info.state) if row[0] == 1 and row[3] >= 2]
+        if not owned:
+            return 0, 0, 0
+        i = owned[self.calls % len(owned)]
+        roads = info.state[i][5]
+        return 1, i, roads[self.calls // len(owned) % len(roads)]
+
+
+@pytest.mark.parametrize("pawn_store", ["list", "array", "convoy"])
+def test_pawn_sprites_match_drawing(renderer, pawn_store):
+    sim = Simulation(Sender(), Rusher(), seed=3, pawn_store=pawn_store)
+    # Hand blue both square fortresses, so pawns of both kinds are drawn
+    for i in (4, 7):
+        sim.state[i][0], sim.state[i][3] = 1, 60
+        sim.touch(i)
+    kinds = set()
+    for step in range(1500):
+        sim.advance()
+        if step % 25:
+            continue
+        renderer.window.fill((150, 200, 150))
+        draw_pawns_one_by_one(renderer.window, sim)
+        expected = pixels(renderer.window)
+
+        renderer.window.fill((150, 200, 150))
+        renderer.draw_pawn(sim)
+        assert pixels(renderer.window) == expected
+        kinds.update((team, kind) for team, kind, *_ in sim.moving_pawns)
+    assert kinds == {(1, 0), (1, 1), (2, 0)}
@@ -0,0 +1,62 @@
+import numpy as np
+
+from tcg.config import A_coordinate, n_fortress, travel_time
+from tcg.pawns import spawn_position
+from tcg.players.strategy_anchor import Anchor
+from tcg.players.strategy_rusher import Rusher
+from tcg.scheduler import next_departure, steps_to_arrive, steps_to_arrive_batch
+from tcg.simulation import Simulation
+
+ROADS = [(i, j) for i in range(n_fortress) for j in range(n_fortress) if A_coordinate[i][j]]
+
+
+def test_travel_time_matches_steps_to_arrive():
+    for kind in (0, 1):
+        for i in range(n_fortress):
+            for j in range(n_fortress):
+                if A_coordinate[i][j]:
+                    expected = steps_to_arrive(spawn_position(i, j), kind, i, j)
+                else:
+                    expected = 0
+                assert travel_time[kind][i][j] == expected
+
+
+def test_batch_matches_single():
+    rng = np.random.default_rng(0)
+    from_, to = np.array(ROADS).T
+    kind = rng.integers(0, 2, len(ROADS))
+    start = np.array([spawn_position(i, j) for i, j in ROADS])
+    # Anywhere between the spawn point and halfway along the road
+    along = rng.random(len(ROADS)) * 100
+    x = start[:, 0] + np.array([A_coordinate[i][j][0] for i, j in ROADS]) * along
+    y = start[:, 1] + np.array([A_coordinate[i][j][1] for i, j in ROADS]) * along
+    batch = steps_to_arrive_batch(x, y, kind, from_, to)
+    single = [
+        steps_to_arrive((px, py), k, i, j)
+        for px, py, k, i, j in zip(x.tolist(), y.tolist(), kind.tolist(), from_, to)
+    ]
+    assert batch.tolist() == single
+
+
+def test_scheduled_arrivals_are_exact():
+    sim = Simulation(Rusher(), Anchor(), seed=4)
+    checked = 0
+    for _ in range(1500):
+        sim.advance()
+        for step, pawns in sim.arrival_schedule.items():
+            for team, kind, from_, to, pos in pawns:
+                assert steps_to_arrive(pos, kind, from_, to) == step - sim.step + 1
+                checked += 1
+    assert checked > 0
+
+
+def test_next_departure():
+    entry = [1, 0, 3, 10, 7, [0, 0]]
+    heavy = [1, 1, 2, 4, 7, [0, 0]]
+    drained = [1, 0, 0, 10, 7, [0, 0]]
+    assert next_departure([], 5) is None
+    assert next_departure([drained], 5) is None
+    assert next_departure([entry, drained], 5) == 7
+    assert next_departure([entry], 14) == 14
+    assert next_departure([heavy], 5) == 10
+    assert next_departure([heavy, entry], 8) == 10
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from tcg.players.sample_random import RandomPlayer
+from tcg.players.strategy_economist import DefensiveEconomist
+from tcg.simulation import Simulation
+
+
+def play(steps=1500, **kwargs):
+    sim = Simulation(RandomPlayer(), DefensiveEconomist(), **kwargs)
+    for _ in range(steps):
+        sim.advance()
+    return sim
+
+
+@pytest.mark.parametrize("store", ["list", "array", "convoy"])
+def test_same_seed_same_game(store, board):
+    random.seed(0)
+    first = board(play(pawn_store=store, seed=11))
+    random.seed(1)
+    assert board(play(pawn_store=store, seed=11)) == first
+    assert board(play(pawn_store=store, seed=12)) != first
+
+
+def test_unseeded_games_follow_the_random_module(board):
+    random.seed(5)
+    first = board(play())
+    random.seed(5)
+    assert board(play()) == first
+
+
+def test_every_controller_gets_its_own_stream():
+    c1, c2 = RandomPlayer(), RandomPlayer()
+    sim = Simulation(c1, c2, seed=3)
+    streams = {id(random), id(sim.rng), id(c1.rng), id(c2.rng)}
+    assert len(streams) == 4
+    assert c1.rng.random() != c2.rng.random()
@@ -0,0 +1,82 @@
+import pytest
+
+from tcg.controller import Controller
+from tcg.players.strategy_anchor import Anchor
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+
+
+@pytest.mark.parametrize("store", ["list", "array", "convoy"])
+def test_counters_match_a_rescan(store):
+    sim = Simulation(SplitPusher(), Rusher(), pawn_store=store, seed=2)
+    before = [row[:4] for row in sim.state]
+    flips = 0
+    for _ in range(2500):
+        sim.advance()
+        after = [row[:4] for row in sim.state]
+        teams = [row[0] for row in sim.state]
+        assert sim.fortress_count == tuple(teams.count(team) for team in range(3))
+        assert (sim.Blue_fortress, sim.Red_fortress) == (teams.count(1), teams.count(2))
+        assert sim.pawn_total == pytest.approx(
+            tuple(sum(row[3] for row in sim.state if row[0] == team) for team in range(3))
+        )
+        changed = {i for i, (old, new) in enumerate(zip(before, after)) if old != new}
+        assert changed <= sim.changed_fortresses
+        flips += sum(old[0] != new[0] for old, new in zip(before, after))
+        before = after
+    assert flips > 0
+
+
+def test_game_over_when_one_side_is_wiped_out():
+    sim = Simulation(Rusher(), Anchor(), seed=2)
+    for row in sim.state:
+        if row[0] == 2:
+            row[0] = 1
+            sim.touch(sim.state.index(row))
+    assert sim.CheckGameOver()
+    assert sim.win_team == "Blue"
+    sim.advance()
+    assert not sim.advance()
+
+
+class Counting(Controller):
+    def __init__(self, interval=1):
+        self.decision_interval = interval
+        self.calls = 0
+
+    def team_name(self) -> str:
+        return "Counting"
+
+    def update(self, info):
+        self.calls += 1
+        return 0, 0, 0
+
+
+def test_decision_interval():
+    slow, fast = Counting(5), Counting()
+    sim = Simulation(slow, fast, seed=2)
+    for _ in range(23):
+        sim.advance()
+    assert (slow.calls, fast.calls) == (5, 23)
+
+    sim = Simulation(Counting(), Counting(), seed=2, decision_interval=(3, 4))
+    for _ in range(12):
+        sim.advance()
+    assert (sim.controller1.calls, sim.controller2.calls) == (4, 3)
+
+
+def test_a_capture_brings_the_decision_forward():
+    slow = Counting(100)
+    sim = Simulation(slow, Counting(), seed=2)
+    sim.advance()
+    sim.advance()
+    sim.state[0][0] = 1
+    sim.touch(0)
+    sim.advance()
+    assert slow.calls == 2
+
+
+def test_decision_interval_must_be_positive():
+    with pytest.raises(ValueError):
+        Simulation(Counting(), Counting(), decision_interval=0)
@@ -0,0 +1,55 @@
+import pytest
+
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+
+STORES = ["list", "array", "convoy"]
+
+
+def play(sim, steps):
+    for _ in range(steps):
+        sim.advance()
+
+
+@pytest.mark.parametrize("event_driven", [False, True])
+@pytest.mark.parametrize("store", STORES)
+def test_restore_replays_the_same_game(store, event_driven, board):
+    sim = Simulation(SplitPusher(), Rusher(), event_driven=event_driven, pawn_store=store, seed=3)
+    play(sim, 2200)
+    snap = sim.snapshot()
+    play(sim, 400)
+    first = board(sim)
+    sim.restore(snap)
+    assert sim.step == snap.step
+    play(sim, 400)
+    assert board(sim) == first
+
+
+@pytest.mark.parametrize("store", STORES)
+def test_clone_plays_on_independently(store, board):
+    sim = Simulation(SplitPusher(), Rusher(), pawn_store=store, seed=3)
+    play(sim, 2200)
+    twin = sim.clone()
+    assert board(twin) == board(sim)
+    play(twin, 300)
+    play(sim, 300)
+    assert board(twin) == board(sim)
+    twin.state[10][3] += 5
+    assert twin.state[10][3] != sim.state[10][3]
+
+
+def test_snapshot_holds_no_references():
+    sim = Simulation(SplitPusher(), Rusher(), seed=3)
+    play(sim, 2200)
+    snap = sim.snapshot()
+    state = [row[:5] for row in sim.state]
+    play(sim, 300)
+    sim.restore(snap)
+    assert [row[:5] for row in sim.state] == state
+
+
+def test_restore_checks_the_pawn_store():
+    snap = Simulation(Rusher(), Rusher(), pawn_store="array", seed=3).snapshot()
+    with pytest.raises(ValueError):
+        Simulation(Rusher(), Rusher(), seed=3).restore(snap)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from tcg.analysis import BoardAnalysis
+from tcg.controller import Controller
+from tcg.info import Info
+from tcg.pawns import Traffic
+from tcg.players.claude_player import ClaudePlayer
+from tcg.players.strategy_economist import DefensiveEconomist
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+from tcg.vec_game import VecGame
+
+
+def same_counts(traffic, expected):
+    return (
+        np.array_equal(traffic.moving, expected.moving)
+        and np.array_equal(traffic.queued, expected.queued)
+        and np.array_equal(traffic.incoming, expected.incoming)
+    )
+
+
+class Checker(Controller):
+    """Plays `player`, checking that info.traffic counts the pawns in info."""
+
+    def __init__(self, player):
+        self.player = player
+        self.pawns_seen = 0
+
+    def team_name(self) -> str:
+        return "Checker"
+
+    def update(self, info):
+        assert same_counts(info.traffic, Traffic.count(info.moving_pawns, info.spawning_pawns))
+        self.pawns_seen += len(info.moving_pawns)
+        return self.player.update(info)
+
+
+@pytest.mark.parametrize("event_driven", [False, True])
+@pytest.mark.parametrize("store", ["list", "array", "convoy"])
+def test_engine_counts_match_the_pawn_lists(store, event_driven):
+    sim = Simulation(SplitPusher(), Rusher(), event_driven=event_driven, pawn_store=store, seed=3)
+    seen = 0
+    while sim.step < 2500 and sim.advance():
+        assert same_counts(sim.traffic, Traffic.count(sim.moving_pawns, sim.spawning_pawns))
+        seen += len(sim.moving_pawns)
+    assert seen > 0
+
+
+def test_both_perspectives_see_consistent_counts():
+    blue, red = Checker(SplitPusher()), Checker(Rusher())
+    sim = Simulation(blue, red, seed=3)
+    for _ in range(2500):
+        sim.advance()
+    assert blue.pawns_seen > 0 and red.pawns_seen > 0
+
+
+def test_vec_game_counts_match_the_pawn_lists():
+    pairs = [(Checker(SplitPusher()), Checker(Rusher())) for _ in range(2)]
+    games = VecGame(pairs, seed=3)
+    for _ in range(2500):
+        games.advance()
+    assert all(blue.pawns_seen > 0 for blue, _ in pairs)
+
+
+def test_players_fall_back_on_a_plain_info_list():
+    sim = Simulation(Rusher(), Rusher(), seed=3)
+    for _ in range(300):
+        sim.advance()
+    info = Info(1, sim.state, sim.moving_pawns, sim.spawning_pawns, False, (), sim.traffic)
+    plain = [1, sim.state, list(sim.moving_pawns), list(sim.spawning_pawns), False]
+    assert Traffic.of(info) is sim.traffic
+    assert same_counts(Traffic.of(plain), sim.traffic)
+    assert BoardAnalysis.of(plain).mine == info.analysis.mine
+    for player in (Rusher, ClaudePlayer):
+        assert player().update(plain) == player().update(info)
+    DefensiveEconomist().update(plain)
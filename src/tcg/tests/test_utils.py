@@ -0,0 +1,96 @@
+from tcg.config import swap_number_l
+from tcg.controller import Controller
+from tcg.info import Info
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+from tcg.utils import FlippedTraffic, Swap_team, flip_board_view
+
+
+def copied_flip(info):
+    """The board seen by team 2, built by copying as flip_board_view used to."""
+    team, state, moving_pawns, spawning_pawns, done = info
+    new_state = [
+        [Swap_team(state[swap_number_l[i]][0])] + state[swap_number_l[i]][1:5]
+        for i in range(len(state))
+    ]
+    for i, row in enumerate(new_state):
+        row.append(state[i][5])
+    moving = [
+        [Swap_team(p[0]), p[1], swap_number_l[p[2]], swap_number_l[p[3]]] + p[4:]
+        for p in moving_pawns
+    ]
+    spawning = [
+        [Swap_team(p[0]), p[1], p[2], swap_number_l[p[3]], swap_number_l[p[4]]] + p[5:]
+        for p in spawning_pawns
+    ]
+    return [Swap_team(team), new_state, moving, spawning, done]
+
+
+class Checker(Controller):
+    """Plays Rusher as team 2, checking each view against a copied flip."""
+
+    def __init__(self):
+        self.player = Rusher()
+        self.sim = None
+        self.pawns_seen = 0
+
+    def team_name(self) -> str:
+        return "Checker"
+
+    def update(self, info):
+        sim = self.sim
+        _, state, moving, spawning, _ = copied_flip(
+            [2, sim.state, sim.moving_pawns, sim.spawning_pawns, False]
+        )
+        assert info.state == state
+        assert info.moving_pawns == moving
+        assert info.spawning_pawns == spawning
+        self.pawns_seen += len(moving)
+        return self.player.update(info)
+
+
+def test_views_match_a_copied_flip():
+    checker = Checker()
+    checker.sim = Simulation(SplitPusher(), checker, seed=3)
+    for _ in range(2500):
+        checker.sim.advance()
+    assert checker.pawns_seen > 0
+
+
+def test_rows_are_read_once():
+    sim = Simulation(Rusher(), Rusher(), seed=3)
+    info = Info(2, sim.state, sim.moving_pawns, sim.spawning_pawns, False)
+    view = flip_board_view(info)
+    assert view.team == 1
+    # A row is permuted when first read and then kept as it was
+    sim.state[1][3] = 17
+    row = view.state[swap_number_l[1]]
+    assert row[3] == 17
+    assert view.state == copied_flip(info)[1]
+    sim.state[1][3] = 18
+    assert view.state[swap_number_l[1]] is row
+    assert row[3] == 17
+    assert flip_board_view(Info(1, sim.state, [], [], False)).state is sim.state
+
+
+def test_traffic_is_remapped_once():
+    sim = Simulation(Rusher(), Rusher(), seed=3)
+    view = FlippedTraffic(sim.traffic)
+    for name in ("moving", "queued", "incoming"):
+        assert getattr(view, name) is getattr(view, name)
+    sim.traffic.moving[1, 0, 10, 7] += 1
+    assert view.moving[2, 0, swap_number_l[10], swap_number_l[7]] == 0
+    assert FlippedTraffic(sim.traffic).moving[2, 0, swap_number_l[10], swap_number_l[7]] == 1
+
+
+def test_pawns_are_flipped_once():
+    sim = Simulation(Rusher(), Rusher(), seed=3)
+    pawns = [[1, 0, 10, 7, [1.0, 2.0]], [2, 1, 1, 4, [3.0, 4.0]]]
+    view = flip_board_view(Info(2, sim.state, pawns, [], False))
+    first = view.moving_pawns[0]
+    assert first == [2, 0, swap_number_l[10], swap_number_l[7], [1.0, 2.0]]
+    assert view.moving_pawns[0] is first
+    assert list(view.moving_pawns)[0] is first
+    assert view.moving_pawns[:1] == [first]
+    assert pawns[0][0] == 1
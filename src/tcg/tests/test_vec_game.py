@@ -0,0 +1,174 @@
+import time
+
+import numpy as np
+import pytest
+
+from tcg.controller import Controller, EventController, memoise
+from tcg.players.strategy_anchor import Anchor
+from tcg.players.strategy_bulwark import Bulwark
+from tcg.players.strategy_flow import Flow
+from tcg.players.strategy_rusher import Rusher
+from tcg.players.strategy_splitpush import SplitPusher
+from tcg.simulation import Simulation
+from tcg.vec_game import VecGame
+
+PAIRS = [(SplitPusher, Rusher), (Rusher, Bulwark), (Bulwark, SplitPusher)]
+
+
+class Idle(Controller):
+    def team_name(self) -> str:
+        return "Idle"
+
+    def update(self, info):
+        return 0, 0, 0
+
+
+class Counting(Idle):
+    def __init__(self, interval=1, plan=None):
+        self.decision_interval = interval
+        self.plan = plan
+        self.calls = 0
+
+    def update(self, info):
+        self.calls += 1
+        return list(self.plan) if self.plan is not None else (0, 0, 0)
+
+
+def test_plans_are_played():
+    # Team 1 holds fortress 10; the plan sends from it after one step and
+    # is called again once drained
+    planner = Counting(plan=[(1, 1, 10, 7), (5, 0, 0, 0)])
+    games = VecGame([(planner, Idle())], seed=1)
+    games.advance()
+    assert len(games.spawns) == 0
+    games.advance()
+    assert games.spawns.from_[: games.spawns.n].tolist() == [10]
+    for _ in range(8):
+        games.advance()
+    assert planner.calls == 2
+
+
+def test_empty_plan():
+    planner = Counting(plan=[])
+    games = VecGame([(planner, Idle())], seed=1)
+    for _ in range(3):
+        assert games.advance()
+    assert planner.calls == 3
+
+
+def test_decision_interval():
+    slow = Counting(interval=5)
+    games = VecGame([(slow, Idle())], seed=1)
+    for _ in range(12):
+        games.advance()
+    assert slow.calls == 3
+
+
+def test_plan_dropped_on_flip():
+    planner = Counting(plan=[(100, 0, 0, 0)])
+    games = VecGame([(planner, Idle())], seed=1)
+    games.advance()
+    games.advance()
+    assert planner.calls == 1
+    games.flips[0] += 1
+    games.advance()
+    assert planner.calls == 2
+
+
+def test_event_controller_rejected():
+    with pytest.raises(ValueError):
+        VecGame([(Idle(), EventController())])
+
+
+def test_strategies_run():
+    games = VecGame([(Rusher(), Rusher())] * 2, seed=3)
+    for _ in range(300):
+        games.advance()
+
+
+class Middle:
+    """Departure jitter of zero, for the engine and for the batch alike."""
+
+    def random(self, n=None):
+        return 0.5 if n is None else np.full(n, 0.5)
+
+
+def test_matches_simulation():
+    games = VecGame([(a(), b()) for a, b in PAIRS], seed=1)
+    games.rng = Middle()
+    sims = [Simulation(a(), b(), seed=1) for a, b in PAIRS]
+    for sim in sims:
+        sim.rng = Middle()
+    for _ in range(3000):
+        games.advance()
+        for g, sim in enumerate(sims):
+            sim.advance()
+            assert games.state[g].tolist() == [row[:5] for row in sim.state]
+            assert (games.pawns.game[: games.pawns.n] == g).sum() == len(sim.moving_pawns)
+    assert sum(sim.flips for sim in sims) > 0
+
+
+def test_matches_are_independent():
+    games = VecGame([(SplitPusher(), Rusher()), (Rusher(), Bulwark()), (SplitPusher(), Rusher())])
+    alone = VecGame([(Rusher(), Bulwark())])
+    games.rng = alone.rng = Middle()
+    for _ in range(3000):
+        games.advance()
+        alone.advance()
+    assert games.state[0].tolist() == games.state[2].tolist()
+    assert games.state[1].tolist() == alone.state[0].tolist()
+    assert games.state[0].tolist() != games.state[1].tolist()
+
+
+class Watching(Idle):
+    """Records the board each time its memoised update really runs."""
+
+    def __init__(self):
+        self.seen = []
+
+    @memoise
+    def update(self, info):
+        self.seen.append([list(row[:5]) for row in info.state])
+        return 0, 0, 0
+
+
+def test_versions_match_simulation():
+    watchers = [(Watching(), Watching()) for _ in PAIRS]
+    games = VecGame([(a(), w) for (a, _), (w, _) in zip(PAIRS, watchers)], seed=1)
+    games.rng = Middle()
+    sims = [Simulation(a(), w, seed=1) for (a, _), (_, w) in zip(PAIRS, watchers)]
+    for sim in sims:
+        sim.rng = Middle()
+    for _ in range(1500):
+        games.advance()
+        for sim in sims:
+            sim.advance()
+    for in_batch, alone in watchers:
+        assert in_batch.seen == alone.seen
+        assert 0 < len(in_batch.seen) < 1500
+
+
+def best_time(run, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_faster_than_simulations():
+    n, steps = 32, 500
+
+    def batch():
+        games = VecGame([(Flow(), Anchor()) for _ in range(n)], seed=1)
+        for _ in range(steps):
+            games.advance()
+
+    def one_by_one():
+        for seed in range(n):
+            sim = Simulation(Flow(), Anchor(), seed=seed)
+            for _ in range(steps):
+                sim.advance()
+
+    assert best_time(batch) < best_time(one_by_one)
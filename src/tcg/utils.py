@@ -1,6 +1,12 @@
 """Utility functions for the game."""
 
-from .config import swap_number_d, swap_number_l
+from collections.abc import Sequence
+
+import numpy as np
+
+from .config import swap_number_l
+from .events import CAPTURED
+from .info import Info
 
 
 def Swap_team(team):
@@ -8,45 +14,176 @@ def Swap_team(team):
     return 0 if team == 0 else 1 if team == 2 else 2
 
 
+class FlippedState(Sequence):
+    """`state` as seen by team 2, remapped on access instead of copied.
+
+    Row i is the canonical row `swap_number_l[i]` with its team swapped;
+    the neighbour list is the one of row i, as the board is symmetric.
+    Each row is permuted into a plain list the first time it is read and
+    kept for the lifetime of the view.
+    """
+
+    __slots__ = ("_state", "_rows")
+
+    def __init__(self, state):
+        self._state = state
+        self._rows = [None] * len(state)
+
+    def __len__(self):
+        return len(self._state)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        row = self._rows[i]
+        if row is None:
+            i %= len(self._state)
+            team, kind, level, pawn_number, upgrade_time = self._state[swap_number_l[i]][:5]
+            row = [Swap_team(team), kind, level, pawn_number, upgrade_time, self._state[i][5]]
+            self._rows[i] = row
+        return row
+
+    def __eq__(self, other):
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class FlippedPawns(Sequence):
+    """Moving or spawning pawns as seen by team 2, flipped when first read.
+
+    `ends` gives the positions of the from/to fortress numbers in each
+    entry: (2, 3) for moving pawns and (3, 4) for spawning pawns.  All
+    entries are flipped in one pass on first access and kept for the
+    lifetime of the view.
+    """
+
+    __slots__ = ("_pawns", "_ends", "_items")
+
+    def __init__(self, pawns, ends):
+        self._pawns = pawns
+        self._ends = ends
+        self._items = None
+
+    @property
+    def items(self):
+        if self._items is None:
+            self._items = [self._flip(pawn) for pawn in self._pawns]
+        return self._items
+
+    def __len__(self):
+        return len(self._pawns)
+
+    def _flip(self, pawn):
+        a, b = self._ends
+        flipped = list(pawn)
+        flipped[0] = Swap_team(pawn[0])
+        flipped[a] = swap_number_l[pawn[a]]
+        flipped[b] = swap_number_l[pawn[b]]
+        return flipped
+
+    def __getitem__(self, i):
+        return self.items[i]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __eq__(self, other):
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class FlippedTraffic:
+    """`Traffic` counts as seen by team 2.
+
+    Each array is remapped the first time it is read and kept for the
+    lifetime of the view.
+    """
+
+    __slots__ = ("_traffic", "_moving", "_queued", "_incoming")
+
+    def __init__(self, traffic):
+        self._traffic = traffic
+        self._moving = None
+        self._queued = None
+        self._incoming = None
+
+    @property
+    def moving(self):
+        if self._moving is None:
+            self._moving = self._traffic.moving[_ROADS]
+        return self._moving
+
+    @property
+    def queued(self):
+        if self._queued is None:
+            self._queued = self._traffic.queued[_ROADS]
+        return self._queued
+
+    @property
+    def incoming(self):
+        if self._incoming is None:
+            self._incoming = self._traffic.incoming[_TARGETS]
+        return self._incoming
+
+
+class FlippedForecast:
+    """`Simulation.forecast` as seen by team 2."""
+
+    __slots__ = ("_forecast",)
+
+    def __init__(self, forecast):
+        self._forecast = forecast
+
+    def __call__(self, horizon):
+        return self._forecast(horizon).flipped(swap_number_l, _TEAM_IDS)
+
+
+_TEAMS = [Swap_team(team) for team in range(3)]
+_TEAM_IDS = np.array(_TEAMS, dtype=np.int8)
+_KINDS = [0, 1]
+# Indices that remap `[team, kind, from_, to]` and `[team, kind, to]` arrays
+_ROADS = np.ix_(_TEAMS, _KINDS, swap_number_l, swap_number_l)
+_TARGETS = np.ix_(_TEAMS, _KINDS, swap_number_l)
+
+
+def flip_event(event):
+    """A `GameEvent` as seen by team 2."""
+    return event._replace(
+        team=Swap_team(event.team),
+        fortress=swap_number_l[event.fortress] if event.fortress >= 0 else -1,
+        to=swap_number_l[event.to] if event.to >= 0 else -1,
+        value=Swap_team(event.value) if event.kind == CAPTURED else event.value,
+    )
+
+
 def flip_board_view(info):
-    """Flip board view so the player always sees themselves as team 1."""
+    """Flip board view so the player always sees themselves as team 1.
+
+    Nothing is copied: the state and pawn lists are wrapped in views that
+    swap team ids and fortress numbers when they are read.  Only the few
+    events are flipped eagerly.
+    """
     team, state, moving_pawns, spawning_pawns, done = info
 
     if team == 1:
         return info
 
-    # Update state
-    new_state = [
-        [Swap_team(state[swap_number_l[i]][0])] + state[swap_number_l[i]][1:]
-        for i in range(len(state))
-    ]
-
-    for i in range(len(state)):
-        new_state[i][5] = state[i][5]
-
-    # Update moving_pawns
-    new_moving_pawns = [
-        [
-            Swap_team(moving_pawns[i][0]),
-            moving_pawns[i][1],
-            swap_number_d[moving_pawns[i][2]],
-            swap_number_d[moving_pawns[i][3]],
-        ]
-        + moving_pawns[i][4:]
-        for i in range(len(moving_pawns))
-    ]
-
-    # Update spawning_pawns
-    new_spawning_pawns = [
-        [
-            Swap_team(spawning_pawns[i][0]),
-            spawning_pawns[i][1],
-            spawning_pawns[i][2],
-            swap_number_d[spawning_pawns[i][3]],
-            swap_number_d[spawning_pawns[i][4]],
-        ]
-        + spawning_pawns[i][5:]
-        for i in range(len(spawning_pawns))
-    ]
-
-    return [Swap_team(team), new_state, new_moving_pawns, new_spawning_pawns, done]
+    # Plain 5-item lists have neither events, traffic nor a version
+    traffic = getattr(info, "traffic", None)
+    forecast = getattr(info, "forecast", None)
+
+    return Info(
+        Swap_team(team),
+        FlippedState(state),
+        FlippedPawns(moving_pawns, (2, 3)),
+        FlippedPawns(spawning_pawns, (3, 4)),
+        done,
+        [flip_event(event) for event in getattr(info, "events", ())],
+        None if traffic is None else FlippedTraffic(traffic),
+        None if forecast is None else FlippedForecast(forecast),
+        getattr(info, "version", None),
+    )
@@ -0,0 +1,613 @@
+"""Many independent matches stepped together as NumPy arrays."""
+
+import random
+from collections import deque
+
+import numpy as np
+
+from .config import (
+    STEPLIMIT,
+    depart_interval,
+    fortress_cool,
+    fortress_limit,
+    n_fortress,
+    pawn_speed,
+    pos_fortress,
+    swap_number_l,
+)
+from .controller import EventController
+from .info import Info, LazyList
+from .pawns import _damage
+from .scheduler import road_direction, steps_to_arrive_batch
+from .simulation import _versions, initial_state, is_plan, plan_entries, pop_planned
+from .snapshot import pawn_tables
+from .utils import FlippedPawns, FlippedTraffic, Swap_team
+
+# Columns of VecGame.state
+TEAM, KIND, LEVEL, PAWNS, TIMER = range(5)
+
+_limit = np.array(fortress_limit, dtype=np.float64)
+_cool = np.array(fortress_cool, dtype=np.int64)
+_interval = np.array(depart_interval, dtype=np.int64)
+_pos = np.array(pos_fortress, dtype=np.float64)
+_speed = np.array(pawn_speed, dtype=np.float64)
+# Every regen period; most steps are a multiple of none of them
+_cool_periods = sorted({c for row in fortress_cool for c in row})
+# Team ids as seen by team 2
+_swap_team = np.array([Swap_team(team) for team in range(3)], dtype=np.float64)
+
+
+class _Columns:
+    """Growable table stored as one NumPy array per column."""
+
+    def __init__(self, capacity=256, **dtypes):
+        self.n = 0
+        self._dtypes = dtypes
+        for name, dtype in dtypes.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.n
+
+    def extend(self, **values):
+        m = len(next(iter(values.values())))
+        capacity = len(getattr(self, next(iter(self._dtypes))))
+        if self.n + m > capacity:
+            while self.n + m > capacity:
+                capacity *= 2
+            for name, dtype in self._dtypes.items():
+                new = np.zeros(capacity, dtype=dtype)
+                new[: self.n] = getattr(self, name)[: self.n]
+                setattr(self, name, new)
+        for name, value in values.items():
+            getattr(self, name)[self.n : self.n + m] = value
+        self.n += m
+
+    def take(self, mask):
+        """Remove the rows selected by `mask` and return them as a dict."""
+        n = self.n
+        taken = {name: getattr(self, name)[:n][mask] for name in self._dtypes}
+        keep = ~mask
+        m = int(keep.sum())
+        for name in self._dtypes:
+            arr = getattr(self, name)
+            arr[:m] = arr[:n][keep]
+        self.n = m
+        return taken
+
+    def grouped(self, games, n_games, names):
+        """Rows as Python lists per game, in insertion order within each game."""
+        n = self.n
+        order = np.argsort(games[:n], kind="stable")
+        bounds = np.searchsorted(games[:n][order], np.arange(n_games + 1)).tolist()
+        cols = [getattr(self, name)[:n][order].tolist() for name in names]
+        return [[col[a:b] for col in cols] for a, b in zip(bounds, bounds[1:])]
+
+
+class _MatchTraffic:
+    """`Traffic` counts of match g, cut from batch tables built on first read."""
+
+    __slots__ = ("_tables", "_g")
+
+    def __init__(self, tables, g):
+        self._tables = tables
+        self._g = g
+
+    @property
+    def moving(self):
+        return self._tables[0][self._g]
+
+    @property
+    def queued(self):
+        return self._tables[1][self._g]
+
+    @property
+    def incoming(self):
+        return self._tables[2][self._g]
+
+
+def _moving_list(team, kind, from_, to, x, y):
+    return [[t, k, f, d, [px, py]] for t, k, f, d, px, py in zip(team, kind, from_, to, x, y)]
+
+
+def _spawning_list(team, kind, count, from_, to, x, y):
+    # Spawn counts start from `pawn_number // 2` and go down by one, so they are whole
+    return [
+        [t, k, int(c), f, d, [px, py]]
+        for t, k, c, f, d, px, py in zip(team, kind, count, from_, to, x, y)
+    ]
+
+
+class VecGame:
+    """N independent matches with their state held as batched arrays.
+
+    `state` is an `[N, 12, 5]` array of `[team, kind, level, pawn_number,
+    upgrade_time]` rows, and the spawning and moving pawns of every match
+    share one column table tagged with the match index.  Movement,
+    arrivals, departures, regen and upgrades are array operations over the
+    whole batch; only the controllers are called once per match, with the
+    usual `info` payload, and only for matches where one is due to be
+    called.  Decision intervals and plans are honoured as in
+    `Simulation.decide`, and each match keeps its own `version`, so
+    `@memoise` players skip the steps where their board did not change.
+    No events are reported, so an `EventController` is rejected.
+
+    All matches share one step counter.  A match stops when it would have
+    stopped in `Simulation`; its pawns are dropped and its final state
+    stays in `state`.
+    """
+
+    def __init__(self, controllers, seed=None):
+        self.controllers = list(controllers)
+        self.n_games = len(self.controllers)
+        for pair in self.controllers:
+            for controller in pair:
+                if isinstance(controller, EventController):
+                    raise ValueError(
+                        f"VecGame reports no events, so cannot run {type(controller).__name__}"
+                    )
+        # Per match and side, as in Simulation: steps between update calls,
+        # the step of the next call, queued plan, flips seen at the last call
+        # and the submit hook of controllers that compute elsewhere
+        self.decision_interval = [
+            [getattr(c, "decision_interval", 1) for c in pair] for pair in self.controllers
+        ]
+        if any(k < 1 for pair in self.decision_interval for k in pair):
+            raise ValueError("decision_interval must be >= 1")
+        self._next_decision = [[0, 0] for _ in self.controllers]
+        self._flips_seen = [[0, 0] for _ in self.controllers]
+        self._plans = [(deque(), deque()) for _ in self.controllers]
+        self._submit = [[getattr(c, "submit", None) for c in pair] for pair in self.controllers]
+        self.flips = [0] * self.n_games
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        # Departure jitter for the whole batch, plus one stream per controller
+        self.rng = np.random.default_rng(seed)
+        streams = random.Random(seed)
+        for pair in self.controllers:
+            for controller in pair:
+                set_rng = getattr(controller, "set_rng", None)
+                if set_rng is not None:
+                    set_rng(random.Random(streams.getrandbits(64)))
+
+        init = initial_state()
+        self.to_set = [row[5] for row in init]
+        self.state = np.tile(
+            np.array([row[:5] for row in init], dtype=np.float64), (self.n_games, 1, 1)
+        )
+
+        self.step = 0
+        self.running = np.ones(self.n_games, dtype=bool)
+        # State version of each match, as Simulation.version; matches whose
+        # fortress rows changed since the last decide_all are marked touched
+        self.version = [next(_versions) for _ in range(self.n_games)]
+        self._touched = np.zeros(self.n_games, dtype=bool)
+        # Board rows last handed out per match, as seen by each side, and the
+        # version they show
+        self._rows = [(None, None, None)] * self.n_games
+        self.steps = np.zeros(self.n_games, dtype=np.int64)
+        self.invalid_delivers = np.zeros(self.n_games, dtype=np.int64)
+
+        self.spawns = _Columns(
+            game=np.int64,
+            team=np.int8,
+            kind=np.int8,
+            count=np.float64,
+            from_=np.int8,
+            to=np.int8,
+            x=np.float64,
+            y=np.float64,
+        )
+        self.pawns = _Columns(
+            game=np.int64,
+            team=np.int8,
+            kind=np.int8,
+            from_=np.int8,
+            to=np.int8,
+            x=np.float64,
+            y=np.float64,
+            vx=np.float64,
+            vy=np.float64,
+            arrival=np.int64,
+        )
+
+    @property
+    def team1(self):
+        return [c1.team_name() for c1, _ in self.controllers]
+
+    @property
+    def team2(self):
+        return [c2.team_name() for _, c2 in self.controllers]
+
+    @property
+    def Blue_fortress(self):
+        return (self.state[:, :, TEAM] == 1).sum(axis=1)
+
+    @property
+    def Red_fortress(self):
+        return (self.state[:, :, TEAM] == 2).sum(axis=1)
+
+    @property
+    def win_team(self):
+        """Winner of each match so far: "Blue", "Red" or "Both"."""
+        blue = self.Blue_fortress
+        red = self.Red_fortress
+        return ["Both" if b == r else "Red" if r > b else "Blue" for b, r in zip(blue, red)]
+
+    def run(self):
+        """Play every match to the end and return the winners."""
+        while self.advance():
+            pass
+        return self.win_team
+
+    def advance(self):
+        """Execute one step of every running match; returns False when all are over."""
+        if not self.running.any():
+            return False
+
+        self.pawn_move()
+        blue = self.Blue_fortress
+        red = self.Red_fortress
+        done = (blue == 0) | (red == 0) | (self.step == STEPLIMIT - 1)
+
+        self.decide_all(done)
+
+        self.pawn_departure()
+        self.pawn_born()
+        if self.step % 40 == 0:
+            self.pawn_over()
+        self.check_upgrade()
+
+        self.step += 1
+        finished = self.running & done
+        if finished.any():
+            self.running &= ~done
+            self.steps[finished] = self.step
+            self.pawns.take(finished[self.pawns.game[: self.pawns.n]])
+            self.spawns.take(finished[self.spawns.game[: self.spawns.n]])
+        return True
+
+    def load(self, snap):
+        """Start every match from the `Snapshot` `snap` (see `Simulation.snapshot`)."""
+        pawn_ints, pawn_pos, spawn_ints, spawn_pos = pawn_tables(snap)
+        n = self.n_games
+        self.step = snap.step
+        self.state[:] = snap.state
+        self.running[:] = not any(snap.flags)
+        self._touched[:] = True
+
+        games = np.repeat(np.arange(n), len(pawn_ints))
+        team, kind, from_, to, arrival = np.tile(pawn_ints, (n, 1)).T
+        speed = _speed[kind]
+        self.pawns.n = 0
+        self.pawns.extend(
+            game=games,
+            team=team,
+            kind=kind,
+            from_=from_,
+            to=to,
+            x=np.tile(pawn_pos[:, 0], n),
+            y=np.tile(pawn_pos[:, 1], n),
+            vx=road_direction[from_, to, 0] * speed,
+            vy=road_direction[from_, to, 1] * speed,
+            arrival=arrival,
+        )
+        team, kind, count, from_, to = np.tile(spawn_ints, (n, 1)).T
+        self.spawns.n = 0
+        self.spawns.extend(
+            game=np.repeat(np.arange(n), len(spawn_ints)),
+            team=team,
+            kind=kind,
+            count=count,
+            from_=from_,
+            to=to,
+            x=np.tile(spawn_pos[:, 0], n),
+            y=np.tile(spawn_pos[:, 1], n),
+        )
+
+    def decide_all(self, done):
+        """Ask the controllers of every running match for their commands.
+
+        Board rows and pawn lists are only built for the matches where a
+        controller is called this step; the others just play their plans.
+        Like `Simulation.state`, a match's rows are the same lists from one
+        step to the next until its version moves or an upgrade timer ticks.
+        """
+        for g in np.flatnonzero(self._touched).tolist():
+            self.version[g] = next(_versions)
+        self._touched[:] = False
+        # Pawn tables are split per match only if some controller reads them
+        moving = LazyList(
+            lambda: self.pawns.grouped(
+                self.pawns.game, self.n_games, ("team", "kind", "from_", "to", "x", "y")
+            )
+        )
+        spawning = LazyList(
+            lambda: self.spawns.grouped(
+                self.spawns.game, self.n_games, ("team", "kind", "count", "from_", "to", "x", "y")
+            )
+        )
+        traffic = LazyList(self.traffic_tables)
+        running = np.flatnonzero(self.running).tolist()
+        called = [g for g in running if self.due(g, 0) or self.due(g, 1)]
+        stale = [g for g in called if self._rows[g][0] != self.version[g]]
+        if stale:
+            for g, rows_1, rows_2 in zip(stale, self.state_rows(stale), self.state_rows(stale, 2)):
+                self._rows[g] = (self.version[g], rows_1, rows_2)
+        # Only the upgrade countdown moves without a new version
+        ticking = (self.state[called, :, TIMER] > -1).any(axis=1).tolist()
+        ticking = [g for g, tick in zip(called, ticking) if tick]
+        for g, timers in zip(ticking, self.state[ticking, :, TIMER].astype(np.int64).tolist()):
+            _, rows_1, rows_2 = self._rows[g]
+            for row, timer in zip(rows_1, timers):
+                row[TIMER] = timer
+            for row, i in zip(rows_2, swap_number_l):
+                row[TIMER] = timers[i]
+        called = set(called)
+        done = done.tolist()
+        for g in running:
+            views = self._rows[g][1:] if g in called else None
+            self.decide(g, views, moving, spawning, traffic, done[g])
+
+    def traffic_tables(self):
+        """`Traffic` arrays of every match as `(moving, queued, incoming)`.
+
+        There is no per-pawn bookkeeping to keep in step here, so the counts
+        are rebuilt from the pawn tables in one scatter-add each.
+        """
+        shape = (self.n_games, 3, 2, n_fortress, n_fortress)
+        moving = np.zeros(shape, dtype=np.int64)
+        queued = np.zeros(shape, dtype=np.int64)
+        p, s = self.pawns, self.spawns
+        np.add.at(
+            moving, (p.game[: p.n], p.team[: p.n], p.kind[: p.n], p.from_[: p.n], p.to[: p.n]), 1
+        )
+        np.add.at(
+            queued,
+            (s.game[: s.n], s.team[: s.n], s.kind[: s.n], s.from_[: s.n], s.to[: s.n]),
+            s.count[: s.n].astype(np.int64),
+        )
+        return moving, queued, moving.sum(axis=3)
+
+    def state_rows(self, games, team=1):
+        """`state` of the matches `games` as nested Python lists, as `team` sees it.
+
+        Pawn counts stay ints while they are whole numbers, as in
+        `Simulation`, and every row ends with the shared `to_set` list of its
+        fortress.  Team 2's rows are converted already flipped, with the
+        same numbering `flip_board_view` shows.
+        """
+        state = self.state[games]
+        if team == 2:
+            state = state[:, swap_number_l]
+            state[:, :, TEAM] = _swap_team[state[:, :, TEAM].astype(np.int64)]
+        ints = state.astype(np.int64).tolist()
+        for rows, counts in zip(ints, state[:, :, PAWNS].tolist()):
+            for row, count, to_set in zip(rows, counts, self.to_set):
+                if count % 1:
+                    row[PAWNS] = count
+                row.append(to_set)
+        return ints
+
+    def infos(self, g, rows_1, rows_2, moving, spawning, traffic, done):
+        """The `Info` views of match g for each side; pawn lists are built when first read.
+
+        Team 2's is what `flip_board_view` would make of team 1's, with the
+        rows from `state_rows(..., 2)`.
+        """
+        moving_pawns = LazyList(lambda: _moving_list(*moving[g]))
+        spawning_pawns = LazyList(lambda: _spawning_list(*spawning[g]))
+        match_traffic = _MatchTraffic(traffic, g)
+        version = self.version[g]
+        return (
+            Info(
+                1,
+                rows_1,
+                moving_pawns,
+                spawning_pawns,
+                done,
+                traffic=match_traffic,
+                version=version,
+            ),
+            Info(
+                1,
+                rows_2,
+                FlippedPawns(moving_pawns, (2, 3)),
+                FlippedPawns(spawning_pawns, (3, 4)),
+                done,
+                traffic=FlippedTraffic(match_traffic),
+                version=version,
+            ),
+        )
+
+    def decide(self, g, views, moving, spawning, traffic, done):
+        """Ask both controllers of match g for a command and apply them.
+
+        `views` holds the board rows of each side, or is None when neither
+        controller is due, and then no info is built.
+        """
+        controller1, controller2 = self.controllers[g]
+        info_1 = info_2 = None
+        if views is not None:
+            info_1, info_2 = self.infos(g, *views, moving, spawning, traffic, done)
+            for i, (submit, info) in enumerate(zip(self._submit[g], (info_1, info_2))):
+                if submit is not None and self.due(g, i):
+                    submit(info)
+
+        command_1, subject_1, to_1 = self.command(g, 0, controller1, info_1)
+        command_2, subject_2, to_2 = self.command(g, 1, controller2, info_2)
+
+        if command_1:
+            self.order(g, 1, command_1, subject_1, to_1)
+        if command_2:
+            self.order(g, 2, command_2, swap_number_l[subject_2], swap_number_l[to_2])
+
+    def command(self, g, i, controller, info):
+        """Controller i of match g's command this step, as in `Simulation.decide`."""
+        plan = self._plans[g][i]
+        if self.flips[g] != self._flips_seen[g][i]:
+            plan.clear()
+        if plan:
+            return pop_planned(plan, self.step)
+        if not self.due(g, i):
+            return 0, 0, 0
+        self._next_decision[g][i] = self.step + self.decision_interval[g][i]
+        self._flips_seen[g][i] = self.flips[g]
+        decision = controller.update(info)
+        if is_plan(decision):
+            plan.extend(plan_entries(decision, self.step))
+            return pop_planned(plan, self.step)
+        return decision
+
+    def due(self, g, i):
+        """Whether `command` calls controller i of match g this step."""
+        if self.flips[g] != self._flips_seen[g][i]:
+            return True
+        return not self._plans[g][i] and self.step >= self._next_decision[g][i]
+
+    def order(self, g, team, command, subject, to):
+        """Process player command for match g."""
+        if command == 1:
+            self.deliver(g, team, subject, to)
+        elif command == 2:
+            self.upgrade(g, team, subject)
+
+    def deliver(self, g, team, from_, to):
+        row = self.state[g, from_]
+        if team != row[TEAM] or row[PAWNS] < 2:
+            return
+        if not road_direction[from_, to].any():
+            self.invalid_delivers[g] += 1
+            return
+        count = row[PAWNS] // 2
+        self.spawns.extend(
+            game=[g],
+            team=[team],
+            kind=[row[KIND]],
+            count=[count],
+            from_=[from_],
+            to=[to],
+            x=[_pos[from_, 0] + road_direction[from_, to, 0] * 42],
+            y=[_pos[from_, 1] + road_direction[from_, to, 1] * 42],
+        )
+        row[PAWNS] -= count
+        self._touched[g] = True
+
+    def upgrade(self, g, team, subject):
+        row = self.state[g, subject]
+        level = int(row[LEVEL])
+        if (
+            team == row[TEAM]
+            and row[PAWNS] >= fortress_limit[level] // 2
+            and row[TIMER] == -1
+            and 1 <= level <= 4
+        ):
+            row[TIMER] = 200
+            row[PAWNS] -= fortress_limit[level] // 2
+            self._touched[g] = True
+
+    def pawn_departure(self):
+        """Launch due pawns from every spawn point and drop one drained entry per match."""
+        sp = self.spawns
+        n = sp.n
+        if n == 0:
+            return
+        kind = sp.kind[:n].astype(np.int64)
+        due = np.flatnonzero((sp.count[:n] > 0) & (self.step % _interval[kind] == 0))
+        if len(due):
+            from_ = sp.from_[due].astype(np.int64)
+            to = sp.to[due].astype(np.int64)
+            d = road_direction[from_, to]
+            r = self.rng.random(len(due)) - 0.5
+            x = sp.x[due] + d[:, 1] * r * 10
+            y = sp.y[due] - d[:, 0] * r * 10
+            speed = _speed[kind[due]]
+            self.pawns.extend(
+                game=sp.game[due],
+                team=sp.team[due],
+                kind=kind[due],
+                from_=from_,
+                to=to,
+                x=x,
+                y=y,
+                vx=d[:, 0] * speed,
+                vy=d[:, 1] * speed,
+                arrival=self.step + steps_to_arrive_batch(x, y, kind[due], from_, to),
+            )
+            sp.count[due] -= 1
+
+        drained = np.flatnonzero(sp.count[:n] <= 0)
+        if len(drained):
+            _, first = np.unique(sp.game[drained], return_index=True)
+            mask = np.zeros(n, dtype=bool)
+            mask[drained[first]] = True
+            sp.take(mask)
+
+    def pawn_move(self):
+        """Move every pawn and apply the arrivals due this step."""
+        p = self.pawns
+        n = p.n
+        p.x[:n] += p.vx[:n]
+        p.y[:n] += p.vy[:n]
+        arrived = p.arrival[:n] == self.step
+        if arrived.any():
+            a = p.take(arrived)
+            self.pawn_arrive(a["game"] * n_fortress + a["to"], a["team"], a["kind"])
+
+    def pawn_arrive(self, target, team, kind):
+        """Apply arrivals at flat fortress indices `target`, in pawn order.
+
+        Same split as `pawns.apply_arrivals`: fortresses that cannot change
+        hands take one `np.add.at`, the rest are replayed pawn by pawn.
+        """
+        flat = self.state.reshape(-1, 5)
+        self._touched[target // n_fortress] = True
+        delta = np.where(team == flat[target, TEAM], 1.0, -_damage[kind])
+
+        worst = flat[:, PAWNS].copy()
+        np.add.at(worst, target, np.minimum(delta, 0.0))
+        safe = ~(worst < 1e-9)[target]
+        np.add.at(flat[:, PAWNS], target[safe], delta[safe])
+
+        for i, t, k in zip(target[~safe].tolist(), team[~safe].tolist(), kind[~safe].tolist()):
+            row = flat[i]
+            if t == row[TEAM]:
+                row[PAWNS] += 1
+            else:
+                row[PAWNS] -= _damage[k]
+                if row[PAWNS] < 0:
+                    row[[TEAM, LEVEL, PAWNS, TIMER]] = (t, 1, 0, -1)
+                    self.flips[i // n_fortress] += 1
+
+    def pawn_born(self):
+        """Pawns regenerate over time."""
+        if all(self.step % c for c in _cool_periods):
+            return
+        st = self.state
+        level = st[:, :, LEVEL].astype(np.int64)
+        limit = _limit[level]
+        cool = _cool[st[:, :, KIND].astype(np.int64), level]
+        grow = (self.step % cool == 0) & (st[:, :, PAWNS] < limit) & self.running[:, None]
+        self._touched |= grow.any(axis=1)
+        st[:, :, PAWNS] = np.where(grow, np.minimum(st[:, :, PAWNS] + 1, limit), st[:, :, PAWNS])
+
+    def pawn_over(self):
+        """Remove pawns exceeding fortress limit."""
+        st = self.state
+        over = (st[:, :, PAWNS] > _limit[st[:, :, LEVEL].astype(np.int64)]) & self.running[:, None]
+        st[:, :, PAWNS] -= over
+        self._touched |= over.any(axis=1)
+
+    def check_upgrade(self):
+        """Tick upgrade timers and level up the fortresses that finished."""
+        st = self.state
+        if not (st[:, :, TIMER] >= 0).any():
+            return
+        run = self.running[:, None]
+        ticking = (st[:, :, TIMER] > 0) & run
+        finished = (st[:, :, TIMER] == 0) & run
+        st[:, :, TIMER] -= ticking
+        st[:, :, TIMER][finished] = -1
+        st[:, :, LEVEL] += finished
+        self._touched |= finished.any(axis=1)
@@ -21,17 +21,62 @@ import pygame
 
 from tcg.controller import Controller
 from tcg.game import Game
+from tcg.isolation import IsolatedController
 from tcg.players import discover_players
+from tcg.profiling import LatencyStats
 
 # トーナメント設定
 TOURNAMENT_MODE = "swiss"  # "swiss" または "round_robin"
 SWISS_ROUNDS = None  # None の場合は自動計算（ceil(log2(player_count)) * 2）
 MATCHES_PER_PAIR = 2  # 各対戦カードで実行する試合数（round_robin用）
 ENABLE_WINDOW = False  # ウィンドウ表示の有効/無効
+DECISION_INTERVAL = None  # update を呼ぶ間隔（ステップ数）。None なら各プレイヤーの設定に従う
+ISOLATE_PLAYERS = False  # 各プレイヤーを別プロセスで動かす（クラッシュや遅いプレイヤーから保護）
+DECISION_BUDGET = None  # ISOLATE_PLAYERS 時の1回の判断の制限時間（秒）。超えたら何もしない
+STEP_BUDGET_MS = None  # update の目安時間（ミリ秒）。p99 が超えたプレイヤーに ! を付ける
+
+
+def make_player(player_class: type[Controller]) -> Controller:
+    """設定に応じてプレイヤーを生成する（ISOLATE_PLAYERS なら別プロセスで）"""
+    if ISOLATE_PLAYERS:
+        return IsolatedController(player_class, budget=DECISION_BUDGET)
+    return player_class()
+
+
+def latency_header() -> str:
+    """順位表に追加する処理時間の列見出し"""
+    return f" {'平均ms':>8} {'p99ms':>8} {'最大ms':>8} {'CPU%':>6}"
+
+
+def over_budget(latency: LatencyStats) -> bool:
+    """update の p99 が STEP_BUDGET_MS を超えているか"""
+    return STEP_BUDGET_MS is not None and latency.quantile(0.99) * 1000 > STEP_BUDGET_MS
+
+
+def latency_columns(latency: LatencyStats, total_seconds: float) -> str:
+    """update の平均・p99・最大時間と、全試合時間に占める割合（CPU%）の列"""
+    share = latency.total / 1e9 / total_seconds * 100 if total_seconds > 0 else 0.0
+    return (
+        f" {latency.mean * 1000:>8.3f} {latency.quantile(0.99) * 1000:>8.3f} "
+        f"{latency.longest * 1000:>8.2f} {share:>5.1f}%" + (" !" if over_budget(latency) else "")
+    )
+
+
+def print_budget_report(latencies: dict[str, LatencyStats]) -> None:
+    """STEP_BUDGET_MS を超えたプレイヤーを表示"""
+    if STEP_BUDGET_MS is None:
+        return
+    slow = [name for name, latency in latencies.items() if over_budget(latency)]
+    print(f"\n処理時間の目安 {STEP_BUDGET_MS}ms (p99) を超えたプレイヤー: ", end="")
+    print(", ".join(slow) if slow else "なし")
 
 
 def run_match(
-    player1: Controller, player2: Controller, match_id: int = 1, window: bool = True
+    player1: Controller,
+    player2: Controller,
+    match_id: int = 1,
+    window: bool = True,
+    seed: int | None = None,
 ) -> dict:
     """
     1試合を実行して結果を返す
@@ -41,6 +86,7 @@ def run_match(
         player2: プレイヤー2（赤/上側）
         match_id: 試合番号
         window: ウィンドウ表示の有効/無効
+        seed: 乱数シード（同じシードなら同じ試合を再現。None なら毎回変わる）
 
     Returns:
         dict: 試合結果
@@ -48,15 +94,31 @@ def run_match(
             - blue_fortresses: 青チームの要塞数
             - red_fortresses: 赤チームの要塞数
             - steps: 総ステップ数
+            - seconds: 試合にかかった時間（秒）
+            - latency: 各プレイヤーの update 処理時間 (LatencyStats, LatencyStats)
     """
-    game = Game(player1, player2, window=window)
-    game.run()
+    game = Game(
+        player1,
+        player2,
+        window=window,
+        seed=seed,
+        decision_interval=DECISION_INTERVAL,
+        profile=True,
+    )
+    try:
+        game.run()
+    finally:
+        for player in (player1, player2):
+            if isinstance(player, IsolatedController):
+                player.close()
 
     result = {
         "winner": game.win_team,
         "blue_fortresses": game.Blue_fortress,
         "red_fortresses": game.Red_fortress,
         "steps": game.step,
+        "seconds": game.seconds,
+        "latency": game.latency,
     }
 
     if not window:
@@ -183,11 +245,13 @@ def run_swiss_tournament(
             "matches": 0,
             "total_fortresses": 0,
             "original_idx": idx,
+            "latency": LatencyStats(),
         }
         player_classes[player_name] = player_class
 
     played_pairs = set()
     match_count = 0
+    total_seconds = 0.0
 
     # 各ラウンドを実行
     for round_num in range(1, rounds + 1):
@@ -237,8 +301,8 @@ def run_swiss_tournament(
 
             # 対戦実行
             result = run_match(
-                player_classes[player1_name](),
-                player_classes[player2_name](),
+                make_player(player_classes[player1_name]),
+                make_player(player_classes[player2_name]),
                 match_count + 1,
                 window=window,
             )
@@ -249,6 +313,9 @@ def run_swiss_tournament(
             player_stats[player2_name]["matches"] += 1
             player_stats[player1_name]["total_fortresses"] += result["blue_fortresses"]
             player_stats[player2_name]["total_fortresses"] += result["red_fortresses"]
+            player_stats[player1_name]["latency"].merge(result["latency"][0])
+            player_stats[player2_name]["latency"].merge(result["latency"][1])
+            total_seconds += result["seconds"]
 
             if result["winner"] == "Blue":
                 player_stats[player1_name]["wins"] += 1
@@ -288,6 +355,7 @@ def run_swiss_tournament(
                 "matches": stats["matches"],
                 "win_rate": win_rate,
                 "avg_fortresses": avg_fortresses,
+                "latency": stats["latency"],
             }
         )
 
@@ -295,9 +363,9 @@ def run_swiss_tournament(
 
     print(
         f"\n{'順位':<4} {'プレイヤー名':<20} {'スコア':<6} {'勝':<4} {'分':<4} {'敗':<4} "
-        f"{'勝率':<8} {'平均要塞数':<10}"
+        f"{'勝率':<8} {'平均要塞数':<10}" + latency_header()
     )
-    print("-" * 70)
+    print("-" * 105)
     for rank, player in enumerate(rankings, 1):
         print(
             f"{rank:<4} "
@@ -307,8 +375,9 @@ def run_swiss_tournament(
             f"{player['draws']:<4} "
             f"{player['losses']:<4} "
             f"{player['win_rate']:>6.1f}% "
-            f"{player['avg_fortresses']:>10.2f}"
+            f"{player['avg_fortresses']:>10.2f}" + latency_columns(player["latency"], total_seconds)
         )
+    print_budget_report({player["name"]: player["latency"] for player in rankings})
 
     print("\n" + "=" * 70)
     print(f"総試合数: {match_count}試合")
@@ -346,8 +415,16 @@ def run_round_robin_tournament(
 
     # 統計情報を記録
     stats = defaultdict(
-        lambda: {"wins": 0, "losses": 0, "draws": 0, "total_fortresses": 0, "matches": 0}
+        lambda: {
+            "wins": 0,
+            "losses": 0,
+            "draws": 0,
+            "total_fortresses": 0,
+            "matches": 0,
+            "latency": LatencyStats(),
+        }
     )
+    total_seconds = 0.0
 
     # 総当たり戦
     match_count = 0
@@ -363,7 +440,12 @@ def run_round_robin_tournament(
         # 複数回対戦
         for round_num in range(1, matches_per_pair + 1):
             print(f"  Match {round_num}: {player1_name} vs {player2_name}")
-            result = run_match(player1_class(), player2_class(), match_count + 1, window=window)
+            result = run_match(
+                make_player(player1_class),
+                make_player(player2_class),
+                match_count + 1,
+                window=window,
+            )
             match_count += 1
 
             # 統計更新
@@ -371,6 +453,9 @@ def run_round_robin_tournament(
             stats[player2_name]["matches"] += 1
             stats[player1_name]["total_fortresses"] += result["blue_fortresses"]
             stats[player2_name]["total_fortresses"] += result["red_fortresses"]
+            stats[player1_name]["latency"].merge(result["latency"][0])
+            stats[player2_name]["latency"].merge(result["latency"][1])
+            total_seconds += result["seconds"]
 
             if result["winner"] == "Blue":
                 stats[player1_name]["wins"] += 1
@@ -403,6 +488,7 @@ def run_round_robin_tournament(
                 "matches": data["matches"],
                 "win_rate": win_rate,
                 "avg_fortresses": avg_fortresses,
+                "latency": data["latency"],
             }
         )
 
@@ -412,9 +498,9 @@ def run_round_robin_tournament(
     # ランキング表示
     print(
         f"\n{'順位':<4} {'プレイヤー名':<20} {'スコア':<6} {'勝':<4} {'分':<4} {'敗':<4} "
-        f"{'勝率':<8} {'平均要塞数':<10}"
+        f"{'勝率':<8} {'平均要塞数':<10}" + latency_header()
     )
-    print("-" * 70)
+    print("-" * 105)
     for rank, player in enumerate(rankings, 1):
         print(
             f"{rank:<4} "
@@ -424,8 +510,9 @@ def run_round_robin_tournament(
             f"{player['draws']:<4} "
             f"{player['losses']:<4} "
             f"{player['win_rate']:>6.1f}% "
-            f"{player['avg_fortresses']:>10.2f}"
+            f"{player['avg_fortresses']:>10.2f}" + latency_columns(player["latency"], total_seconds)
         )
+    print_budget_report({player["name"]: player["latency"] for player in rankings})
 
     print("\n" + "=" * 70)
     print(f"総試合数: {match_count}試合")
@@ -27,7 +27,7 @@ import random
 import numpy as np
 import os
 
-def choose_opponent(weights=None):
+def choose_opponent(weights=None, rng=random):
     # weighted sampling to see Claude more often while keeping diversity
     pool = [
         RandomPlayer,
@@ -61,14 +61,24 @@ def choose_opponent(weights=None):
     w = default_weights if weights is None else list(weights)
     if len(w) != len(pool):
         raise ValueError(f"weights must have {len(pool)} values (got {len(w)}). Order: [Random, Claude, Economist, SplitPush, Harasser, Bulwark, Anchor, Feeder, Rusher, Opportunist, Counter, Flow]")
-    return random.choices(pool, weights=w, k=1)[0]
+    return rng.choices(pool, weights=w, k=1)[0]
 
-def run(n_episodes: int = 100, save_every: int = 50, epsilon_min: float = 0.02, tau: float = 0.01, opponent_weights=None):
+def run(
+    n_episodes: int = 100,
+    save_every: int = 50,
+    epsilon_min: float = 0.02,
+    tau: float = 0.01,
+    opponent_weights=None,
+    seed=None,
+):
+    # one seed fixes opponent choice, exploration and every game
+    rng = random.Random(seed)
     agent = LearningAgent()
+    agent.set_rng(random.Random(rng.getrandbits(64)))
     # allow tuning target network soft-update rate
     agent.target_tau = tau
     for ep in range(1, n_episodes+1):
-        Opp = choose_opponent(opponent_weights)
+        Opp = choose_opponent(opponent_weights, rng)
         # strict whitelist enforcement: prevent accidental usage of disallowed players
         allowed_names = {c.__name__ for c in [RandomPlayer, ClaudePlayer, DefensiveEconomist, SplitPusher, Harasser, Bulwark, Anchor, Feeder, Rusher, Opportunist, Counter, Flow]}
         if getattr(Opp, "__name__", None) not in allowed_names:
@@ -80,7 +90,7 @@ def run(n_episodes: int = 100, save_every: int = 50, epsilon_min: float = 0.02,
         except Exception:
             opp_name = str(Opp)
         print(f"Episode {ep} using opponent: {opp_name}")
-        obs, _ = env.reset()
+        obs, _ = env.reset(seed=rng.getrandbits(63))
         done = False
         truncated = False
         steps = 0
@@ -121,6 +131,7 @@ if __name__ == '__main__':
     ap.add_argument('--save-every', type=int, default=50)
     ap.add_argument('--epsilon-min', type=float, default=0.02)
     ap.add_argument('--tau', type=float, default=0.01)
+    ap.add_argument('--seed', type=int, default=None)
     ap.add_argument('--weights', type=str, default=None, help='Comma-separated weights for opponents [Random, Claude, Economist, SplitPush, Harasser, Bulwark, Anchor, Feeder, Rusher, Opportunist, Counter, Flow]')
     args = ap.parse_args()
 
@@ -135,5 +146,6 @@ if __name__ == '__main__':
         save_every=args.save_every,
         epsilon_min=args.epsilon_min,
         tau=args.tau,
-        opponent_weights=parse_weights(args.weights)
+        opponent_weights=parse_weights(args.weights),
+        seed=args.seed,
     )